@@ -0,0 +1,141 @@
+""" Benchmark of the dependency stores.
+
+The instruments and accounts of the default config, src/config.json, with their
+record counts scaled by the given factor, are persisted to each dependency
+store as the dependency writer process does: in batches the size of the create
+jobs of the config, committed together once every batch has been persisted.
+They are then read from a second store, as a create child process reads them:
+each table whole, the instruments batch by batch as swap positions read swap
+contracts, and accounts of valid types as trades pick them.
+
+The SQLite store is built in a temporary directory, leaving any
+dependencies.db of the working directory alone. Run from the top-level
+directory of the repository:
+    python benchmarks/dependency_store_benchmark.py
+"""
+
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from argparse import ArgumentParser
+
+sys.path.insert(0, 'src/')
+from database.dependency_store import DEPENDENCY_TABLES
+from database.dependency_stores import open_dependency_store, \
+    DEPENDENCY_STORES
+from database.static_reference_data import STATIC_REFERENCE_TABLES
+
+ACCOUNT_TYPES = ['Client', 'Firm', 'Counterparty', 'Depot']
+
+
+def create_instruments(number_of_records):
+    """ Returns a list of value lists resembling persisted instruments """
+
+    return [
+        [str(i), f'TICK{i % 997}.LN', str(100000000 + i),
+         f'GB{100000000 + i}4', random.choice(['LN', 'NY', 'TK'])]
+        for i in range(number_of_records)
+    ]
+
+
+def create_accounts(number_of_records):
+    """ Returns a list of value lists resembling persisted accounts """
+
+    return [
+        [str(i), random.choice(ACCOUNT_TYPES), f'GB29NWBK{i:014d}']
+        for i in range(number_of_records)
+    ]
+
+
+def time_call(timings, name, function, *args):
+    """ Calls the function, adding the seconds it took to the timings """
+
+    start = time.perf_counter()
+    result = function(*args)
+    timings[name] = timings.get(name, 0.0) + time.perf_counter() - start
+    return result
+
+
+def run_store(dependency_store, tables, records_per_job, number_of_picks):
+    """ Returns the seconds taken by each step of persisting and reading the
+    tables with the given dependency store """
+
+    shared_args = {'dependency_store': dependency_store}
+    timings = {}
+
+    writer = open_dependency_store(shared_args)
+    for table_name, value_lists in tables.items():
+        for first in range(0, len(value_lists), records_per_job):
+            time_call(timings, 'persist', writer.persist_batch, table_name,
+                      value_lists[first:first + records_per_job])
+    time_call(timings, 'commit', writer.commit_changes)
+
+    reader = open_dependency_store(shared_args)
+    for table_name in tables:
+        time_call(timings, 'retrieve', reader.retrieve, table_name)
+
+    number_of_instruments = len(tables['instruments'])
+    for first in range(0, number_of_instruments, records_per_job):
+        time_call(timings, 'retrieve_batch', reader.retrieve_batch,
+                  'instruments', records_per_job, first)
+
+    for _ in range(number_of_picks):
+        time_call(timings, 'valid_attribute',
+                  reader.retrieve_row_with_valid_attribute,
+                  'accounts', 'account_type', ['Client', 'Firm'])
+
+    reader.close_connection()
+    for table_name in DEPENDENCY_TABLES:
+        writer.drop_table(table_name)
+    writer.close_connection()
+    if os.path.exists('dependencies.db'):
+        os.unlink('dependencies.db')
+    return timings
+
+
+def main():
+    parser = ArgumentParser(description='Dependency store benchmark')
+    parser.add_argument('--scale', type=int, default=1000)
+    parser.add_argument('--picks', type=int, default=100)
+    args = parser.parse_args()
+
+    with open('src/config.json') as config_file:
+        config = json.load(config_file)
+
+    record_counts = {
+        name: definition['fixed_args']['record_count'] * args.scale
+        for factory_definition in config['factory_definitions']
+        for name, definition in factory_definition.items()
+    }
+    records_per_job = config['shared_args']['number_of_records_per_job']
+    tables = {'instruments': create_instruments(record_counts['instrument']),
+              'accounts': create_accounts(record_counts['account'])}
+
+    csv_files = {file_name: os.path.abspath(file_name)
+                 for file_name in STATIC_REFERENCE_TABLES.values()}
+
+    print(f'{record_counts["instrument"]} instruments and ' +
+          f'{record_counts["account"]} accounts, ' +
+          f'{records_per_job} records per job, ' +
+          f'{args.picks} accounts picked by type')
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        for file_name, path in csv_files.items():
+            os.symlink(path, file_name)
+
+        for dependency_store in DEPENDENCY_STORES:
+            timings = run_store(
+                dependency_store, tables, records_per_job, args.picks
+            )
+            print(f'{dependency_store:>13}: ' + ' '.join(
+                f'{name} {seconds:6.2f}s'
+                for name, seconds in timings.items()
+            ) + f' total {sum(timings.values()):6.2f}s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+""" Benchmark of persisting records to the dependency database.
+
+Rows shaped like those persisted for instruments are inserted into a fresh
+dependency database, in batches as a factory persists the records of a
+create job, each batch followed by a commit. The inserts are timed for the
+string-built single INSERT statement the database used to run, and for the
+prepared executemany inserts of 'persist_batch' in each dependency database
+mode.
+
+The dependency database is built in a temporary directory, leaving any
+dependencies.db of the working directory alone. Run from the top-level
+directory of the repository:
+    python benchmarks/persist_batch_benchmark.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+from argparse import ArgumentParser
+
+sys.path.insert(0, 'src/')
+from database.sqlite_database import Sqlite_Database, \
+    DEPENDENCY_DATABASE_MODES
+from database.static_reference_data import STATIC_REFERENCE_TABLES
+
+
+def create_batch(first_id, number_of_records):
+    """ Returns a list of value lists resembling persisted instruments """
+
+    return [
+        [str(i), f'TICK{i % 997}.LN', str(100000000 + i),
+         f'GB{100000000 + i}4', 'LN']
+        for i in range(first_id, first_id + number_of_records)
+    ]
+
+
+def legacy_persist_batch(connection, table_name, value_lists):
+    """ Inserts the value lists with a single string-built INSERT
+    statement, as 'persist_batch' used to """
+
+    formatted_lists = ["".join(("('", "','".join(value_list), "')"))
+                       for value_list in value_lists]
+    query = " ".join(("INSERT INTO", table_name, "VALUES",
+                      ",".join(formatted_lists)))
+    connection.execute(query)
+
+
+def run_persists(method, mode, number_of_rows, rows_per_persist):
+    """ Returns the seconds taken to persist the given number of rows into
+    a new dependency database in the given mode """
+
+    database = Sqlite_Database(mode)
+    connection = database.get_connection()
+    seconds = 0.0
+
+    for first_id in range(0, number_of_rows, rows_per_persist):
+        batch = create_batch(
+            first_id, min(rows_per_persist, number_of_rows - first_id)
+        )
+
+        start = time.perf_counter()
+        if method == 'legacy':
+            legacy_persist_batch(connection, 'instruments', batch)
+        else:
+            database.persist_batch('instruments', batch)
+        database.commit_changes()
+        seconds += time.perf_counter() - start
+
+    database.close_connection()
+    os.unlink('dependencies.db')
+    return seconds
+
+
+def main():
+    parser = ArgumentParser(description='Persist batch benchmark')
+    parser.add_argument('--rows', type=int, default=10000000)
+    parser.add_argument('--rows_per_persist', type=int, default=100000)
+    args = parser.parse_args()
+
+    csv_files = {file_name: os.path.abspath(file_name)
+                 for file_name in STATIC_REFERENCE_TABLES.values()}
+
+    print(f'{args.rows} rows persisted {args.rows_per_persist} at a time')
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        for file_name, path in csv_files.items():
+            os.symlink(path, file_name)
+
+        runs = [('legacy', 'safe')] + \
+            [('executemany', mode) for mode in DEPENDENCY_DATABASE_MODES]
+
+        for method, mode in runs:
+            seconds = run_persists(
+                method, mode, args.rows, args.rows_per_persist
+            )
+            print(f'{method:>11} {mode:>4}: {seconds:7.2f}s ' +
+                  f'{args.rows / seconds:10.0f} rows/s')
+
+
+if __name__ == '__main__':
+    main()
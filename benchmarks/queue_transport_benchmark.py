@@ -0,0 +1,102 @@
+""" Benchmark of the queue transports available for passing created records
+from the create parent process to the write parent process.
+
+A producer process puts batches of records onto a queue, shaped like the
+batches the create parent process puts onto the created record queue, and a
+consumer process gets them. The throughput of each transport is reported as
+the number of pickled record bytes moved between the two processes per
+second.
+
+Run from the top-level directory of the repository:
+    python benchmarks/queue_transport_benchmark.py
+"""
+
+import pickle
+import sys
+import time
+from argparse import ArgumentParser
+from multiprocessing import Process
+
+sys.path.insert(0, 'src/')
+from multi_processing.queue_transport import QueueTransport, \
+    QUEUE_TRANSPORTS
+
+
+def create_batch(number_of_records, number_of_dummy_fields):
+    """ Returns a list of records resembling created trades, each with the
+    given number of 10 character dummy fields """
+
+    return [
+        dict(
+            {
+                'trade_id': i,
+                'account_id': str(i),
+                'isin': 'GB0000000004',
+                'price': 123.45,
+                'currency': 'GBP',
+                'direction': 'BUY',
+                'quantity': 100
+            },
+            **{f'trade_field{n}': 'ABCDEFGHIJ'
+               for n in range(number_of_dummy_fields)}
+        )
+        for i in range(number_of_records)
+    ]
+
+
+def produce(queue, batch, number_of_batches):
+    """ Put the batch on the queue the given number of times, then the
+    terminate flag """
+
+    for _ in range(number_of_batches):
+        queue.put(batch)
+    queue.put("terminate")
+
+
+def consume(queue):
+    """ Get batches from the queue until the terminate flag is observed """
+
+    while queue.get() != "terminate":
+        pass
+
+
+def run_transport(queue_transport, batch, number_of_batches):
+    """ Returns the seconds taken to move every batch between a producer and
+    consumer process over the given transport """
+
+    transport = QueueTransport(queue_transport)
+    queue = transport.create_queue()
+
+    consumer = Process(target=consume, args=(queue,))
+    consumer.start()
+
+    start = time.perf_counter()
+    producer = Process(target=produce, args=(queue, batch, number_of_batches))
+    producer.start()
+    producer.join()
+    consumer.join()
+
+    return time.perf_counter() - start
+
+
+def main():
+    parser = ArgumentParser(description='Queue transport benchmark')
+    parser.add_argument('--records_per_batch', type=int, default=200)
+    parser.add_argument('--dummy_fields', type=int, default=20)
+    parser.add_argument('--batches', type=int, default=500)
+    args = parser.parse_args()
+
+    batch = create_batch(args.records_per_batch, args.dummy_fields)
+    bytes_moved = len(pickle.dumps(batch)) * args.batches
+
+    print(f'{args.batches} batches of {args.records_per_batch} records, ' +
+          f'{bytes_moved / 1e6:.1f} MB pickled')
+
+    for queue_transport in QUEUE_TRANSPORTS:
+        seconds = run_transport(queue_transport, batch, args.batches)
+        print(f'{queue_transport:>8}: {seconds:7.2f}s ' +
+              f'{bytes_moved / seconds / 1e6:8.1f} MB/s')
+
+
+if __name__ == '__main__':
+    main()
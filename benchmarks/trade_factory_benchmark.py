@@ -0,0 +1,82 @@
+""" Benchmark of creating trades.
+
+Instruments and accounts are created into a fresh dependency database, then
+trades are created from them by a TradeFactory configured as in the default
+config, src/config.json, in create jobs of the size given there unless given by
+--records_per_job, with a reference table cache installed as in a child create
+process. Only the creation of the trades is timed.
+
+The dependency database is built in a temporary directory, leaving any
+dependencies.db of the working directory alone. Run from the top-level
+directory of the repository:
+    python benchmarks/trade_factory_benchmark.py
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+from argparse import ArgumentParser
+from multiprocessing import Lock
+
+sys.path.insert(0, 'src/')
+from database.reference_table_cache import ReferenceTableCache
+from database.static_reference_data import STATIC_REFERENCE_TABLES
+from domainobjectfactories.account_factory import AccountFactory
+from domainobjectfactories.creatable import Creatable
+from domainobjectfactories.instrument_factory import InstrumentFactory
+from domainobjectfactories.trade_factory import TradeFactory
+
+
+def main():
+    parser = ArgumentParser(description='Trade factory benchmark')
+    parser.add_argument('--trades', type=int, default=100000)
+    parser.add_argument('--dependencies', type=int, default=10000)
+    parser.add_argument('--records_per_job', type=int)
+    args = parser.parse_args()
+
+    with open('src/config.json') as config_file:
+        config = json.load(config_file)
+
+    factory_args = {
+        name: definition
+        for factory_definition in config['factory_definitions']
+        for name, definition in factory_definition.items()
+    }
+    records_per_job = args.records_per_job or \
+        config['shared_args']['number_of_records_per_job']
+
+    csv_files = {file_name: os.path.abspath(file_name)
+                 for file_name in STATIC_REFERENCE_TABLES.values()}
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        for file_name, path in csv_files.items():
+            os.symlink(path, file_name)
+
+        InstrumentFactory(factory_args['instrument'], None).create(
+            args.dependencies, 0, Lock()
+        )
+        AccountFactory(factory_args['account'], None).create(
+            args.dependencies, 0
+        )
+
+        Creatable.reference_table_cache = ReferenceTableCache()
+        trade_factory = TradeFactory(factory_args['trade'], None)
+
+        start = time.perf_counter()
+        for start_id in range(0, args.trades, records_per_job):
+            trade_factory.create(
+                min(records_per_job, args.trades - start_id), start_id
+            )
+        seconds = time.perf_counter() - start
+
+        trade_factory.get_database().close_connection()
+
+    print(f'{args.trades} trades in jobs of {records_per_job}: ' +
+          f'{seconds:6.2f}s {args.trades / seconds:10.0f} records/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -14,25 +14,37 @@
         * Cash Flow
         * Settlement Instruction
 
-    Domain objects are created sequentially, with one domain object having all
-    output files written before starting on the next domain object. This is
-    sequenced to ensure that inter-object dependencies are created correctly.
-
-    Dependencies are established using a local SQLite database file. When
-    creating a domain object, any fields that may be referenced by dependant
-    objects are persisted to the database. Upon creating a dependant object,
-    the database is queried to retrieve an appropriate value.
+    Domain objects are scheduled according to the dependencies between them.
+    A domain object is only started once every domain object it depends on has
+    had all output files written, ensuring that inter-object dependencies are
+    created correctly. Domain objects which do not depend on each other, such
+    as trades and prices once instruments and accounts exist, are created at
+    the same time.
+
+    Dependencies are established using a dependency store, by default a
+    local SQLite database file, or optionally shared memory. When creating a
+    domain object, any fields that may be referenced by dependant objects are
+    persisted to the store. Upon creating a dependant object, the store is
+    queried to retrieve an appropriate value.
 
     When creating domain object records and writing them to files,
-    multiprocessing is used to increase time efficiency. A Coordinator object
-    is responsible for creating and managing these processes, and it will
-    spawn two parent processes: 'create_parent_process' and
-    'write_parent_process'. These each spawn a number of child processes as
-    specified in the 'shared_args' section of the user config.
+    multiprocessing is used to increase time efficiency. A single Coordinator
+    object is responsible for creating and managing these processes for the
+    whole run, and it will spawn two parent processes: 'create_parent_process'
+    and 'write_parent_process'. These each spawn a pool of child processes as
+    specified in the 'shared_args' section of the user config. The parent
+    processes and their pools are kept alive across all domain objects, and
+    are torn down once every domain object has been written.
 
     See the class docstrings for Writer and Creator for more detail on the
     multiprocessing implementation.
 
+    The dependency database is deleted at the start of every run, unless
+    --reuse_dependencies is given. Records kept from an earlier run are then
+    reused for every domain object whose config is unchanged, see the
+    dependency_fingerprints module, and only the other domain objects are
+    created.
+
 """
 
 import importlib
@@ -40,8 +52,15 @@ import ujson
 import os
 import sys
 from argparse import ArgumentParser
+from database.dependency_fingerprints import DOMAIN_OBJECT_TABLES, \
+    get_fingerprints, get_reusable_domain_objects
+from database.dependency_store import DEPENDENCY_TABLES
+from database.dependency_stores import open_dependency_store, \
+    is_shared_memory_available, DEFAULT_DEPENDENCY_STORE
 from database.sqlite_database import Sqlite_Database
 from multi_processing.coordinator import Coordinator
+from multi_processing.scheduler import DependencyScheduler
+from multi_processing.memory_usage import format_bytes
 from exceptions.config_error import ConfigError
 from configuration.configuration import Configuration
 import validator.config_validator as config_validator
@@ -50,7 +69,8 @@ from datetime import datetime, timezone
 
 
 def main():
-    delete_database()
+    reuse_dependencies = get_args().reuse_dependencies
+    delete_database(reuse_dependencies)
 
     configurations = parse_config_files()
     validate_configs(configurations)
@@ -60,46 +80,201 @@ def main():
     dev_file_builder_args = configurations.get_dev_file_builder_args()
     dev_factory_args = configurations.get_dev_factory_args()
 
+    if reuse_dependencies:
+        validate_reusable_dependencies(shared_args)
+
     current_time_string = datetime.now(timezone.utc).strftime("%H:%M:%S")
 
-    for factory_definition in factory_definitions:
-        google_drive_connector = get_google_drive_connector(
+    factory_definitions_by_name = {
+        list(factory_definition.keys())[0]: factory_definition
+        for factory_definition in factory_definitions
+    }
+
+    # create the dependency store before any domain object is started, so
+    # that domain objects created at the same time do not race to create it
+    database = open_dependency_store(shared_args)
+    recorded_fingerprints = database.retrieve_fingerprints()
+    dependency_fingerprints = get_fingerprints(
+        factory_definitions_by_name, recorded_fingerprints
+    )
+
+    if reuse_dependencies:
+        reuse_domain_objects(database, factory_definitions_by_name,
+                             dependency_fingerprints, recorded_fingerprints)
+
+    database.close_connection()
+
+    # every object factory is instantiated up front, so that the create
+    # parent process can install them all in its child processes once
+    object_factories = {
+        domain_object: instantiate_object_factory(
+            dev_factory_args,
             factory_definition,
-            current_time_string,
             shared_args)
+        for domain_object, factory_definition
+        in factory_definitions_by_name.items()
+    }
 
-        file_builder = instantiate_file_builder(factory_definition,
-                                                dev_file_builder_args,
-                                                google_drive_connector)
-        object_factory = instantiate_object_factory(dev_factory_args,
-                                                    factory_definition,
-                                                    shared_args)
-        process_object_factory(file_builder, object_factory)
+    coordinator = Coordinator(shared_args, object_factories,
+                              dependency_fingerprints)
+    coordinator.start_dependency_writer_process()
+    coordinator.start_create_parent_process()
+    coordinator.start_write_parent_process()
+
+    scheduler = DependencyScheduler(list(factory_definitions_by_name.keys()))
+    peak_resident_set_sizes = {}
+    failed_write_jobs = {}
+
+    while not scheduler.is_complete():
+        ready_domain_objects = []
+
+        for domain_object in scheduler.get_ready_domain_objects():
+            factory_definition = factory_definitions_by_name[domain_object]
+
+            google_drive_connector = get_google_drive_connector(
+                factory_definition,
+                current_time_string,
+                shared_args)
+
+            ready_domain_objects.append({
+                'domain_object': domain_object,
+                'file_builder': instantiate_file_builder(
+                    factory_definition,
+                    dev_file_builder_args,
+                    google_drive_connector),
+                'object_factory': object_factories[domain_object]
+            })
+
+        process_domain_objects(coordinator, scheduler, ready_domain_objects,
+                               peak_resident_set_sizes, failed_write_jobs)
+
+    coordinator.join_parent_processes()
+    report_peak_resident_set_sizes(peak_resident_set_sizes)
+    exit_if_write_jobs_failed(failed_write_jobs)
 
 
-def process_object_factory(file_builder, object_factory):
+def reuse_domain_objects(database, factory_definitions_by_name,
+                         dependency_fingerprints, recorded_fingerprints):
+    """ Removes from the run every domain object whose records kept in the
+    dependency database were created from the same config as given now, so
+    that they are read by the domain objects depending on them rather than
+    created again. The tables of the other domain objects of the run which
+    persist records are emptied, and their fingerprints deleted, before they
+    are created again.
+
+    Parameters
+    ----------
+    database : Sqlite_Database
+        The dependency database kept from an earlier run
+    factory_definitions_by_name : dict
+        Factory definition of each domain object of the run, keyed by domain
+        object name, from which reused domain objects are removed
+    dependency_fingerprints : dict
+        Fingerprint of each domain object of the run persisting records
+    recorded_fingerprints : dict
+        Fingerprint recorded in the dependency database for each domain
+        object
+    """
+
+    reused_domain_objects = get_reusable_domain_objects(
+        dependency_fingerprints, recorded_fingerprints
+    )
+
+    for domain_object, fingerprint in dependency_fingerprints.items():
+        if domain_object in reused_domain_objects:
+            del factory_definitions_by_name[domain_object]
+        else:
+            database.clear_table(DOMAIN_OBJECT_TABLES[domain_object])
+            database.delete_fingerprint(domain_object)
+
+    database.commit_changes()
+
+    if reused_domain_objects:
+        print("Reusing dependencies of: " + ", ".join(reused_domain_objects))
+
+
+def process_domain_objects(coordinator, scheduler, ready_domain_objects,
+                           peak_resident_set_sizes, failed_write_jobs):
     """
-    This method is called once per domain object, and instantiates a
-    Coordinator object for that domain object. The Coordinator spawns create
-    and write processes that use the instantiated object factory and file
-    builder respectively to create records and write them to output files.
+    Streams the domain objects which have become ready to be created through
+    the run's Coordinator, alongside any domain objects already being
+    created. The Coordinator's create and write processes use the instantiated
+    object factory and file builder of each domain object to create records
+    and write them to output files. Returns once the next domain object has
+    had all of its records written, after marking it complete on the
+    scheduler and recording its peak resident set size, and the number of its
+    write jobs which failed, if any.
 
     Parameters
     ----------
-    file_builder : File_Builder
-        An instantiated file builder as per this object's required output
-        file type specified in the user config
-    object_factory : ObjectFactory
-        Instantiated subclass of Creatable for the domain object being created.
-        Contains creation parameters and multiprocessing shared arguments.
+    coordinator : Coordinator
+        The Coordinator owning the create and write processes for the run
+    scheduler : DependencyScheduler
+        Scheduler tracking which domain objects of the run are complete
+    ready_domain_objects : list
+        Dictionaries, each holding the name of a domain object which is ready
+        to be created, with its instantiated file builder and object factory
+    peak_resident_set_sizes : dict
+        Peak resident set size of each completed domain object, in bytes,
+        keyed by domain object name
+    failed_write_jobs : dict
+        Number of failed write jobs of each completed domain object with
+        failed write jobs, keyed by domain object name
     """
 
-    coordinator = Coordinator(file_builder, object_factory)
+    if ready_domain_objects:
+        coordinator.populate_create_job_queue(ready_domain_objects)
 
-    coordinator.start_create_parent_process()
-    coordinator.start_write_parent_process()
-    coordinator.populate_create_job_queue()
-    coordinator.join_parent_processes()
+    completion = coordinator.wait_for_domain_object_completion()
+    scheduler.mark_complete(completion['domain_object'])
+    peak_resident_set_sizes[completion['domain_object']] = \
+        completion['peak_resident_set_size']
+
+    if completion['failed_write_jobs']:
+        failed_write_jobs[completion['domain_object']] = \
+            completion['failed_write_jobs']
+
+
+def report_peak_resident_set_sizes(peak_resident_set_sizes):
+    """ Print the peak resident set size of each domain object, being the
+    largest resident set size of any create or write process seen while
+    creating and writing it.
+
+    Parameters
+    ----------
+    peak_resident_set_sizes : dict
+        Peak resident set size of each domain object, in bytes, keyed by
+        domain object name
+    """
+
+    print("Peak resident set size per domain object:")
+    for domain_object, peak_resident_set_size in \
+            peak_resident_set_sizes.items():
+        print(f"    {domain_object}: " +
+              format_bytes(peak_resident_set_size))
+
+
+def exit_if_write_jobs_failed(failed_write_jobs):
+    """ Print the number of failed write jobs of each domain object with
+    failed write jobs, and exit with a non-zero status if there were any, as
+    their files are missing from the output.
+
+    Parameters
+    ----------
+    failed_write_jobs : dict
+        Number of failed write jobs of each domain object with failed write
+        jobs, keyed by domain object name
+    """
+
+    if not failed_write_jobs:
+        return
+
+    print("Write job(s) failed, output files are missing:", file=sys.stderr)
+    for domain_object, number_of_failed_write_jobs in \
+            failed_write_jobs.items():
+        print(f"    {domain_object}: {number_of_failed_write_jobs}",
+              file=sys.stderr)
+    sys.exit(1)
 
 
 def instantiate_file_builder(factory_definition,
@@ -377,6 +552,11 @@ def get_args():
                         help='JSON Configuration File Location')
     parser.add_argument('--dev_config', default='src/dev_config.json',
                         help='Developer Configuration File Location')
+    parser.add_argument('--reuse_dependencies', '--reuse-dependencies',
+                        action='store_true',
+                        help='Keep the dependency database of an earlier '
+                             'run, reusing the domain objects whose config '
+                             'is unchanged')
     return parser.parse_args()
 
 
@@ -412,15 +592,60 @@ def validate_configs(configurations):
         sys.exit()
 
 
-def delete_database():
-    """ Remove an existing database if one already exists. Used to ensure
-    that subsequent generation is from a valid set of pre-generated
-    dependencies.
+def validate_reusable_dependencies(shared_args):
+    """ Ensure that there is a dependency database to reuse, which is only
+    kept between runs by the 'sqlite' dependency store, and that none of its
+    records were persisted in 'fast' dependency database mode, as a crash
+    may have left them corrupt.
+
+    Parameters
+    ----------
+    shared_args : dict
+        User arguments, choosing the dependency store
+    """
+
+    if shared_args.get('dependency_store',
+                       DEFAULT_DEPENDENCY_STORE) != 'sqlite':
+        print("--reuse_dependencies requires the 'sqlite' dependency store")
+        sys.exit()
+
+    if not os.path.exists('dependencies.db'):
+        print("--reuse_dependencies requires the dependencies.db of an " +
+              "earlier run")
+        sys.exit()
+
+    database = Sqlite_Database()
+    fingerprint_modes = database.retrieve_fingerprint_modes()
+    database.close_connection()
+
+    if 'fast' in fingerprint_modes.values():
+        print("--reuse_dependencies cannot reuse a dependencies.db written " +
+              "in 'fast' dependency_database_mode, which a crash may have " +
+              "left corrupt")
+        sys.exit()
+
+
+def delete_database(reuse_dependencies=False):
+    """ Remove an existing database if one already exists, unless it is
+    to be reused, along with any tables left in shared memory by an
+    interrupted run, where shared memory is available. Used to ensure that
+    subsequent generation is from a valid set of pre-generated dependencies.
+
+    Parameters
+    ----------
+    reuse_dependencies : Boolean
+        Whether the database of an earlier run is kept
     """
 
-    if os.path.exists('dependencies.db'):
+    if not reuse_dependencies and os.path.exists('dependencies.db'):
         os.unlink('dependencies.db')
 
+    if is_shared_memory_available():
+        from database.shared_memory_store import SharedMemoryStore
+        shared_memory_store = SharedMemoryStore()
+        for table_name in DEPENDENCY_TABLES:
+            shared_memory_store.drop_table(table_name)
+
 
 if __name__ == '__main__':
     main()
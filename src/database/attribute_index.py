@@ -0,0 +1,150 @@
+""" Index of the rows of a table by the value of one of their attributes.
+
+Dependant domain objects pick a random account of one or more account types
+for every record they create. Rather than asking the database to filter and
+sort the accounts table for every pick, the positions of the rows of the table
+are bucketed by the value of the attribute once, and a random row with any of a
+set of values is picked by choosing a random position across the buckets of
+those values. Many rows may be picked at once, by drawing their positions
+together from a NumPy random generator. The rows of a TableSnapshot are
+bucketed from the codes of the attribute's column, without decoding any row.
+"""
+
+import bisect
+import random
+
+import numpy as np
+
+from database.shared_memory_store import TableSnapshot
+
+
+class AttributeIndex:
+    """ Buckets the rows of a table by the value of one attribute, and picks
+    random rows with a value among any combination of valid values.
+
+    Attributes
+    ----------
+    rows : Sequence
+        Rows of the table
+    buckets : dict
+        Positions of the rows with each value of the attribute, keyed by value
+    combinations : dict
+        For each combination of valid values picked from so far, the non-empty
+        buckets of those values and the cumulative number of rows in them,
+        keyed by the frozen set of the values
+    combined_positions : dict
+        For each combination of valid values picked many rows from so far,
+        the positions of every row with one of those values, keyed by the
+        frozen set of the values
+
+    Methods
+    -------
+    get_random_row(valid_values)
+        Return a random row whose attribute has one of the given values
+    get_random_rows(valid_values, number_of_rows, random_generator)
+        Return random rows whose attribute has one of the given values
+    """
+
+    def __init__(self, rows, attribute):
+        """ Bucket the given rows by the value of the attribute.
+
+        Parameters
+        ----------
+        rows : Sequence
+            Rows of the table, each indexable by attribute name, or a
+            TableSnapshot
+        attribute : String
+            Name of the attribute to bucket the rows by
+        """
+
+        self.__rows = rows
+
+        if isinstance(rows, TableSnapshot):
+            self.__buckets = rows.get_positions_by_value(attribute)
+        else:
+            self.__buckets = {}
+            for position, row in enumerate(rows):
+                self.__buckets.setdefault(row[attribute], []).append(position)
+
+        self.__combinations = {}
+        self.__combined_positions = {}
+
+    def get_random_row(self, valid_values):
+        """ Returns a random row whose attribute has one of the given values.
+        Every such row is equally likely to be picked.
+
+        Parameters
+        ----------
+        valid_values : List
+            List of 1 or more valid values for the attribute
+
+        Returns
+        -------
+        Row
+            A row with a valid value, None where there is no such row
+        """
+
+        key = frozenset(valid_values)
+
+        if key not in self.__combinations:
+            buckets = [self.__buckets[value] for value in key
+                       if len(self.__buckets.get(value, ()))]
+            cumulative_sizes = []
+            total = 0
+            for bucket in buckets:
+                total += len(bucket)
+                cumulative_sizes.append(total)
+            self.__combinations[key] = (buckets, cumulative_sizes)
+
+        buckets, cumulative_sizes = self.__combinations[key]
+
+        if not buckets:
+            return None
+
+        position = random.randrange(cumulative_sizes[-1])
+        bucket_number = bisect.bisect_right(cumulative_sizes, position)
+
+        if bucket_number > 0:
+            position -= cumulative_sizes[bucket_number - 1]
+        return self.__rows[int(buckets[bucket_number][position])]
+
+    def get_random_rows(self, valid_values, number_of_rows, random_generator):
+        """ Returns random rows whose attribute has one of the given values,
+        picked independently, so that every such row is equally likely to be
+        picked each time. The positions of every row with one of the values
+        are gathered once per combination of values, and the positions of
+        the picked rows drawn from them at once.
+
+        Parameters
+        ----------
+        valid_values : List
+            List of 1 or more valid values for the attribute
+        number_of_rows : int
+            Number of rows to pick
+        random_generator : numpy.random.Generator
+            Generator from which the positions of the rows are drawn
+
+        Returns
+        -------
+        List
+            Rows with a valid value, each None where there is no such row
+        """
+
+        key = frozenset(valid_values)
+
+        if key not in self.__combined_positions:
+            buckets = [np.asarray(self.__buckets[value]) for value in key
+                       if len(self.__buckets.get(value, ()))]
+            self.__combined_positions[key] = \
+                np.concatenate(buckets) if buckets else None
+
+        positions = self.__combined_positions[key]
+
+        if positions is None:
+            return [None] * number_of_rows
+
+        picked_positions = positions[
+            random_generator.integers(0, len(positions), size=number_of_rows)
+        ]
+        return [self.__rows[position]
+                for position in picked_positions.tolist()]
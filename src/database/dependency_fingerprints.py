@@ -0,0 +1,108 @@
+""" Fingerprints of the records persisted to the dependency database by each
+domain object, allowing a later run to reuse them.
+
+Each domain object persisting records to a table of the dependency database
+has its fingerprint recorded in the database, in the same transaction as its
+last records. The fingerprint is a hash of everything shaping those records:
+the name of the domain object, the definition of the tables of the database,
+the factory definition of the domain object in the user config, less the keys
+which only affect its output files, and the fingerprints of the domain
+objects it depends on. A run given
+--reuse_dependencies keeps every domain object whose recorded fingerprint
+matches the user config, rather than creating it again, and recreates the
+others from an emptied table.
+"""
+
+import hashlib
+import json
+
+from database.dependency_store import DEPENDENCY_TABLES
+from multi_processing.scheduler import DOMAIN_OBJECT_DEPENDENCIES
+
+# table of the dependency database persisted to by each domain object, in an
+# order in which every domain object follows those it depends on
+DOMAIN_OBJECT_TABLES = {
+    'instrument': 'instruments',
+    'account': 'accounts',
+    'counterparty': 'counterparties',
+    'swap_contract': 'swap_contracts',
+    'swap_position': 'swap_positions'
+}
+
+# keys of a factory definition which only affect the files written for it
+OUTPUT_KEYS = ['max_objects_per_file', 'file_name', 'output_file_type',
+               'output_directory', 'upload_to_google_drive', 'file_type_args']
+
+
+def get_fingerprints(factory_definitions_by_name, recorded_fingerprints):
+    """ Returns the fingerprint of each domain object of the user config
+    which persists records to the dependency database.
+
+    Parameters
+    ----------
+    factory_definitions_by_name : dict
+        Factory definition of each domain object of the user config, keyed
+        by domain object name
+    recorded_fingerprints : dict
+        Fingerprint recorded in the dependency database for each domain
+        object, used for domain objects depended on which are not in the
+        user config
+
+    Returns
+    -------
+    dict
+        Fingerprint of each persisting domain object of the user config,
+        keyed by domain object name
+    """
+
+    fingerprints = {}
+
+    for domain_object in DOMAIN_OBJECT_TABLES:
+        if domain_object not in factory_definitions_by_name:
+            continue
+
+        factory_definition = \
+            factory_definitions_by_name[domain_object][domain_object]
+        dependency_fingerprints = {
+            dependency: fingerprints.get(
+                dependency, recorded_fingerprints.get(dependency)
+            )
+            for dependency in DOMAIN_OBJECT_DEPENDENCIES[domain_object]
+        }
+
+        fingerprint_source = json.dumps({
+            'domain_object': domain_object,
+            'tables': DEPENDENCY_TABLES,
+            'factory_definition': {
+                key: value for key, value in factory_definition.items()
+                if key not in OUTPUT_KEYS
+            },
+            'dependencies': dependency_fingerprints
+        }, sort_keys=True)
+        fingerprints[domain_object] = \
+            hashlib.sha256(fingerprint_source.encode()).hexdigest()
+
+    return fingerprints
+
+
+def get_reusable_domain_objects(fingerprints, recorded_fingerprints):
+    """ Returns the domain objects whose records in the dependency database
+    were persisted from the same config as given now.
+
+    Parameters
+    ----------
+    fingerprints : dict
+        Fingerprint of each persisting domain object of the user config
+    recorded_fingerprints : dict
+        Fingerprint recorded in the dependency database for each domain
+        object
+
+    Returns
+    -------
+    List
+        Names of the domain objects whose fingerprints match
+    """
+
+    return [domain_object for domain_object, fingerprint
+            in fingerprints.items()
+            if recorded_fingerprints.get(domain_object) == fingerprint]
@@ -0,0 +1,172 @@
+""" Interface of the stores holding the records domain objects depend on.
+
+Factories of domain objects which others depend on, such as instruments and
+accounts, persist part of each record they create to a dependency store, from
+which the factories of dependant domain objects, such as trades, read them.
+During a run, only the dependency writer process persists records, while any
+process may read them once the domain object persisting them is complete.
+
+Two stores are provided, chosen by the optional 'dependency_store' key of the
+shared args, see the dependency_stores module:
+    sqlite: Sqlite_Database, the dependencies.db file of the working
+        directory
+    shared_memory: SharedMemoryStore, columns of interned strings held in
+        shared memory, for runs whose dependencies fit in memory
+"""
+
+from abc import ABC, abstractmethod
+
+# tables of every dependency store and the columns of each, in the order of
+# the values of the records persisted to them, with their SQLite types
+DEPENDENCY_TABLES = {
+    "instruments": {"instrument_id": "text",
+                    "ric": "text",  # Todo remove this once the
+                    # dependency on ric has been
+                    # removed from objects depending on instrument
+                    "cusip": "text",
+                    "isin": "text",
+                    "market": "text"},
+    "accounts": {"account_id": "text",
+                 "account_type": "text",
+                 "iban": "text"},
+    "counterparties": {"id": "text"},
+    "swap_contracts": {"id": "text"},
+    "swap_positions": {"swap_contract_id": "text",
+                       "ric": "text",
+                       "position_type": "text",
+                       "effective_date": "text",
+                       "long_short": "text"},
+    "exchanges": {"country_of_issuance": "text",
+                  "exchange_code": "text",
+                  "currency": "text"},
+    "tickers": {"symbol": "text"},
+    "settlement_instructions": {"message_reference": "text"}
+}
+
+# tables read whole by the create child processes of nearly every dependant
+# domain object, which are published to shared memory whichever the store,
+# so that the child create processes share a single copy of each
+SNAPSHOT_TABLES = ['instruments', 'accounts']
+
+
+class DependencyStore(ABC):
+    """ Parent class of the dependency stores. Defines the abstract methods
+    through which records are persisted and read. Records are read as rows,
+    whose values are retrieved as though each row is a dictionary keyed by
+    column name.
+
+    Methods
+    -------
+    persist_batch(table_name, value_lists)
+        Insert a list of records into a table.
+
+    commit_changes()
+        Make every record persisted so far readable by other processes.
+
+    retrieve(table_name)
+        Return all records within a table.
+
+    retrieve_batch(table_name, batch_size, offset)
+        Return a given number of records of a table following the given
+        number of records.
+
+    retrieve_row_with_valid_attribute(table_name, attribute_to_validate,
+                                      valid_values)
+        Return a random record of a table with a valid value of an attribute.
+
+    retrieve_column_as_list(table_name, column_name)
+        Return one column of the records of a table.
+
+    get_table_size(table_name)
+        Return the number of records in a table.
+
+    drop_table(table_name)
+        Delete a table.
+
+    record_fingerprint(domain_object, fingerprint)
+        Record the fingerprint of the records persisted by a domain object.
+
+    retrieve_fingerprints()
+        Return the recorded fingerprint of each domain object.
+
+    close_connection()
+        Release the resources held by the store in this process.
+    """
+
+    @abstractmethod
+    def persist_batch(self, table_name, value_lists):
+        """ Insert a list of records, each a list of values in column order,
+        into a table. They may only be read by other processes once changes
+        have been committed. """
+
+        pass
+
+    @abstractmethod
+    def commit_changes(self):
+        """ Make every record persisted so far readable by other
+        processes. """
+
+        pass
+
+    @abstractmethod
+    def retrieve(self, table_name):
+        """ Return all records of a table, in the order they were
+        persisted. """
+
+        pass
+
+    @abstractmethod
+    def retrieve_batch(self, table_name, batch_size, offset):
+        """ Return up to batch_size records of a table, following the first
+        offset records, in the order they were persisted. """
+
+        pass
+
+    @abstractmethod
+    def retrieve_row_with_valid_attribute(
+            self, table_name, attribute_to_validate, valid_values
+    ):
+        """ Return a random record of a table whose attribute has one of the
+        valid values, or None where there is no such record. """
+
+        pass
+
+    @abstractmethod
+    def retrieve_column_as_list(self, table_name, column_name):
+        """ Return the value of a column in every record of a table. """
+
+        pass
+
+    @abstractmethod
+    def get_table_size(self, table_name):
+        """ Return the number of records of a table, or None where it holds
+        no records. """
+
+        pass
+
+    @abstractmethod
+    def drop_table(self, table_name):
+        """ Delete a table and every record of it. """
+
+        pass
+
+    @abstractmethod
+    def record_fingerprint(self, domain_object, fingerprint):
+        """ Record the fingerprint of the records persisted by a domain
+        object, committed with them, see the dependency_fingerprints
+        module. """
+
+        pass
+
+    @abstractmethod
+    def retrieve_fingerprints(self):
+        """ Return the fingerprint recorded for each domain object, keyed
+        by domain object name. """
+
+        pass
+
+    @abstractmethod
+    def close_connection(self):
+        """ Release the resources held by the store in this process. """
+
+        pass
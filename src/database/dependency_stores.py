@@ -0,0 +1,64 @@
+""" Opens the dependency store chosen by the optional 'dependency_store' key
+of the shared args, see the dependency_store module.
+
+The 'shared_memory' store requires the multiprocessing.shared_memory module,
+only available from Python 3.8, so the shared_memory_store module is only
+imported where that store is opened, and runs using the default 'sqlite'
+store do not depend on it.
+"""
+
+from database.sqlite_database import Sqlite_Database, \
+    DEFAULT_DEPENDENCY_DATABASE_MODE
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    shared_memory = None
+
+DEPENDENCY_STORES = ['sqlite', 'shared_memory']
+DEFAULT_DEPENDENCY_STORE = 'sqlite'
+
+
+def is_shared_memory_available():
+    """ Returns whether the multiprocessing.shared_memory module is available,
+    as required by the 'shared_memory' store.
+
+    Returns
+    -------
+    Boolean
+        True from Python 3.8, False before
+    """
+
+    return shared_memory is not None
+
+
+def open_dependency_store(shared_args):
+    """ Returns the dependency store of the run, as chosen by the shared
+    args. Every process opening it reads the same records.
+
+    Parameters
+    ----------
+    shared_args : dict
+        All multiprocessing arguments and their user-assigned values, or None
+        for the defaults
+
+    Returns
+    -------
+    DependencyStore
+        Sqlite_Database in the dependency database mode given by the shared
+        args for the 'sqlite' store, SharedMemoryStore for 'shared_memory'
+    """
+
+    if shared_args is None:
+        shared_args = {}
+
+    dependency_store = shared_args.get('dependency_store',
+                                       DEFAULT_DEPENDENCY_STORE)
+    if dependency_store == 'shared_memory':
+        from database.shared_memory_store import SharedMemoryStore
+        return SharedMemoryStore()
+
+    return Sqlite_Database(
+        shared_args.get('dependency_database_mode',
+                        DEFAULT_DEPENDENCY_DATABASE_MODE)
+    )
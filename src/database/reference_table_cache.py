@@ -0,0 +1,118 @@
+""" Process-local cache of reference tables read from the dependency store.
+
+Dependant domain objects repeatedly read whole tables, such as instruments and
+accounts, filled by the domain objects they depend on. Each create child
+process installs a single ReferenceTableCache for the whole generation run, so
+each table is read from the database at most once per process rather than once
+per create job, and is shared by every object factory in the process. Tables
+which are sampled by the value of one of their attributes, such as accounts by
+account type, are additionally indexed by that attribute once per process.
+
+The SNAPSHOT_TABLES, instruments and accounts, are not copied into each
+process at all. They are published to shared memory by the dependency writer
+process, and read in place as a TableSnapshot, which decodes only the records
+picked from it. Where shared memory is unavailable, before Python 3.8, they
+are read from the database like any other table.
+
+Caching whole tables is only correct because a table is never read before
+the domain object filling it has been completed, as guaranteed by the
+DependencyScheduler, and the database is not changed by anything else
+during a run.
+"""
+
+from database.attribute_index import AttributeIndex
+from database.dependency_store import SNAPSHOT_TABLES
+from database.dependency_stores import is_shared_memory_available
+from database.shared_memory_store import SharedMemoryStore
+
+
+class ReferenceTableCache:
+    """ Holds the records of each reference table read so far by the process.
+
+    Attributes
+    ----------
+    tables : dict
+        Records of each table read so far, keyed by table name
+    attribute_indexes : dict
+        Index of each table by an attribute built so far, keyed by table and
+        attribute name
+    snapshot_store : SharedMemoryStore
+        Store from which snapshots of the snapshot tables are read, None until
+        the first is read
+
+    Methods
+    -------
+    get_table(table_name, database)
+        Return the records of a table, reading it from the database if it has
+        not been read before
+    get_attribute_index(table_name, attribute, database)
+        Return an index of the records of a table by the value of an
+        attribute, building it if it has not been built before
+    """
+
+    def __init__(self):
+        """ Start with no tables cached. """
+
+        self.__tables = {}
+        self.__attribute_indexes = {}
+        self.__snapshot_store = None
+
+    def get_table(self, table_name, database):
+        """ Returns every record of a table, reading them from the database
+        only if the table has not been read by this process before. Snapshot
+        tables are read from shared memory where they have been published,
+        and shared memory is available.
+
+        Parameters
+        ----------
+        table_name : String
+            Name of the table to retrieve all records of
+        database : DependencyStore
+            The dependency store, used on a cache miss
+
+        Returns
+        -------
+        Sequence
+            Every record of the table, as rows of the dependency store, or as
+            a TableSnapshot
+        """
+
+        if table_name not in self.__tables:
+            snapshot = None
+            if table_name in SNAPSHOT_TABLES and \
+                    is_shared_memory_available():
+                if self.__snapshot_store is None:
+                    self.__snapshot_store = SharedMemoryStore()
+                snapshot = self.__snapshot_store.get_snapshot(table_name)
+
+            self.__tables[table_name] = snapshot if snapshot is not None \
+                else database.retrieve(table_name)
+        return self.__tables[table_name]
+
+    def get_attribute_index(self, table_name, attribute, database):
+        """ Returns an index of every record of a table by the value of an
+        attribute, building it from the cached table only if it has not been
+        built by this process before.
+
+        Parameters
+        ----------
+        table_name : String
+            Name of the table to index
+        attribute : String
+            Name of the attribute to index the records of the table by
+        database : DependencyStore
+            The dependency store, used on a cache miss
+
+        Returns
+        -------
+        AttributeIndex
+            Index of the records of the table by the value of the attribute
+        """
+
+        key = (table_name, attribute)
+
+        if key not in self.__attribute_indexes:
+            self.__attribute_indexes[key] = AttributeIndex(
+                self.get_table(table_name, database), attribute
+            )
+        return self.__attribute_indexes[key]
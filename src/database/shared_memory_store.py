@@ -0,0 +1,660 @@
+""" The 'shared_memory' dependency store, holding the records domain objects
+depend on in shared memory rather than in an SQLite database.
+
+The dependency writer process, the only process persisting records during a
+run, interns the values of each column of a table as they arrive: each
+distinct value is stored once, in a vocabulary, and the column holds the
+position of each record's value in the vocabulary. Each time changes are
+committed, every table changed since the last commit is published as a
+single shared memory segment holding, for each of its columns, the
+vocabulary as a NumPy array of fixed width strings and the positions as a
+NumPy array of unsigned integers. A table holding many records with few
+distinct values, such as the markets of instruments, thus takes little
+memory, and a batch of records is read by slicing the arrays of a table.
+
+Any process may read a table once the domain object persisting it is
+complete, by attaching to its segment by name, as a TableSnapshot. A
+snapshot reads the arrays of the segment in place rather than copying them,
+so every process reading a table shares a single copy of it, and decodes a
+record only when it is picked. Segments are named after the
+working directory, just as every process of a run opens the dependencies.db
+file of the working directory, and the table. They are removed once the
+dependency writer process closes its store at the end of the run.
+
+The static reference tables, such as exchanges, are read from the static
+reference data of the process rather than shared memory.
+"""
+
+import hashlib
+import json
+import os
+import random
+from array import array
+from collections.abc import Sequence
+
+# shared memory is only available from Python 3.8, before which this module
+# may still be imported, but no store opened, see is_shared_memory_available
+# in the dependency_stores module
+try:
+    from multiprocessing import resource_tracker
+    from multiprocessing.shared_memory import SharedMemory
+except ImportError:
+    resource_tracker = SharedMemory = None
+
+import numpy as np
+
+from database.dependency_store import DependencyStore, DEPENDENCY_TABLES
+from database.static_reference_data import static_reference_data
+
+# bytes at the start of each segment holding the length of its header
+HEADER_LENGTH_SIZE = 8
+
+# arrays of a segment start at multiples of this many bytes
+ARRAY_ALIGNMENT = 8
+
+
+class SharedMemoryStore(DependencyStore):
+    """ Dependency store holding each table as columns of interned strings in
+    shared memory. Records persisted by a process are only held, and
+    published, by that process, so a single process is to persist them.
+
+    Attributes
+    ----------
+    segment_prefix : String
+        Prefix of the name of the segment of each table, derived from the
+        working directory
+    vocabularies : dict
+        For each table persisted to by this process, the position of each
+        distinct value of each of its columns, keyed by value
+    codes : dict
+        For each table persisted to by this process, the position in the
+        vocabulary of the value of each record, for each of its columns
+    changed_tables : set
+        Names of the tables persisted to since changes were last committed
+    published_segments : set
+        Names of the segments published by this process
+    snapshots : dict
+        Snapshot of each table read by this process, keyed by table name
+
+    Methods
+    -------
+    persist_batch(table_name, value_lists)
+        Intern the values of a list of records of a table.
+
+    commit_changes()
+        Publish every table persisted to since changes were last committed.
+
+    retrieve(table_name)
+        Return all records within a table.
+
+    retrieve_batch(table_name, batch_size, offset)
+        Return a given number of records of a table following the given
+        number of records.
+
+    retrieve_row_with_valid_attribute(table_name, attribute_to_validate,
+                                      valid_values)
+        Return a random record of a table with a valid value of an attribute.
+
+    retrieve_column_as_list(table_name, column_name)
+        Return one column of the records of a table.
+
+    get_table_size(table_name)
+        Return the number of records in a table.
+
+    record_fingerprint(domain_object, fingerprint)
+        Ignored, as the tables do not outlive the run.
+
+    retrieve_fingerprints()
+        Return no fingerprints, as no tables outlive a run.
+
+    drop_table(table_name)
+        Remove the segment of a table from shared memory.
+
+    close_connection()
+        Detach from every table read, and remove every table published, by
+        this process.
+
+    get_snapshot(table_name)
+        Return a snapshot of a published table.
+    """
+
+    def __init__(self):
+        """ Name the segments of the store after the working directory, and
+        start with no tables persisted to or read. """
+
+        self.__segment_prefix = 'fuse_' + hashlib.sha1(
+            os.getcwd().encode()
+        ).hexdigest()[:10]
+        self.__vocabularies = {}
+        self.__codes = {}
+        self.__changed_tables = set()
+        self.__published_segments = set()
+        self.__snapshots = {}
+
+        # segments are tracked by a resource tracker process, which removes
+        # those left behind by the processes sharing it once they all exit.
+        # Started before any process of the run is forked, every process
+        # shares it, rather than one forked process starting its own tracker
+        # which would remove the segments it read when it exits
+        resource_tracker.ensure_running()
+
+    def persist_batch(self, table_name, value_lists):
+        """ Intern the values of a list of records of a table. They are
+        published once changes are committed.
+
+        Parameters
+        ----------
+        table_name : String
+            The name of the table to insert into
+        value_lists : List of Lists
+            Each contained list is a record to be inserted, holding the
+            values of the columns of the table in order
+        """
+
+        if table_name not in self.__vocabularies:
+            number_of_columns = len(DEPENDENCY_TABLES[table_name])
+            self.__vocabularies[table_name] = \
+                [{} for _ in range(number_of_columns)]
+            self.__codes[table_name] = \
+                [array('I') for _ in range(number_of_columns)]
+
+        if not value_lists:
+            return
+
+        for values, vocabulary, codes in zip(zip(*value_lists),
+                                             self.__vocabularies[table_name],
+                                             self.__codes[table_name]):
+            codes.extend([vocabulary.setdefault(value, len(vocabulary))
+                          for value in values])
+
+        self.__changed_tables.add(table_name)
+
+    def commit_changes(self):
+        """ Publish every table persisted to since changes were last
+        committed, replacing any earlier segment of the table. """
+
+        for table_name in self.__changed_tables:
+            self.__publish(table_name)
+            self.__detach(table_name)
+        self.__changed_tables.clear()
+
+    def retrieve(self, table_name):
+        """ Retrieves all records within a given table.
+
+        Parameters
+        ----------
+        table_name : String
+            The name of the table from which to retrieve records
+
+        Returns
+        -------
+        List
+            Dictionaries holding each record, keyed by column name
+        """
+
+        if static_reference_data.is_static_table(table_name):
+            return static_reference_data.get_rows(table_name)
+
+        snapshot = self.get_snapshot(table_name)
+        if snapshot is None:
+            return []
+        return snapshot.get_rows(0, len(snapshot))
+
+    def retrieve_batch(self, table_name, batch_size, offset):
+        """ Retrieves a batch of records from a specified table of a given
+        size starting at a given offset, by slicing its columns.
+
+        Parameters
+        ----------
+        table_name : String
+            Name of the table from which to retrieve records
+        batch_size : int
+            Amount of records to retrieve in the batch
+        offset : int
+            Number of records preceding the batch
+
+        Returns
+        -------
+        List
+            Dictionaries holding each record, keyed by column name
+        """
+
+        snapshot = self.get_snapshot(table_name)
+        if snapshot is None:
+            return []
+        return snapshot.get_rows(offset, offset + batch_size)
+
+    def retrieve_row_with_valid_attribute(
+            self, table_name, attribute_to_validate, valid_values
+    ):
+        """ Retrieves a random record of a table whose attribute has one of
+        the valid values.
+
+        Parameters
+        ----------
+        table_name : String
+            Name of the table to select the valid record from
+        attribute_to_validate: String
+            Attribute for which the value will determine if record is valid
+        valid_values: List
+            List of 1 or more valid values for the attribute
+
+        Returns
+        -------
+        dict
+            The selected record, keyed by column name, or None where no
+            record has a valid value
+        """
+
+        snapshot = self.get_snapshot(table_name)
+        if snapshot is None:
+            return None
+
+        positions = snapshot.get_positions_with_values(
+            attribute_to_validate, valid_values
+        )
+        if not positions.size:
+            return None
+        return snapshot[int(positions[random.randrange(positions.size)])]
+
+    def retrieve_column_as_list(self, table_name, column_name):
+        """ Retrieves one column of records from a given table.
+
+        Parameters
+        ----------
+        table_name : String
+            The name of the table from which to retrieve records
+        column_name : String
+            The name of the column to retrieve
+
+        Returns
+        -------
+        List
+            Value of the column in each record of the table
+        """
+
+        if static_reference_data.is_static_table(table_name):
+            return static_reference_data.get_column(table_name, column_name)
+
+        snapshot = self.get_snapshot(table_name)
+        if snapshot is None:
+            return []
+        return snapshot.get_column(column_name.lower())
+
+    def get_table_size(self, table_name):
+        """ Returns the number of records held in a specified table
+
+        Parameters
+        ----------
+        table_name : String
+            Name of the table to get the size of
+
+        Returns
+        -------
+        int
+            Number of records held in the specified table, None where it
+            holds none
+        """
+
+        snapshot = self.get_snapshot(table_name)
+        if snapshot is None or len(snapshot) == 0:
+            return None
+        return len(snapshot)
+
+    def record_fingerprint(self, domain_object, fingerprint):
+        """ Ignored, as the tables are removed from shared memory at the end
+        of the run, so are never reused by a later one.
+
+        Parameters
+        ----------
+        domain_object : String
+            Name of the domain object
+        fingerprint : String
+            Fingerprint of the domain object's records
+        """
+
+        pass
+
+    def retrieve_fingerprints(self):
+        """ Returns no fingerprints, as no tables outlive a run.
+
+        Returns
+        -------
+        dict
+            Empty dictionary
+        """
+
+        return {}
+
+    def drop_table(self, table_name):
+        """ Removes the segment of a table from shared memory, such as one
+        left behind by an interrupted run, and forgets the records of it
+        held by this process.
+
+        Parameters
+        ----------
+        table_name : String
+            Name of the table to drop
+        """
+
+        self.__vocabularies.pop(table_name, None)
+        self.__codes.pop(table_name, None)
+        self.__changed_tables.discard(table_name)
+        self.__detach(table_name)
+
+        segment_name = self.__get_segment_name(table_name)
+        self.__published_segments.discard(segment_name)
+        try:
+            SharedMemory(name=segment_name).unlink()
+        except FileNotFoundError:
+            pass
+
+    def close_connection(self):
+        """ Detach from every table read by this process, and remove every
+        table published by it from shared memory. """
+
+        for table_name in list(self.__snapshots):
+            self.__detach(table_name)
+
+        for segment_name in self.__published_segments:
+            try:
+                SharedMemory(name=segment_name).unlink()
+            except FileNotFoundError:
+                pass
+        self.__published_segments.clear()
+
+    def __get_segment_name(self, table_name):
+        """ Returns the name of the segment of a table. Tables are numbered
+        rather than named, keeping segment names short.
+
+        Parameters
+        ----------
+        table_name : String
+            Name of the table
+
+        Returns
+        -------
+        String
+            Name of the shared memory segment holding the table
+        """
+
+        table_number = list(DEPENDENCY_TABLES).index(table_name)
+        return f'{self.__segment_prefix}_{table_number}'
+
+    def __publish(self, table_name):
+        """ Writes the columns of a table to a new segment. The segment
+        starts with the length of its header, followed by the header as
+        JSON, giving the number of records and the dtype, length and offset
+        of each array, followed by the arrays.
+
+        Parameters
+        ----------
+        table_name : String
+            Name of the table to publish
+        """
+
+        arrays = []
+        columns = []
+        offset = 0
+
+        for column_name, vocabulary, codes in zip(
+                DEPENDENCY_TABLES[table_name],
+                self.__vocabularies[table_name],
+                self.__codes[table_name]):
+            vocabulary_array = np.array(list(vocabulary), dtype=str)
+            codes_array = np.frombuffer(codes, dtype=np.uintc)
+            column = {'name': column_name}
+
+            for key, column_array in (('vocabulary', vocabulary_array),
+                                      ('codes', codes_array)):
+                column[key] = {'dtype': column_array.dtype.str,
+                               'length': len(column_array),
+                               'offset': offset}
+                arrays.append((offset, column_array))
+                offset += -(-column_array.nbytes // ARRAY_ALIGNMENT) * \
+                    ARRAY_ALIGNMENT
+
+            columns.append(column)
+
+        header = json.dumps({
+            'row_count': len(self.__codes[table_name][0]),
+            'columns': columns
+        }).encode()
+        data_start = -(-(HEADER_LENGTH_SIZE + len(header)) //
+                       ARRAY_ALIGNMENT) * ARRAY_ALIGNMENT
+
+        segment_name = self.__get_segment_name(table_name)
+        try:
+            segment = SharedMemory(name=segment_name, create=True,
+                                   size=data_start + offset)
+        except FileExistsError:
+            SharedMemory(name=segment_name).unlink()
+            segment = SharedMemory(name=segment_name, create=True,
+                                   size=data_start + offset)
+
+        segment.buf[:HEADER_LENGTH_SIZE] = \
+            len(header).to_bytes(HEADER_LENGTH_SIZE, 'little')
+        segment.buf[HEADER_LENGTH_SIZE:HEADER_LENGTH_SIZE + len(header)] = \
+            header
+        for array_offset, column_array in arrays:
+            start = data_start + array_offset
+            segment.buf[start:start + column_array.nbytes] = \
+                column_array.tobytes()
+
+        segment.close()
+        self.__published_segments.add(segment_name)
+
+    def get_snapshot(self, table_name):
+        """ Returns a snapshot of a table, attaching to its segment if this
+        process has not read it before. The snapshot stays attached until
+        the store is closed, so must only be taken once the table is
+        complete.
+
+        Parameters
+        ----------
+        table_name : String
+            Name of the table
+
+        Returns
+        -------
+        TableSnapshot
+            The records of the table, None where it has not been published
+        """
+
+        if table_name not in self.__snapshots:
+            try:
+                segment = SharedMemory(
+                    name=self.__get_segment_name(table_name)
+                )
+            except FileNotFoundError:
+                return None
+            self.__snapshots[table_name] = TableSnapshot(segment)
+
+        return self.__snapshots[table_name]
+
+    def __detach(self, table_name):
+        """ Forgets the snapshot of a table read by this process, and
+        detaches from its segment.
+
+        Parameters
+        ----------
+        table_name : String
+            Name of the table
+        """
+
+        snapshot = self.__snapshots.pop(table_name, None)
+        if snapshot is not None:
+            snapshot.close()
+
+
+class TableSnapshot(Sequence):
+    """ Read-only view of a table published to shared memory by a
+    SharedMemoryStore. The arrays of the table are read in place from its
+    segment. As a sequence of records, a random record is picked with
+    random.choice, decoding only that record.
+
+    Attributes
+    ----------
+    segment : SharedMemory
+        The segment holding the table
+    row_count : int
+        Number of records of the table
+    columns : dict
+        Vocabulary and codes arrays of each column, keyed by column name
+
+    Methods
+    -------
+    get_rows(start, stop)
+        Return the records between two positions
+    get_column(column_name)
+        Return the value of a column in every record
+    get_positions_with_values(column_name, values)
+        Return the positions of the records with one of the given values of
+        a column
+    get_positions_by_value(column_name)
+        Return the positions of the records with each value of a column
+    close()
+        Detach from the segment
+    """
+
+    def __init__(self, segment):
+        """ Read the header of the segment and view each of its arrays in
+        place.
+
+        Parameters
+        ----------
+        segment : SharedMemory
+            Segment of a table, as published by a SharedMemoryStore
+        """
+
+        header_length = int.from_bytes(segment.buf[:HEADER_LENGTH_SIZE],
+                                       'little')
+        header = json.loads(bytes(
+            segment.buf[HEADER_LENGTH_SIZE:HEADER_LENGTH_SIZE + header_length]
+        ))
+        data_start = -(-(HEADER_LENGTH_SIZE + header_length) //
+                       ARRAY_ALIGNMENT) * ARRAY_ALIGNMENT
+
+        self.__segment = segment
+        self.__row_count = header['row_count']
+        self.__columns = {}
+        for column in header['columns']:
+            self.__columns[column['name']] = tuple(
+                np.ndarray((column[key]['length'],),
+                           dtype=np.dtype(column[key]['dtype']),
+                           buffer=segment.buf,
+                           offset=data_start + column[key]['offset'])
+                for key in ('vocabulary', 'codes')
+            )
+
+    def __len__(self):
+        """ Returns the number of records of the table """
+
+        return self.__row_count
+
+    def __getitem__(self, position):
+        """ Returns the record at a position, keyed by column name """
+
+        if position < 0:
+            position += self.__row_count
+        if not 0 <= position < self.__row_count:
+            raise IndexError('table snapshot index out of range')
+
+        return {column_name: str(vocabulary[codes[position]])
+                for column_name, (vocabulary, codes)
+                in self.__columns.items()}
+
+    def get_rows(self, start, stop):
+        """ Returns the records between two positions.
+
+        Parameters
+        ----------
+        start : int
+            Position of the first record to return
+        stop : int
+            Position following the last record to return
+
+        Returns
+        -------
+        List
+            Dictionaries holding each record, keyed by column name
+        """
+
+        column_names = list(self.__columns)
+        column_values = [vocabulary[codes[start:stop]].tolist()
+                         for vocabulary, codes in self.__columns.values()]
+        return [dict(zip(column_names, values))
+                for values in zip(*column_values)]
+
+    def get_column(self, column_name):
+        """ Returns the value of a column in every record.
+
+        Parameters
+        ----------
+        column_name : String
+            Name of the column
+
+        Returns
+        -------
+        List
+            Value of the column in each record of the table
+        """
+
+        vocabulary, codes = self.__columns[column_name]
+        return vocabulary[codes].tolist()
+
+    def get_positions_with_values(self, column_name, values):
+        """ Returns the positions of the records with one of the given values
+        of a column.
+
+        Parameters
+        ----------
+        column_name : String
+            Name of the column
+        values : List
+            Values of the column to find
+
+        Returns
+        -------
+        numpy.ndarray
+            Positions of the records with one of the values, in order
+        """
+
+        vocabulary, codes = self.__columns[column_name]
+        return np.flatnonzero(
+            np.isin(codes, np.flatnonzero(np.isin(vocabulary, values)))
+        )
+
+    def get_positions_by_value(self, column_name):
+        """ Returns the positions of the records with each value of a column,
+        grouped with a single sort of the codes of the column.
+
+        Parameters
+        ----------
+        column_name : String
+            Name of the column
+
+        Returns
+        -------
+        dict
+            Positions of the records with each value, in order, as arrays,
+            keyed by value
+        """
+
+        vocabulary, codes = self.__columns[column_name]
+        positions = np.argsort(codes, kind='stable').astype(np.uint32)
+        counts = np.bincount(codes, minlength=len(vocabulary))
+        return {
+            str(value): value_positions
+            for value, value_positions
+            in zip(vocabulary, np.split(positions, np.cumsum(counts)[:-1]))
+            if value_positions.size
+        }
+
+    def close(self):
+        """ Detach from the segment. The arrays over it are released first,
+        and records already decoded remain usable. """
+
+        self.__columns = {}
+        self.__row_count = 0
+        self.__segment.close()
@@ -1,37 +1,51 @@
 import os.path
 import sqlite3
 
-import pandas as pd
+from database.dependency_store import DependencyStore, DEPENDENCY_TABLES
+from database.static_reference_data import STATIC_REFERENCE_TABLES, \
+    static_reference_data
 
+# 'safe' leaves SQLite's journalling and syncing at their defaults, while
+# 'fast' turns off syncing and uses a write-ahead log, trading durability the
+# throwaway dependency database does not need for faster inserts
+DEPENDENCY_DATABASE_MODES = ['safe', 'fast']
+DEFAULT_DEPENDENCY_DATABASE_MODE = 'safe'
 
-class Sqlite_Database:
+# table holding the fingerprint of each domain object whose records have all
+# been persisted, see the dependency_fingerprints module, along with the
+# dependency database mode they were persisted in
+FINGERPRINT_TABLE = "dependency_fingerprints"
+FINGERPRINT_COLUMNS = {"domain_object": "text", "fingerprint": "text",
+                       "dependency_database_mode": "text"}
+
+
+class Sqlite_Database(DependencyStore):
     """ A class wrapping a database. Providing connections to and limited
-    querying thereof.
+    querying thereof. The 'sqlite' dependency store.
 
     Attributes
     ----------
     connection : SQlite Connection
         Connection to the database. 30 second timeout.
+    mode : String
+        The dependency database mode of the connection, recorded with each
+        fingerprint
 
     Methods
     -------
-    populate_prerequisite_table(table_name, file_name)
-        Populate a prerequisite table, table_name from a file with name
-        and location from the working directory given by file_name.
+    populate_prerequisite_table(table_name)
+        Populate a prerequisite table, table_name, from the CSV file it is
+        read from by the static reference data of the process.
 
     persist_batch(table_name, value_lists)
         Insertion of a set of records into a specified table.
 
-    format_list_for_insertion(value_list)
-        Utility method for persist methods where given lists are joined into
-        a query-friendly format.
-
     retrieve(table_name)
         Returns all records within a specified table.
 
     retrieve_batch(table_name, batch_size, offset)
         Retrieves a given number of records from a specified table from a
-        given point onward.
+        given point onward, by searching for their range of ROWIDs.
 
     retrieve_column_as_list(table_name, column_name)
         Retrieves one column of records from a given table.
@@ -45,6 +59,22 @@ class Sqlite_Database:
     drop_table(table_name)
         Deletes a specified table.
 
+    clear_table(table_name)
+        Deletes every record of a specified table.
+
+    record_fingerprint(domain_object, fingerprint)
+        Records the fingerprint of a domain object's persisted records.
+
+    retrieve_fingerprints()
+        Returns the recorded fingerprint of each domain object.
+
+    retrieve_fingerprint_modes()
+        Returns the dependency database mode each domain object's
+        fingerprinted records were persisted in.
+
+    delete_fingerprint(domain_object)
+        Deletes the recorded fingerprint of a domain object.
+
     create_table_from_dict(table_name, attribute_dict)
         Creates a new table of given name from a dict of attribute keys
         and type values.
@@ -59,100 +89,86 @@ class Sqlite_Database:
         Return the database connection. For testing purposes mainly
     """
 
-    def __init__(self):
+    def __init__(self, mode=DEFAULT_DEPENDENCY_DATABASE_MODE):
         """Establishes a connection to a database on given file_path. If the
         database does not already exist, then the connection is made and
-        tables created via hard-coded definitions. These definitions are
+        tables created from DEPENDENCY_TABLES. These definitions are
         the minimum-required attributes for correct generation of all
         domain objects considering their dependencies.
 
         Parameters
         ----------
-        connection : SQlite Connection
-            Connection to the database.
+        mode : String
+            One of DEPENDENCY_DATABASE_MODES, as given by the optional
+            'dependency_database_mode' key of the shared args
         """
 
+        self.__mode = mode
+
         if not os.path.isfile("dependencies.db"):
             self.__connection = sqlite3.connect("dependencies.db",
                                                 timeout=30.0)
             self.__connection.row_factory = sqlite3.Row
+            self.set_pragmas(mode)
 
-            instrument_def = {"instrument_id": "text",
-                              "ric": "text",  # Todo remove this once the
-                              # dependency on ric has been
-                              # removed from objects depending on instrument
-                              "cusip": "text",
-                              "isin": "text",
-                              "market": "text"}
-
-            accounts_def = {"account_id": "text",
-                            "account_type": "text",
-                            "iban": "text"}
-
-            counterparty_def = {"id": "text"}
-
-            swap_contract_def = {"id": "text"}
-
-            swap_position_def = {"swap_contract_id": "text",
-                                 "ric": "text",
-                                 "position_type": "text",
-                                 "effective_date": "text",
-                                 "long_short": "text"}
-
-            exchanges_def = {"country_of_issuance": "text",
-                             "exchange_code": "text",
-                             "currency": "text"}
-
-            tickers_def = {"symbol": "text"}
-
-            settlement_instruction_def = {"message_reference": "text"}
-
-            tables_dict = {
-                "instruments": instrument_def,
-                "accounts": accounts_def,
-                "counterparties": counterparty_def,
-                "swap_contracts": swap_contract_def,
-                "swap_positions": swap_position_def,
-                "exchanges": exchanges_def,
-                "tickers": tickers_def,
-                "settlement_instructions": settlement_instruction_def
-            }
-
-            for table_name, table_def in tables_dict.items():
+            for table_name, table_def in DEPENDENCY_TABLES.items():
                 self.drop_table(table_name)
                 self.create_table_from_dict(table_name, table_def)
+            self.create_table_from_dict(FINGERPRINT_TABLE,
+                                        FINGERPRINT_COLUMNS)
 
             """ Populate exchange info and tickers """
-            self.populate_prerequisite_table("exchanges", "exchange_info.csv")
-            self.populate_prerequisite_table("tickers", "tickers.csv")
+            # the database is being rebuilt, so the static reference data of
+            # the process is read again from the CSV files it is built from
+            static_reference_data.invalidate()
+            for table_name in STATIC_REFERENCE_TABLES:
+                self.populate_prerequisite_table(table_name)
 
             self.commit_changes()
         else:
             self.__connection = sqlite3.connect("dependencies.db",
                                                 timeout=30.0)
             self.__connection.row_factory = sqlite3.Row
+            self.set_pragmas(mode)
 
-    def populate_prerequisite_table(self, table_name, file_name):
-        """ Populate a prerequisite table, table_name from a file with name
-        and location from the working directory given by file_name.
+    def set_pragmas(self, mode):
+        """ Configure the connection for the given dependency database mode.
+        In 'fast' mode, SQLite no longer waits for writes to reach the disk,
+        and the database is switched to a write-ahead log, which also lets
+        readers carry on while another connection writes. The journal mode
+        is stored in the database file, so applies to every later connection.
+
+        Parameters
+        ----------
+        mode : String
+            One of DEPENDENCY_DATABASE_MODES
+        """
+
+        if mode == 'fast':
+            self.__connection.execute("PRAGMA journal_mode=WAL")
+            self.__connection.execute("PRAGMA synchronous=OFF")
+
+    def populate_prerequisite_table(self, table_name):
+        """ Populate a prerequisite table, table_name, from the CSV file it is
+        read from by the static reference data of the process. CSV files are
+        named in STATIC_REFERENCE_TABLES, relative to the working directory.
 
         Parameters
         ----------
         table_name : String
             The name of the table to insert into
-        file_name: String
-            Name of the csv file containing data to be inserted. Name should be
-            relative to the working directory
         """
 
-        value_list = pd.read_csv(file_name).values.tolist()
+        value_list = static_reference_data.get_value_lists(table_name)
         self.persist_batch(table_name, value_list)
 
     def persist_batch(self, table_name, value_lists):
         """ Insert a given list of records into a specified table of the
-        database. Each element of the value_lists list is formatted to be
-        syntactically correct for database insertion, and a single query
-        ran to insert all formatted rows.
+        database. A single prepared insert statement is run for every record
+        using executemany, so values are bound rather than quoted into the
+        query. Nothing is committed here: the caller commits, allowing several
+        batches to be committed together, and a failure partway through a
+        batch leaves none of it committed.
 
         Parameters
         ----------
@@ -169,31 +185,13 @@ class Sqlite_Database:
             [attr1_X, attr2_X, ..., attN_X]]
         """
 
-        formatted_lists = []
-        for list in value_lists:
-            formatted_lists.append(self.format_list_for_insertion(list))
-        prepared_rows = ",".join(formatted_lists)
-        query = " ".join(("INSERT INTO", table_name, "VALUES", prepared_rows))
-        self.__connection.execute(query)
+        if not value_lists:
+            return
 
-    def format_list_for_insertion(self, value_list):
-        """ Format a given record to be syntactically correct for insertion
-        queries. This assumes that the value being inserted is of type 'text'
-        and wraps each value with apostraphes as such.
+        placeholders = ",".join("?" * len(value_lists[0]))
+        query = f"INSERT INTO {table_name} VALUES ({placeholders})"
 
-        Parameters
-        ----------
-        value_list : List
-            A single list representing the record to format.
-
-        Returns
-        -------
-        String
-            Syntactically correct string for insertion of a record .
-        """
-
-        values = "','".join(value_list)
-        return "".join(("('", values, "')"))
+        self.__connection.executemany(query, value_lists)
 
     def retrieve(self, table_name):
         """ Retrieves all records within a given table.
@@ -281,6 +279,13 @@ class Sqlite_Database:
         """ Retrieves a batch of records from a specified table of a given
         size starting at a given offset.
 
+        Rows are only ever appended to the tables of the dependency database,
+        so the ROWIDs of a table run from 1 to its number of rows, and the
+        batch is the range of ROWIDs following the offset. The range is looked
+        up in the table's ROWID B-tree rather than by stepping over the
+        skipped rows, as LIMIT and OFFSET would, so every batch of a table
+        costs the same to retrieve however far into the table it starts.
+
         Parameters
         ----------
         table_name : String
@@ -288,7 +293,8 @@ class Sqlite_Database:
         batch_size : int
             Amount of records to retrieve in the batch
         offset : int
-            The RowID from which to start retrieval
+            Number of records preceding the batch, the batch holding those
+            with ROWIDs from offset + 1 to offset + batch_size
 
         Returns
         -------
@@ -297,8 +303,9 @@ class Sqlite_Database:
         """
 
         cur = self.__connection.cursor()
-        cur.execute("SELECT * FROM " + table_name + " LIMIT ? OFFSET ?",
-                    (batch_size, offset))
+        cur.execute("SELECT * FROM " + table_name +
+                    " WHERE ROWID > ? AND ROWID <= ? ORDER BY ROWID",
+                    (offset, offset + batch_size))
         rows = cur.fetchall()
         return rows
 
@@ -355,6 +362,90 @@ class Sqlite_Database:
 
         self.__connection.execute("DROP TABLE IF EXISTS " + table_name)
 
+    def clear_table(self, table_name):
+        """ Delete every record of a given table, keeping the table. As no
+        rows remain, the ROWIDs of records inserted afterwards start from 1
+        again, as retrieve_batch expects.
+
+        Parameters
+        ----------
+        table_name : String
+            Name of the table to clear
+        """
+
+        self.__connection.execute("DELETE FROM " + table_name)
+
+    def record_fingerprint(self, domain_object, fingerprint):
+        """ Record the fingerprint of the records persisted by a domain
+        object, along with the dependency database mode of the connection,
+        replacing any recorded before. Committed with the next commit of the
+        connection.
+
+        Parameters
+        ----------
+        domain_object : String
+            Name of the domain object
+        fingerprint : String
+            Fingerprint of the domain object's records
+        """
+
+        self.delete_fingerprint(domain_object)
+        self.__connection.execute(
+            f"INSERT INTO {FINGERPRINT_TABLE} VALUES (?, ?, ?)",
+            (domain_object, fingerprint, self.__mode)
+        )
+
+    def retrieve_fingerprints(self):
+        """ Returns the recorded fingerprint of each domain object. The
+        fingerprint table is created first where the database predates it,
+        holding no fingerprints.
+
+        Returns
+        -------
+        dict
+            Fingerprint of each domain object, keyed by domain object name
+        """
+
+        self.create_table_from_dict(FINGERPRINT_TABLE, FINGERPRINT_COLUMNS)
+
+        cur = self.__connection.cursor()
+        cur.execute(f"SELECT * FROM {FINGERPRINT_TABLE}")
+        return {row['domain_object']: row['fingerprint']
+                for row in cur.fetchall()}
+
+    def retrieve_fingerprint_modes(self):
+        """ Returns the dependency database mode the records of each domain
+        object with a recorded fingerprint were persisted in. Records
+        persisted in 'fast' mode may have been left corrupt by a crash.
+
+        Returns
+        -------
+        dict
+            Dependency database mode of each domain object, keyed by domain
+            object name
+        """
+
+        self.create_table_from_dict(FINGERPRINT_TABLE, FINGERPRINT_COLUMNS)
+
+        cur = self.__connection.cursor()
+        cur.execute(f"SELECT * FROM {FINGERPRINT_TABLE}")
+        return {row['domain_object']: row['dependency_database_mode']
+                for row in cur.fetchall()}
+
+    def delete_fingerprint(self, domain_object):
+        """ Delete the recorded fingerprint of a domain object, if any.
+
+        Parameters
+        ----------
+        domain_object : String
+            Name of the domain object
+        """
+
+        self.__connection.execute(
+            f"DELETE FROM {FINGERPRINT_TABLE} WHERE domain_object = ?",
+            (domain_object,)
+        )
+
     # Create table 'table_name' with attributes in 'attribute_dict'
     def create_table_from_dict(self, table_name, attribute_dict):
         """ Create a new table as defined by a given dictionary.
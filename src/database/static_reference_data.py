@@ -0,0 +1,190 @@
+""" Process-wide cache of the static reference tables of the dependency
+database.
+
+The exchanges and tickers tables are filled from CSV files when the
+dependency database is built, and never change afterwards. Rather than
+selecting every row of them from the database each time a random exchange or
+ticker is needed, they are read from their CSV files once per process and
+held in memory, from where a random row can be picked in constant time.
+
+The cache is invalidated whenever the dependency database is rebuilt, so it
+can never disagree with the tables the database was populated with.
+"""
+
+import random
+
+import pandas as pd
+
+# static reference tables of the dependency database, and the CSV files
+# they are populated from
+STATIC_REFERENCE_TABLES = {
+    'exchanges': 'exchange_info.csv',
+    'tickers': 'tickers.csv'
+}
+
+
+class StaticReferenceData:
+    """ Holds the rows of each static reference table read so far by the
+    process.
+
+    Attributes
+    ----------
+    tables : dict
+        Rows of each table read so far, as dictionaries keyed by the lower
+        case column names of the table, keyed by table name
+    value_lists : dict
+        Rows of each table read so far, as lists of values in column order,
+        keyed by table name
+    columns : dict
+        Values of each column read so far, keyed by table and column name
+
+    Methods
+    -------
+    is_static_table(table_name)
+        Return whether a table is a static reference table
+    get_value_lists(table_name)
+        Return the rows of a table as lists of values, in column order
+    get_rows(table_name)
+        Return the rows of a table
+    get_random_row(table_name)
+        Return a random row of a table
+    get_column(table_name, column_name)
+        Return every value of one column of a table
+    invalidate()
+        Forget every table read so far
+    """
+
+    def __init__(self):
+        """ Start with no tables read. """
+
+        self.__tables = {}
+        self.__value_lists = {}
+        self.__columns = {}
+
+    @staticmethod
+    def is_static_table(table_name):
+        """ Returns whether a table is a static reference table.
+
+        Parameters
+        ----------
+        table_name : String
+            Name of the table
+
+        Returns
+        -------
+        Boolean
+            True where the table is filled from a CSV file
+        """
+
+        return table_name in STATIC_REFERENCE_TABLES
+
+    def get_value_lists(self, table_name):
+        """ Returns the rows of a static reference table as lists of values,
+        in the order of the columns of its CSV file, reading the file if it
+        has not been read before.
+
+        Parameters
+        ----------
+        table_name : String
+            Name of the static reference table
+
+        Returns
+        -------
+        List
+            Lists of the values of each row of the table
+        """
+
+        if table_name not in self.__value_lists:
+            self.__load(table_name)
+        return self.__value_lists[table_name]
+
+    def get_rows(self, table_name):
+        """ Returns the rows of a static reference table, reading its CSV
+        file if it has not been read before.
+
+        Parameters
+        ----------
+        table_name : String
+            Name of the static reference table
+
+        Returns
+        -------
+        List
+            Dictionaries holding each row of the table, keyed by lower case
+            column name
+        """
+
+        if table_name not in self.__tables:
+            self.__load(table_name)
+        return self.__tables[table_name]
+
+    def get_random_row(self, table_name):
+        """ Returns a random row of a static reference table.
+
+        Parameters
+        ----------
+        table_name : String
+            Name of the static reference table
+
+        Returns
+        -------
+        dict
+            A single row of the table, keyed by lower case column name
+        """
+
+        return random.choice(self.get_rows(table_name))
+
+    def get_column(self, table_name, column_name):
+        """ Returns every value of one column of a static reference table.
+
+        Parameters
+        ----------
+        table_name : String
+            Name of the static reference table
+        column_name : String
+            Name of the column, in any case
+
+        Returns
+        -------
+        List
+            Value of the column in each row of the table
+        """
+
+        key = (table_name, column_name.lower())
+
+        if key not in self.__columns:
+            self.__columns[key] = [
+                row[column_name.lower()]
+                for row in self.get_rows(table_name)
+            ]
+        return self.__columns[key]
+
+    def invalidate(self):
+        """ Forget every table read so far, so that each is read again from
+        its CSV file when next needed. """
+
+        self.__tables.clear()
+        self.__value_lists.clear()
+        self.__columns.clear()
+
+    def __load(self, table_name):
+        """ Reads a static reference table from its CSV file.
+
+        Parameters
+        ----------
+        table_name : String
+            Name of the static reference table
+        """
+
+        table = pd.read_csv(STATIC_REFERENCE_TABLES[table_name])
+        column_names = [column.lower() for column in table.columns]
+        value_lists = table.values.tolist()
+
+        self.__value_lists[table_name] = value_lists
+        self.__tables[table_name] = [
+            dict(zip(column_names, values)) for values in value_lists
+        ]
+
+
+# single instance shared by everything in the process
+static_reference_data = StaticReferenceData()
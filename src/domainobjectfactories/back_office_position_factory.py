@@ -1,5 +1,4 @@
 import random
-from datetime import datetime, timezone, timedelta
 
 from domainobjectfactories.creatable import Creatable
 
@@ -68,18 +67,16 @@ class BackOfficePositionFactory(Creatable):
 
         return record
 
-    @staticmethod
-    def __create_as_of_date():
+    def __create_as_of_date(self):
         """ Return the 'as of date', which must be the current date
         Returns
         -------
         Date
             Date object representing the current date
         """
-        return datetime.now(timezone.utc).date()
+        return self.get_job_clock().today
 
-    @staticmethod
-    def __create_value_date():
+    def __create_value_date(self):
         """ Return the 'value date', which must be today or in 2 days time
         Returns
         -------
@@ -87,9 +84,8 @@ class BackOfficePositionFactory(Creatable):
             Date object representing the current date or the date in 2 days
             time
         """
-        today = datetime.now(timezone.utc).date()
-        day_after_tomorrow = today + timedelta(days=2)
-        return random.choice((today, day_after_tomorrow))
+        job_clock = self.get_job_clock()
+        return random.choice((job_clock.today, job_clock.get_date(2)))
 
     def __create_ledger(self):
         """ Return the 'ledger' string, which must be of the values specified'
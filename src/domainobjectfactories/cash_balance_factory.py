@@ -1,5 +1,4 @@
 import random
-from datetime import datetime, timezone, timedelta
 
 from domainobjectfactories.creatable import Creatable
 
@@ -63,8 +62,7 @@ class CashBalanceFactory(Creatable):
 
         return record
 
-    @staticmethod
-    def __create_as_of_date():
+    def __create_as_of_date(self):
         """ Return an 'as of date', being either the current date or the date
         in 2 days time
 
@@ -74,9 +72,8 @@ class CashBalanceFactory(Creatable):
             Date object representing either the current date, or the date in
             2 days time
         """
-        today = datetime.now(timezone.utc).date()
-        day_after_tomorrow = today + timedelta(days=2)
-        return random.choice((today, day_after_tomorrow))
+        job_clock = self.get_job_clock()
+        return random.choice((job_clock.today, job_clock.get_date(2)))
 
     def __create_amount(self):
         """ Return cash balance amount, being a positive or negative integer
@@ -1,4 +1,3 @@
-from datetime import datetime, timezone
 import random
 
 from domainobjectfactories.creatable import Creatable
@@ -115,12 +114,11 @@ class CashFlowFactory(Creatable):
 
         return 'Dividend'
 
-    @staticmethod
-    def __create_payment_date():
+    def __create_payment_date(self):
         """ Return the payment date, which currently will always be the current date
         Returns
         -------
         Date
             Date object representing the current date
         """
-        return datetime.now(timezone.utc).date()
+        return self.get_job_clock().today
@@ -1,9 +1,14 @@
 import random
 import string
 from abc import ABC, abstractmethod
-from datetime import datetime, timezone, timedelta
+from datetime import datetime, timedelta
 
-from database.sqlite_database import Sqlite_Database
+import numpy as np
+
+from database.dependency_stores import open_dependency_store
+from database.static_reference_data import static_reference_data
+from domainobjectfactories import identifiers
+from domainobjectfactories.job_clock import JobClock
 
 
 class Creatable(ABC):
@@ -40,6 +45,18 @@ class Creatable(ABC):
     RETURN TYPES : List
         Possible values for objects return type attribute
 
+    reference_table_cache : ReferenceTableCache
+        Cache of whole tables shared by every factory in the process, None
+        where tables are read from the database on every retrieval
+
+    dependency_queue : Multiprocessing SimpleQueue
+        Queue to the dependency writer process shared by every factory in the
+        process, None where records are persisted to the database directly
+
+    random_generator : numpy.random.Generator
+        NumPy random generator shared by every factory in the process, from
+        which the batch methods draw whole columns of values
+
     config : Dict
         User-specified configuration for domain objects. For shared config and
         domain-specific values, such as swaps per counterparty
@@ -51,11 +68,35 @@ class Creatable(ABC):
         Records, or partial records, to persist to the database. Used to store
         attributes or objects other creations depend on
 
+    dummy_field_plan : List
+        Dummy fields of the config compiled once per factory, see
+        get_dummy_field_plan
+
+    dummy_field_rows : List
+        Values of the dummy fields of records not yet created, drawn in bulk
+        and handed out a record at a time by create_dummy_field_generator
+
+    job_clock : JobClock
+        Current date and time of the create job being run, see
+        start_job_clock
+
     Methods
     -------
     create(record_count, start_id) : Abstract
         Create a given number of records, if id'd starting from given number
 
+    create_chunks(record_count, start_id)
+        Yield the records of a create job in one or more chunks
+
+    create_dummy_field_generator()
+        Return the names and values of the dummy fields of a record
+
+    get_dummy_field_names()
+        Return the name of each dummy field of the config, in order
+
+    get_dummy_field_plan()
+        Return the dummy fields of the config grouped by data type and length
+
     create_random_string(length, include_letters, include_numbers)
         Create a random string of letters and/or numbers of given length
 
@@ -107,9 +148,38 @@ class Creatable(ABC):
     create_return_type()
         Select a random return type from a pre-defined set
 
+    random_strings(number_of_values, length, include_letters,
+                   include_numbers)
+        Create a column of random strings of letters and/or numbers
+
+    random_ints(number_of_values, min, max, length)
+        Create a column of random integers between given values, or of set
+        length
+
+    random_decimals(number_of_values, min, max, dp)
+        Create a column of random numbers between two values to a given
+        number of decimal places
+
+    choices(number_of_values, values)
+        Create a column of values selected at random from a given set
+
+    create_dummy_field_columns(number_of_values)
+        Create a column of values of each dummy field of the config
+
     get_random_instrument()
         Return a random instrument from the set of all created intruments
 
+    sample_instruments(number_of_records)
+        Return random instruments from the set of all created instruments
+
+    get_random_records_with_valid_attribute(table_name,
+                                            attribute_to_validate,
+                                            valid_values, number_of_records)
+        Return random records of a table with valid values of an attribute
+
+    get_random_generator()
+        Return the NumPy random generator of the process
+
     persist_record(record)
         Add record to list of those to be persisted
 
@@ -122,11 +192,20 @@ class Creatable(ABC):
     retrieve_batch_records(table_name, amount, start_pos)
         Select sequential batch of records from given table starting at pos
 
+    start_job_clock()
+        Read the current date and time for the create job about to be run
+
+    get_job_clock()
+        Return the clock of the current create job
+
+    get_max_records_per_chunk()
+        Return the maximum number of records per chunk, if any
+
     get_database()
-        Get connection to the database
+        Get the dependency store
 
     establish_db_connection()
-        Connect to database and return connection
+        Open the dependency store and return it
 
     get_object_config()
         Get json configuration of current object
@@ -145,6 +224,27 @@ class Creatable(ABC):
     RETURN_TYPES = ['Outstanding', 'Pending Return', 'Pending Recall',
                     'Partial Return', 'Partial Recall', 'Settled']
 
+    # set once per create child process by the pool initializer, so that
+    # reference tables are read once per process rather than once per job
+    reference_table_cache = None
+
+    # set once per create child process by the pool initializer, so that
+    # persisted records are sent to the single dependency writer process
+    dependency_queue = None
+
+    # set once per create child process by the pool initializer, so that
+    # every child process draws different values from its own generator
+    random_generator = None
+
+    # bounds of the integers NumPy draws, beyond which random_ints draws
+    # Python integers instead
+    INT64_MIN = int(np.iinfo(np.int64).min)
+    INT64_MAX = int(np.iinfo(np.int64).max)
+
+    # number of records whose dummy fields are drawn at once for factories
+    # creating a record at a time, see create_dummy_field_generator
+    DUMMY_FIELD_ROWS_PER_DRAW = 500
+
     def __init__(self, factory_args, shared_args):
         """ Set configuration, default database connection to None and
         instantiate list of records to persist to be empty.
@@ -162,6 +262,10 @@ class Creatable(ABC):
         self.__shared_args = shared_args
         self.__database = None
         self.__persisting_records = []
+        self.__dummy_field_plan = None
+        self.__dummy_field_names = None
+        self.__dummy_field_rows = []
+        self.__job_clock = None
         self.instruments = None
         self.accounts = None
 
@@ -173,42 +277,108 @@ class Creatable(ABC):
 
         pass
 
+    def create_chunks(self, record_count, start_id):
+        """ Yield the records of a create job in chunks, so that a job need
+        not hold all of its records at once. By default the records are
+        created by the create method and yielded as a single chunk.
+        Factories whose number of records is not bounded by the record
+        count, such as those creating a record per date of a date range,
+        override this to yield chunks of at most the maximum number of
+        records per chunk.
+
+        Parameters
+        ----------
+        record_count : int
+            Number of records to create
+        start_id : int
+            Starting id to create from
+
+        Yields
+        ------
+        List
+            Records of the job, all of them in a single chunk by default
+        """
+
+        yield self.create(record_count, start_id)
+
     def create_dummy_field_generator(self):
-        """ Return generator of dummy fields based on user
-        specification in config for the domain object subclass calling
-        this function
+        """ Return the dummy fields of a record based on user specification
+        in config for the domain object subclass calling this function. The
+        values are taken from rows of dummy field values drawn in bulk, for
+        DUMMY_FIELD_ROWS_PER_DRAW records at a time, rather than drawn a
+        field at a time for each record.
 
         Returns
         -------
-        Generator:
+        Iterator:
             iterable that yields key/value pairs as specified in the config
         """
-        if self.__config is None:
-            # workaround since testing does not always use a config file
-            # eventually a testing config will be created and used
-            # at which point this 'if' statement can be removed
+
+        dummy_field_names = self.get_dummy_field_names()
+        if not dummy_field_names:
             return iter(())
 
-        object_name = self.__config["file_type_args"]["xml_item_name"]
-        field_number = 1
+        if not self.__dummy_field_rows:
+            columns = self.create_dummy_field_columns(
+                self.DUMMY_FIELD_ROWS_PER_DRAW
+            )
+            self.__dummy_field_rows = list(zip(*columns.values()))
 
-        for dummy_field in self.__config["dummy_fields"]:
-            field_count = dummy_field["field_count"]
-            if field_count < 1:
-                continue
+        return zip(dummy_field_names, self.__dummy_field_rows.pop())
 
-            data_type = dummy_field["data_type"]
-            data_length = dummy_field["data_length"]
+    def get_dummy_field_names(self):
+        """ Returns the name of each dummy field of the config, numbered in
+        the order they are specified, as compiled by get_dummy_field_plan.
 
-            if data_type == "string":
-                data_method = self.create_random_string
-            elif data_type == "numeric":
-                data_method = self.create_random_integer
+        Returns
+        -------
+        tuple
+            Name of each dummy field
+        """
+
+        self.get_dummy_field_plan()
+        return self.__dummy_field_names
+
+    def get_dummy_field_plan(self):
+        """ Returns the dummy fields specified in the config, compiled on
+        first use. Dummy fields of the same data type and length are grouped
+        together, so that the values of every field of a group are drawn in
+        one call, however many specifications of the config they come from.
+
+        Returns
+        -------
+        List
+            Tuple of the data type, the data length and the names of the
+            fields of each group of dummy fields
+        """
 
-            for _ in range(field_count):
-                yield f'{object_name}_field{field_number}',\
-                      data_method(length=data_length)
-                field_number += 1
+        if self.__dummy_field_plan is not None:
+            return self.__dummy_field_plan
+
+        groups = {}
+        dummy_field_names = []
+        if self.__config is not None:
+            # the workaround where testing does not use a config file leaves
+            # the factory without dummy fields
+            object_name = self.__config["file_type_args"]["xml_item_name"]
+
+            for dummy_field in self.__config["dummy_fields"]:
+                data_type = dummy_field["data_type"]
+                data_length = dummy_field["data_length"]
+
+                for _ in range(dummy_field["field_count"]):
+                    field_name = \
+                        f'{object_name}_field{len(dummy_field_names) + 1}'
+                    dummy_field_names.append(field_name)
+                    groups.setdefault((data_type, data_length), []) \
+                        .append(field_name)
+
+        self.__dummy_field_names = tuple(dummy_field_names)
+        self.__dummy_field_plan = [
+            (data_type, data_length, field_names)
+            for (data_type, data_length), field_names in groups.items()
+        ]
+        return self.__dummy_field_plan
 
     def create_random_string(self, length,
                                include_letters=True, include_numbers=True):
@@ -249,8 +419,7 @@ class Creatable(ABC):
 
         return random.choice(self.TRUE_FALSE)
 
-    @staticmethod
-    def create_random_date(from_year=2016, from_month=1, from_day=1):
+    def create_random_date(self, from_year=2016, from_month=1, from_day=1):
         """ Creates a random date between a 'from_date' and today. if not
         specified, the 'from_date' defaults to 1/1/2016 to ensure a reasonably
         range of dates is available to be selected from.
@@ -270,7 +439,7 @@ class Creatable(ABC):
             Random date between the provided ranges
         """
         from_date = datetime(from_year, from_month, from_day).date()
-        today = datetime.now(timezone.utc).date()
+        today = self.get_job_clock().today
         date_range_in_days = (today - from_date).days
         if date_range_in_days < 0:
             raise Exception("from date is in the future")
@@ -370,21 +539,23 @@ class Creatable(ABC):
         return '{0}.{1}'.format(ticker, exchange_code)
 
     def create_isin(self, country_of_issuance, cusip):
-        """ Appends two input values to "'country_of_issuance''cusip''4'"
+        """ Appends two input values and the ISIN check digit to
+        "'country_of_issuance''cusip''check digit'". Where creating many
+        ISINs, identifiers.create_isins creates them all at once.
 
         Parameters
         ----------
         country_of_issuance : String
             a country of issuance code
-        cusip : int
+        cusip : String
             a CUSIP value
 
         Returns
         -------
         String
-
+            ISIN of the country of issuance and CUSIP
         """
-        return ''.join([country_of_issuance, str(cusip), '4'])
+        return identifiers.create_isins([country_of_issuance], [cusip])[0]
 
     def create_credit_debit(self):
         """ Create a random credit or debit value
@@ -440,7 +611,7 @@ class Creatable(ABC):
             Todays date
         """
 
-        return datetime.now(timezone.utc).date()
+        return self.get_job_clock().today
 
     def create_effective_date(self, n_days_to_add=3,
                                 knowledge_date=None, position_type=None):
@@ -495,6 +666,192 @@ class Creatable(ABC):
 
         return random.choice(self.RETURN_TYPES)
 
+    # THESE ARE BATCH GENERATING METHODS, EACH CREATING A WHOLE COLUMN OF #
+    # VALUES AT ONCE FROM THE NUMPY RANDOM GENERATOR OF THE PROCESS #
+
+    def random_strings(self, number_of_values, length,
+                       include_letters=True, include_numbers=True):
+        """ Creates a column of random strings, of letters or numbers or
+        both. The characters of every string are drawn at once as a single
+        array of bytes, which is then viewed as one string per row.
+
+        Parameters
+        ----------
+        number_of_values : int
+            Number of random strings to create
+        length : int
+            Length of each random string
+        include_letters : Boolean
+            Boolean flag of whether letters are included in the strings
+        include_numbers : Boolean
+            Boolean flag of whether numbers are included in the strings
+
+        Returns
+        -------
+        List
+            Random strings of letters or numbers or both
+        """
+
+        if length < 1:
+            return [''] * number_of_values
+
+        choices = ''
+        if include_letters:
+            choices += string.ascii_uppercase
+
+        if include_numbers:
+            choices += string.digits
+
+        alphabet = np.frombuffer(choices.encode('ascii'), dtype=np.uint8)
+        characters = alphabet[self.__draw_positions(
+            (number_of_values, length), len(alphabet)
+        )]
+        return characters.view(f'S{length}').ravel() \
+            .astype(f'U{length}').tolist()
+
+    def random_ints(self, number_of_values, min=1, max=10000, length=None):
+        """ Creates a column of random integers of a given length. If no
+        length given, the integers are between minimum and maximum, both
+        inclusive.
+
+        Parameters
+        ----------
+        number_of_values : int
+            Number of random integers to create
+        min : int
+            Minimum value of the range
+        max : int
+            Maximum value of the range
+        length : int
+            Length of each integer
+
+        Returns
+        -------
+        List
+            Integers between given min, max values, or of given length
+        """
+
+        if length is not None:
+            min = 10 ** (length - 1)
+            max = (10 ** length) - 1
+
+        # ranges beyond 64-bit integers, such as of 19 or more digits, are
+        # drawn a Python integer at a time as by create_random_integer
+        if min < self.INT64_MIN or max > self.INT64_MAX or \
+                max - min + 1 > self.INT64_MAX:
+            return [random.randint(min, max) for _ in range(number_of_values)]
+
+        return (self.__draw_positions(number_of_values, max - min + 1)
+                + min).tolist()
+
+    def random_decimals(self, number_of_values, min=10, max=10000, dp=2):
+        """ Creates a column of random numbers between a given range to a
+        given number of decimal places.
+
+        Parameters
+        ----------
+        number_of_values : int
+            Number of random numbers to create
+        min : int
+            Minimum value of the range
+        max : int
+            Maximum value of the range
+        dp : int
+            Number of decimal places to create the values to
+
+        Returns
+        -------
+        List
+            Randomly created floats between min and max to dp decimal places
+        """
+
+        return self.get_random_generator().uniform(
+            min, max, number_of_values
+        ).round(dp).tolist()
+
+    def choices(self, number_of_values, values):
+        """ Creates a column of values selected at random, with
+        replacement, from a given sequence. Only the positions of the
+        selected values are drawn by NumPy, so the values themselves, such as
+        rows of a table, are returned as they are.
+
+        Parameters
+        ----------
+        number_of_values : int
+            Number of values to select
+        values : Sequence
+            Values to select from
+
+        Returns
+        -------
+        List
+            Values selected at random from those given
+        """
+
+        positions = self.__draw_positions(number_of_values, len(values))
+        return [values[position] for position in positions.tolist()]
+
+    def create_dummy_field_columns(self, number_of_values):
+        """ Returns a column of values of each dummy field specified in the
+        config for the domain object subclass calling this function, named
+        as by get_dummy_field_names. The values of every dummy field of one
+        group of the dummy field plan are drawn at once.
+
+        Parameters
+        ----------
+        number_of_values : int
+            Number of values of each dummy field to create
+
+        Returns
+        -------
+        dict
+            Column of values of each dummy field, keyed by field name
+        """
+
+        columns = {}
+
+        for data_type, data_length, field_names in \
+                self.get_dummy_field_plan():
+            if data_type == "string":
+                values = self.random_strings(
+                    number_of_values * len(field_names), data_length
+                )
+            elif data_type == "numeric":
+                values = self.random_ints(
+                    number_of_values * len(field_names), length=data_length
+                )
+
+            for field_number, field_name in enumerate(field_names):
+                first_value = field_number * number_of_values
+                columns[field_name] = \
+                    values[first_value:first_value + number_of_values]
+
+        return {field_name: columns[field_name]
+                for field_name in self.get_dummy_field_names()}
+
+    @staticmethod
+    def __draw_positions(shape, number_of_positions):
+        """ Returns an array of random positions from 0 up to, but not
+        including, the given number of positions, every position equally
+        likely.
+
+        Parameters
+        ----------
+        shape : int or tuple
+            Shape of the array of positions
+        number_of_positions : int
+            Number of positions to draw from, at most INT64_MAX
+
+        Returns
+        -------
+        numpy.ndarray
+            Random 64-bit integer positions
+        """
+
+        return Creatable.get_random_generator().integers(
+            0, number_of_positions, size=shape, dtype=np.int64
+        )
+
     # THESE ARE NON-GENERATING, UTILITY METHODS USED WHERE NECESSARY #
 
     def get_random_record_with_valid_attribute(
@@ -502,7 +859,9 @@ class Creatable(ABC):
     ):
         """ returns a random record from a specified database table, subject
         to the constraint that a specified attribute must have a value in a
-        specified list of valid values
+        specified list of valid values. Where the process has a reference
+        table cache, the record is picked from an index of the table by the
+        attribute rather than by querying the database
 
         Parameters
         ----------
@@ -525,6 +884,13 @@ class Creatable(ABC):
         if self.__database is None:
             self.establish_db_connection()
 
+        # where the process has a reference table cache, the table is
+        # bucketed by the attribute once and sampled from memory
+        if Creatable.reference_table_cache is not None:
+            return Creatable.reference_table_cache.get_attribute_index(
+                table_name, attribute_to_validate, self.__database
+            ).get_random_row(valid_values)
+
         return self.__database.retrieve_row_with_valid_attribute(
             table_name, attribute_to_validate, valid_values
         )
@@ -542,6 +908,68 @@ class Creatable(ABC):
             self.instruments = self.retrieve_records('instruments')
         return random.choice(self.instruments)
 
+    def sample_instruments(self, number_of_records):
+        """ Returns random instruments from those created prior, each
+        picked independently
+
+        Parameters
+        ----------
+        number_of_records : int
+            Number of instruments to pick
+
+        Returns
+        -------
+        List
+            Records from the instruments table of the database
+        """
+
+        if self.instruments is None:
+            self.instruments = self.retrieve_records('instruments')
+        return self.choices(number_of_records, self.instruments)
+
+    def get_random_records_with_valid_attribute(
+            self, table_name, attribute_to_validate, valid_values,
+            number_of_records
+    ):
+        """ Returns random records from a specified database table, each
+        subject to the constraint that a specified attribute must have a
+        value in a specified list of valid values. Where the process has a
+        reference table cache, the records are picked at once from an index
+        of the table by the attribute, otherwise the database is queried for
+        each record
+
+        Parameters
+        ----------
+        table_name : String
+            Name of the database table to select the valid records from
+        attribute_to_validate: String
+            Attribute for which the value will determine if record is valid
+        valid_values: List
+            List of 1 or more valid values for the attribute given by the
+            attribute_to_validate parameter
+        number_of_records : int
+            Number of records to pick
+
+        Returns
+        -------
+        List
+            The picked records
+        """
+
+        if self.__database is None:
+            self.establish_db_connection()
+
+        if Creatable.reference_table_cache is not None:
+            return Creatable.reference_table_cache.get_attribute_index(
+                table_name, attribute_to_validate, self.__database
+            ).get_random_rows(
+                valid_values, number_of_records, self.get_random_generator()
+            )
+
+        return [self.__database.retrieve_row_with_valid_attribute(
+                    table_name, attribute_to_validate, valid_values
+                ) for _ in range(number_of_records)]
+
     def get_random_account(self):
         """ Returns a random instrument from those created prior
 
@@ -556,7 +984,9 @@ class Creatable(ABC):
         return random.choice(self.accounts)
 
     def get_random_row(self, table_name):
-        """ Returns a random from from provided table
+        """ Returns a random from from provided table. Static reference
+        tables, such as exchanges, are sampled from the in-memory static
+        reference data of the process rather than read from the database.
 
                 Returns
                 -------
@@ -564,6 +994,8 @@ class Creatable(ABC):
                     Single record from the table passed in
                 """
 
+        if static_reference_data.is_static_table(table_name):
+            return static_reference_data.get_random_row(table_name)
         return random.choice(self.retrieve_records(table_name))
 
     def persist_record(self, record):
@@ -579,7 +1011,9 @@ class Creatable(ABC):
 
     def persist_records(self, table_name):
         """ Insert all records currently set to be persisted into a specified
-        table
+        table, then forget them, as the factory may be reused for later jobs.
+        Where the process has a dependency queue, the records are sent to the
+        dependency writer process to insert instead.
 
         Parameters
         ----------
@@ -587,13 +1021,24 @@ class Creatable(ABC):
             Name of the table to persist records to
         """
 
-        if self.__database is None:
-            self.establish_db_connection()
-        self.__database.persist_batch(table_name, self.__persisting_records)
-        self.__database.commit_changes()
+        if Creatable.dependency_queue is not None:
+            Creatable.dependency_queue.put({
+                'table_name': table_name,
+                'value_lists': self.__persisting_records
+            })
+        else:
+            if self.__database is None:
+                self.establish_db_connection()
+            self.__database.persist_batch(
+                table_name, self.__persisting_records
+            )
+            self.__database.commit_changes()
+
+        self.__persisting_records = []
 
     def retrieve_records(self, table_name):
-        """ Selects all records from a given database table
+        """ Selects all records from a given database table, from the
+        process's reference table cache where one is installed
 
         Parameters
         ----------
@@ -609,10 +1054,17 @@ class Creatable(ABC):
 
         if self.__database is None:
             self.establish_db_connection()
+
+        if Creatable.reference_table_cache is not None:
+            return Creatable.reference_table_cache.get_table(
+                table_name, self.__database
+            )
         return self.__database.retrieve(table_name)
 
     def retrieve_column(self, table_name, column_name):
-        """ Selects one column from a given database table
+        """ Selects one column from a given database table, or from the
+        in-memory static reference data of the process for static reference
+        tables such as tickers
 
         Parameters
         ----------
@@ -627,13 +1079,18 @@ class Creatable(ABC):
             List containing all the values in the specified table and column
         """
 
+        if static_reference_data.is_static_table(table_name):
+            return static_reference_data.get_column(table_name, column_name)
+
         if self.__database is None:
             self.establish_db_connection()
         return self.__database.retrieve_column_as_list(table_name, column_name)
 
     def retrieve_batch_records(self, table_name, amount, start_pos):
         """ Selects a batch of records from a given table. Retrieval will
-        start from the given position, and take the next amount of records
+        start from the given position, and take the next amount of records.
+        The create jobs of a domain object cover consecutive ranges of
+        positions, so each job reads its own range of ROWIDs of the table.
 
         Parameters
         ----------
@@ -655,29 +1112,87 @@ class Creatable(ABC):
             self.establish_db_connection()
         return self.__database.retrieve_batch(table_name, amount, start_pos)
 
+    @staticmethod
+    def get_random_generator():
+        """ Returns the NumPy random generator of the process, creating one
+        from fresh entropy where the pool initializer has not installed one,
+        such as where factories are run outside a child create process
+
+        Returns
+        -------
+        numpy.random.Generator
+            The random generator shared by every factory in the process
+        """
+
+        if Creatable.random_generator is None:
+            Creatable.random_generator = np.random.default_rng()
+        return Creatable.random_generator
+
+    def start_job_clock(self):
+        """ Reads the current date and time for the create job about to be
+        run, from which its records are dated. Timestamps are taken as set
+        by the optional 'timestamps' key of the shared args, see the
+        job_clock module.
+        """
+
+        timestamp_mode = None
+        if self.__shared_args is not None:
+            timestamp_mode = self.__shared_args.get('timestamps')
+        self.__job_clock = JobClock(timestamp_mode)
+
+    def get_job_clock(self):
+        """ Returns the clock of the current create job, starting one
+        where no job clock has been started, such as where factories are run
+        outside a child create process
+
+        Returns
+        -------
+        JobClock
+            The current date and time of the create job
+        """
+
+        if self.__job_clock is None:
+            self.start_job_clock()
+        return self.__job_clock
+
     def get_database(self):
-        """ Returns the database connection object
+        """ Returns the dependency store
 
         Returns
         -------
-        SQLite3 Connection
-            Connection to the database
+        DependencyStore
+            The dependency store, None until it has been opened
         """
 
         return self.__database
 
     def establish_db_connection(self):
-        """ Establishes and returns the database connection object
+        """ Opens and returns the dependency store chosen by the shared args
 
         Returns
         -------
-        SQLite3 Connection
-            Connection to the database
+        DependencyStore
+            The dependency store, see the dependency_stores module
         """
 
-        self.__database = Sqlite_Database()
+        self.__database = open_dependency_store(self.__shared_args)
         return self.__database
 
+    def get_max_records_per_chunk(self):
+        """ Returns the maximum number of records per chunk of the optional
+        'max_records_per_chunk' key of the shared args, or None where
+        factories are to yield all of the records of a job as one chunk
+
+        Returns
+        -------
+        int
+            Maximum number of records per chunk yielded by create_chunks
+        """
+
+        if self.__shared_args is None:
+            return None
+        return self.__shared_args.get('max_records_per_chunk')
+
     def get_factory_config(self):
         """ Returns the current objects user-specified configuration
 
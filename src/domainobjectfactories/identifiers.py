@@ -0,0 +1,323 @@
+""" Batch generation of security identifiers with valid check digits.
+
+Each identifier is created for a whole create job at once: its characters
+are drawn as a single array of bytes, the check digit of every identifier is
+computed from that array by NumPy, and the array is then viewed as one
+string per identifier. The check digits are those of the real schemes:
+    CUSIP: 8 characters, then the CUSIP check digit
+    ISIN: a country code and a 9 character national identifier, here the
+        CUSIP, then the Luhn check digit of the characters expanded to digits
+    SEDOL: 6 characters, then the weighted SEDOL check digit
+    FIGI: a 2 consonant prefix, 'G', 8 consonants or digits, then the check
+        digit of the CUSIP scheme
+
+The prefixes a FIGI may start with are computed once, on import, as every
+pair of consonants less those reserved by the FIGI standard.
+"""
+
+import itertools
+import string
+
+import numpy as np
+
+FIGI_CONSONANTS = 'BCDFGHJKLMNPQRSTVWXYZ'
+
+# prefixes the FIGI standard does not allow, as they clash with ISINs
+FIGI_INVALID_PREFIXES = ['BS', 'BM', 'GG', 'GB', 'GH', 'KY', 'VG']
+
+FIGI_PREFIXES = [''.join(pair) for pair
+                 in itertools.product(FIGI_CONSONANTS, repeat=2)
+                 if ''.join(pair) not in FIGI_INVALID_PREFIXES]
+
+FIGI_CHARACTERS = FIGI_CONSONANTS + string.digits
+
+# SEDOLs are made of digits and consonants, vowels are never used
+SEDOL_CHARACTERS = string.digits + FIGI_CONSONANTS
+
+SEDOL_WEIGHTS = np.array([1, 3, 1, 7, 3, 9], dtype=np.int64)
+
+FIGI_PREFIX_CODES = np.frombuffer(
+    ''.join(FIGI_PREFIXES).encode('ascii'), dtype=np.uint8
+).reshape(-1, 2)
+
+
+def sum_digits(values):
+    """ Returns the sum of the decimal digits of values below 100 """
+
+    return values // 10 + values % 10
+
+
+# value of the character of each ASCII code, 0 to 9 for digits and 10 to 35
+# for letters, A to Z, from which the tables of what each character adds to
+# the sum of each check digit scheme are computed once
+CHARACTER_VALUES = np.zeros(256, dtype=np.int64)
+CHARACTER_VALUES[ord('0'):ord('9') + 1] = np.arange(10)
+CHARACTER_VALUES[ord('A'):ord('Z') + 1] = np.arange(10, 36)
+IS_LETTER = (CHARACTER_VALUES >= 10).astype(np.int64)
+
+WEIGHTED_VALUES = sum_digits(CHARACTER_VALUES)
+DOUBLED_WEIGHTED_VALUES = sum_digits(CHARACTER_VALUES * 2)
+
+# a character's digits, a letter having two, where the last is doubled as an
+# even number of digits follow it, or the first of a letter's is otherwise
+LUHN_VALUES_EVEN = np.where(
+    IS_LETTER == 1,
+    CHARACTER_VALUES // 10 + sum_digits(CHARACTER_VALUES % 10 * 2),
+    sum_digits(CHARACTER_VALUES * 2)
+)
+LUHN_VALUES_ODD = np.where(
+    IS_LETTER == 1,
+    sum_digits(CHARACTER_VALUES // 10 * 2) + CHARACTER_VALUES % 10,
+    CHARACTER_VALUES
+)
+
+
+def create_cusips(number_of_identifiers, random_generator):
+    """ Creates CUSIPs of 8 random digits and their check digit.
+
+    Parameters
+    ----------
+    number_of_identifiers : int
+        Number of CUSIPs to create
+    random_generator : numpy.random.Generator
+        Generator from which the digits are drawn
+
+    Returns
+    -------
+    List
+        9 character CUSIPs
+    """
+
+    codes = draw_characters(random_generator, string.digits,
+                            (number_of_identifiers, 8))
+    return to_identifiers(codes, compute_weighted_check_digits(codes))
+
+
+def create_isins(countries_of_issuance, national_identifiers):
+    """ Creates the ISIN of each pair of country code and national
+    identifier, such as a CUSIP.
+
+    Parameters
+    ----------
+    countries_of_issuance : List
+        2 letter country code of each ISIN
+    national_identifiers : List
+        9 character national identifier of each ISIN
+
+    Returns
+    -------
+    List
+        12 character ISINs
+    """
+
+    codes = to_codes([country + str(national_identifier)
+                      for country, national_identifier
+                      in zip(countries_of_issuance, national_identifiers)],
+                     11)
+    return to_identifiers(codes, compute_luhn_check_digits(codes))
+
+
+def create_sedols(number_of_identifiers, random_generator):
+    """ Creates SEDOLs of 6 random digits or consonants and their check
+    digit.
+
+    Parameters
+    ----------
+    number_of_identifiers : int
+        Number of SEDOLs to create
+    random_generator : numpy.random.Generator
+        Generator from which the characters are drawn
+
+    Returns
+    -------
+    List
+        7 character SEDOLs
+    """
+
+    codes = draw_characters(random_generator, SEDOL_CHARACTERS,
+                            (number_of_identifiers, 6))
+    return to_identifiers(codes, compute_sedol_check_digits(codes))
+
+
+def create_figis(number_of_identifiers, random_generator):
+    """ Creates FIGIs of a valid prefix, 'G', 8 random consonants or
+    digits and their check digit.
+
+    Parameters
+    ----------
+    number_of_identifiers : int
+        Number of FIGIs to create
+    random_generator : numpy.random.Generator
+        Generator from which the prefixes and characters are drawn
+
+    Returns
+    -------
+    List
+        12 character FIGIs
+    """
+
+    prefixes = FIGI_PREFIX_CODES[draw_positions(
+        random_generator, number_of_identifiers, len(FIGI_PREFIX_CODES)
+    )]
+    third_characters = np.full((number_of_identifiers, 1), ord('G'),
+                               dtype=np.uint8)
+    characters = draw_characters(random_generator, FIGI_CHARACTERS,
+                                 (number_of_identifiers, 8))
+
+    codes = np.hstack((prefixes, third_characters, characters))
+    return to_identifiers(codes, compute_weighted_check_digits(codes))
+
+
+def get_cusip_check_digits(bases):
+    """ Returns the check digit of each CUSIP of the given first 8
+    characters.
+
+    Parameters
+    ----------
+    bases : List
+        First 8 characters of each CUSIP
+
+    Returns
+    -------
+    List
+        Check digit of each CUSIP, as a string
+    """
+
+    return compute_weighted_check_digits(to_codes(bases, 8)).astype(str) \
+        .tolist()
+
+
+def get_isin_check_digits(bases):
+    """ Returns the check digit of each ISIN of the given first 11
+    characters.
+
+    Parameters
+    ----------
+    bases : List
+        First 11 characters of each ISIN
+
+    Returns
+    -------
+    List
+        Check digit of each ISIN, as a string
+    """
+
+    return compute_luhn_check_digits(to_codes(bases, 11)).astype(str) \
+        .tolist()
+
+
+def get_sedol_check_digits(bases):
+    """ Returns the check digit of each SEDOL of the given first 6
+    characters.
+
+    Parameters
+    ----------
+    bases : List
+        First 6 characters of each SEDOL
+
+    Returns
+    -------
+    List
+        Check digit of each SEDOL, as a string
+    """
+
+    return compute_sedol_check_digits(to_codes(bases, 6)).astype(str) \
+        .tolist()
+
+
+def get_figi_check_digits(bases):
+    """ Returns the check digit of each FIGI of the given first 11
+    characters.
+
+    Parameters
+    ----------
+    bases : List
+        First 11 characters of each FIGI
+
+    Returns
+    -------
+    List
+        Check digit of each FIGI, as a string
+    """
+
+    return compute_weighted_check_digits(to_codes(bases, 11)).astype(str) \
+        .tolist()
+
+
+def draw_positions(random_generator, shape, number_of_positions):
+    """ Returns an array of random positions from 0 up to, but not
+    including, the given number of positions, every position equally
+    likely """
+
+    return random_generator.integers(0, number_of_positions, size=shape,
+                                     dtype=np.int64)
+
+
+def draw_characters(random_generator, characters, shape):
+    """ Returns an array of the ASCII codes of characters drawn at random
+    from those given """
+
+    alphabet = np.frombuffer(characters.encode('ascii'), dtype=np.uint8)
+    return alphabet[draw_positions(random_generator, shape, len(alphabet))]
+
+
+def to_codes(identifiers, length):
+    """ Returns the ASCII codes of identifiers of the given length, one row
+    per identifier """
+
+    return np.array(identifiers, dtype=f'S{length}').view(np.uint8) \
+        .reshape(-1, length)
+
+
+def to_identifiers(codes, check_digits):
+    """ Returns the identifier of each row of ASCII codes followed by its
+    check digit """
+
+    number_of_identifiers, length = codes.shape
+    identifier_codes = np.empty((number_of_identifiers, length + 1),
+                                dtype=np.uint8)
+    identifier_codes[:, :length] = codes
+    identifier_codes[:, length] = check_digits + ord('0')
+    return identifier_codes.view(f'S{length + 1}').ravel() \
+        .astype(f'U{length + 1}').tolist()
+
+
+def to_check_digits(total):
+    """ Returns the digit which added to each total makes a multiple of 10 """
+
+    return (10 - total % 10) % 10
+
+
+def compute_weighted_check_digits(codes):
+    """ Returns the check digits of the CUSIP scheme, used by CUSIPs and
+    FIGIs: the value of every second character is doubled, and the digits
+    of every value summed """
+
+    return to_check_digits(WEIGHTED_VALUES[codes[:, ::2]].sum(axis=1)
+                           + DOUBLED_WEIGHTED_VALUES[codes[:, 1::2]]
+                           .sum(axis=1))
+
+
+def compute_sedol_check_digits(codes):
+    """ Returns the check digits of the SEDOL scheme, the weighted sum of
+    the values of the characters """
+
+    return to_check_digits(CHARACTER_VALUES[codes] @ SEDOL_WEIGHTS)
+
+
+def compute_luhn_check_digits(codes):
+    """ Returns the check digits of the ISIN scheme: the Luhn check digit of
+    the characters expanded to digits, letters becoming two digits. Every
+    second digit from the right of the expanded characters is doubled,
+    starting from the rightmost, so what a character adds to the sum only
+    depends on whether an even number of digits follow it """
+
+    letters = IS_LETTER[codes]
+    characters_to_right = np.arange(codes.shape[1] - 1, -1, -1)
+    letters_to_right = \
+        np.cumsum(letters[:, ::-1], axis=1)[:, ::-1] - letters
+
+    odd_digits_to_right = (characters_to_right + letters_to_right) % 2 == 1
+    return to_check_digits(np.where(odd_digits_to_right,
+                                    LUHN_VALUES_ODD[codes],
+                                    LUHN_VALUES_EVEN[codes]).sum(axis=1))
@@ -1,7 +1,6 @@
-import itertools
 import random
-from datetime import datetime, timezone
 
+from domainobjectfactories import identifiers
 from domainobjectfactories.creatable import Creatable
 
 
@@ -18,8 +17,10 @@ class InstrumentFactory(Creatable):
     INDUSTRY_CLASSIFICATIONS = \
         ['MANUFACTURING', 'TELECOMS', 'FINANCIAL SERVICES', 'GROCERIES']
 
-    def create(self, record_count, start_id, lock):
-        """ Create a set number of instruments
+    def create(self, record_count, start_id, lock=None):
+        """ Create a set number of instruments. The CUSIP, ISIN, SEDOL and
+        FIGI of every instrument are created at once, see the identifiers
+        module.
 
         Parameters
         ----------
@@ -28,8 +29,8 @@ class InstrumentFactory(Creatable):
         start_id : int
             Starting id to create from
         lock : Lock
-            Lock ensures database access will be thread safe if multiple
-            processes are attempting to generate instruments
+            No longer used, as tickers are read from memory rather than the
+            database
 
         Returns
         -------
@@ -37,14 +38,28 @@ class InstrumentFactory(Creatable):
             Containing 'record_count' instruments
         """
 
-        lock.acquire()
         self.tickers = self.retrieve_column('tickers', "symbol")
-        lock.release()
+        random_generator = self.get_random_generator()
+
+        exchanges_rows = [self.get_random_row('exchanges')
+                          for _ in range(record_count)]
+        countries_of_issuance = [
+            self.__create_country_of_issuance(random_exchanges_row)
+            for random_exchanges_row in exchanges_rows
+        ]
+        cusips = identifiers.create_cusips(record_count, random_generator)
+        isins = identifiers.create_isins(countries_of_issuance, cusips)
+        sedols = identifiers.create_sedols(record_count, random_generator)
+        figis = identifiers.create_figis(record_count, random_generator)
 
         records = []
 
-        for i in range(start_id, start_id + record_count):
-            record = self.__create_record(i)
+        for i, random_exchanges_row, cusip, isin, sedol, figi in zip(
+                range(start_id, start_id + record_count), exchanges_rows,
+                cusips, isins, sedols, figis
+        ):
+            record = self.__create_record(i, random_exchanges_row,
+                                          cusip, isin, sedol, figi)
             records.append(record)
             self.persist_record(
                 [str(record['instrument_id']),
@@ -57,7 +72,8 @@ class InstrumentFactory(Creatable):
         self.persist_records("instruments")
         return records
 
-    def __create_record(self, id):
+    def __create_record(self, id, random_exchanges_row, cusip, isin, sedol,
+                        figi):
         """ Create a single instrument
 
         Parameters
@@ -65,6 +81,17 @@ class InstrumentFactory(Creatable):
         id : int
             Current id of the instrument to create, used as a pseudo
             exchange code to ensure uniquely created instruments
+        random_exchanges_row : dict
+            Row of the exchanges table giving the country of issuance and
+            exchange code of the instrument
+        cusip : String
+            CUSIP of the instrument
+        isin : String
+            ISIN of the instrument, made of its country of issuance and CUSIP
+        sedol : String
+            SEDOL of the instrument
+        figi : String
+            FIGI of the instrument
 
         Returns
         -------
@@ -73,14 +100,10 @@ class InstrumentFactory(Creatable):
         """
 
         ticker = self.__create_ticker()
-        random_exchanges_row = self.get_random_row('exchanges')
         country_of_issuance = \
             self.__create_country_of_issuance(random_exchanges_row)
         exchange_code = self.__create_exchange_code(random_exchanges_row)
         ric = self.create_ric(ticker, exchange_code)
-        cusip = self.create_random_integer(length=9)
-        isin = self.create_isin(country_of_issuance, cusip)
-        sedol = self.create_random_integer(length=7)
         valoren = self.create_random_integer(100000,
                                              999999999)
         quick = self.create_random_integer(length=4)
@@ -90,9 +113,9 @@ class InstrumentFactory(Creatable):
         primary_market = self.__get_market()
         market = self.__get_market()
         is_primary_listing = primary_market == market
-        figi = self.__create_figi()
         issuer_name = self.create_random_string(10)
         industry_classification = self.__get_industry_classification()
+        timestamp = self.get_job_clock().get_timestamp()
 
         record = {
             'instrument_id': id,
@@ -113,8 +136,8 @@ class InstrumentFactory(Creatable):
             'figi': figi,
             'issuer_name': issuer_name,
             'industry_classification': industry_classification,
-            'created_timestamp': datetime.now(timezone.utc),
-            'last_updated_time_stamp': datetime.now(timezone.utc)
+            'created_timestamp': timestamp,
+            'last_updated_time_stamp': timestamp
         }
 
         for key, value in self.create_dummy_field_generator():
@@ -207,43 +230,6 @@ class InstrumentFactory(Creatable):
         """
         return self.create_random_string(length=10, include_numbers=False)
 
-    @staticmethod
-    def __create_figi():
-        """Create a random valid FIGI
-
-        Returns
-        -------
-        String
-            Randomly generate a FIGI
-        """
-
-        consonants = ['B', 'C', 'D', 'F', 'G', 'H', 'J', 'K', 'L', 'M', 'N',
-                      'P', 'Q', 'R', 'S', 'T', 'U', 'V', 'W', 'Y', 'Z']
-        consonants_and_numbers = consonants + ['1', '2', '3', '4', '5', '6',
-                                               '7', '8', '9']
-
-        random.shuffle(consonants)
-        combination_generator = map(''.join,
-                                    itertools.permutations(consonants, 2))
-        invalid_combinations = ['BS', 'BM', 'GG', 'GB', 'GH', 'KY', 'VG']
-
-        while True:
-            combination = next(combination_generator)
-            if combination not in invalid_combinations:
-                break
-
-        character_three = 'G'
-
-        characters_four_to_eleven = \
-            random.choices(consonants_and_numbers, k=8)
-
-        # TODO Currently the final digit is being randomly generated,
-        #  whereas in a true FIGI it is based on the preceding characters
-        character_twelve = str(random.randint(0, 9))
-
-        return combination + character_three + ''.join(
-            characters_four_to_eleven) + character_twelve
-
     def __get_industry_classification(self):
         """Randomly select an industry classification
 
@@ -0,0 +1,118 @@
+""" Clock of a create job, from which factories take the current date and
+time of the records they create.
+
+The clock reads the time once, when the job starts, so that the records of
+a job are dated without a call to datetime.now and a new timezone-aware
+datetime per record. Dates relative to today, such as the T+2 settlement
+date, are computed once per job on first use.
+
+How records are timestamped is chosen by the optional 'timestamps' key of
+the shared args:
+    per_job: Default, every record of a job has the time the job started
+    monotonic: each record of a job has the time the job started plus a
+        microsecond for every record timestamped before it, so that the
+        timestamps of the records of a job are distinct and increasing
+"""
+
+from datetime import datetime, timedelta, timezone
+
+TIMESTAMP_MODES = ['per_job', 'monotonic']
+
+# offset between successive timestamps of a job in monotonic mode
+MONOTONIC_TIMESTAMP_STEP = timedelta(microseconds=1)
+
+
+class JobClock:
+    """ The current date and time of a create job, read once as the job
+    starts.
+
+    Attributes
+    ----------
+    now : Datetime
+        Time in UTC at which the job started
+    today : Date
+        Date in UTC on which the job started
+    monotonic_timestamps : Boolean
+        Whether each timestamp taken is a step after the one before
+
+    Methods
+    -------
+    get_date(days_from_today)
+        Return the date a number of days after today
+    get_timestamp()
+        Return the timestamp of a record
+    get_timestamps(number_of_timestamps)
+        Return the timestamps of a number of records
+    """
+
+    def __init__(self, timestamp_mode=None):
+        """ Read the current time and date in UTC.
+
+        Parameters
+        ----------
+        timestamp_mode : String, optional
+            One of TIMESTAMP_MODES, per_job where omitted
+        """
+
+        self.now = datetime.now(timezone.utc)
+        self.today = self.now.date()
+        self.monotonic_timestamps = timestamp_mode == 'monotonic'
+        self.__dates = {0: self.today}
+        self.__timestamps_taken = 0
+
+    def get_date(self, days_from_today):
+        """ Returns the date a number of days after the date the job
+        started.
+
+        Parameters
+        ----------
+        days_from_today : int
+            Number of days after today, which may be negative
+
+        Returns
+        -------
+        Date
+            The date that number of days after today
+        """
+
+        date = self.__dates.get(days_from_today)
+        if date is None:
+            date = self.today + timedelta(days=days_from_today)
+            self.__dates[days_from_today] = date
+        return date
+
+    def get_timestamp(self):
+        """ Returns the timestamp of a single record.
+
+        Returns
+        -------
+        Datetime
+            Time in UTC at which the job started, plus a step per timestamp
+            already taken in monotonic mode
+        """
+
+        return self.get_timestamps(1)[0]
+
+    def get_timestamps(self, number_of_timestamps):
+        """ Returns the timestamps of a number of records, in the order the
+        records are created.
+
+        Parameters
+        ----------
+        number_of_timestamps : int
+            Number of timestamps to return
+
+        Returns
+        -------
+        List
+            Datetimes in UTC, each the time at which the job started, plus a
+            step per timestamp taken before it in monotonic mode
+        """
+
+        if not self.monotonic_timestamps:
+            return [self.now] * number_of_timestamps
+
+        first = self.__timestamps_taken
+        self.__timestamps_taken += number_of_timestamps
+        return [self.now + MONOTONIC_TIMESTAMP_STEP * offset
+                for offset in range(first, self.__timestamps_taken)]
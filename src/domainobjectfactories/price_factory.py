@@ -1,5 +1,3 @@
-from datetime import datetime, timezone
-
 from domainobjectfactories.creatable import Creatable
 
 
@@ -44,12 +42,13 @@ class PriceFactory(Creatable):
         """
 
         instrument = self.get_random_instrument()
+        timestamp = self.get_job_clock().get_timestamp()
         record = {
             'instrument_id': instrument['instrument_id'],
             'price': self.create_random_decimal(min=1, max=10, dp=2),
             'currency': self.create_currency(),
-            'created_timestamp': datetime.now(timezone.utc),
-            'last_updated_time_stamp': datetime.now(timezone.utc)
+            'created_timestamp': timestamp,
+            'last_updated_time_stamp': timestamp
             }
 
         for key, value in self.create_dummy_field_generator():
@@ -1,16 +1,37 @@
 import random
-from datetime import datetime, timezone, timedelta
 
 from domainobjectfactories.creatable import Creatable
 
 
 class SettlementInstructionFactory(Creatable):
+    """ Class to create settlement instructions. The message reference of
+    each is a 10 character string, drawn once as the factory is created,
+    followed by its id. The factory is created once per run and installed
+    in every child create process, so the message reference of any id can
+    be derived from the id alone, whichever job created it. Linked messages
+    are derived this way from an earlier id, rather than sampled from the
+    message references a child process has created so far.
+    """
+
     FUNCTIONS = ['CANCEL', 'NEW']
     LINKAGE_TYPE = ['BEFORE', 'AFTER', 'WITH', 'INFO']
     ACCOUNT_TYPE = ['SAFE', 'CASH']
     INSTRUCTION_TYPE = ['DVP', 'RVP', 'DELIVERY FREE', 'RECEIVABLE FREE']
     STATUS = ['MATCHED', 'UNMATCHED']
-    message_reference_list = []
+
+    def __init__(self, factory_args, shared_args):
+        """ Draw the beginning of the message references of the run
+
+        Parameters
+        ----------
+        factory_args : dict
+            Factory settings as set by the user
+        shared_args : dict
+            All multiprocessing arguments and their user-assigned values
+        """
+
+        super().__init__(factory_args, shared_args)
+        self.message_reference_beginning = self.create_random_string(10)
 
     def create(self, record_count, start_id, lock=None):
         """ Create a set number of settlement instructions
@@ -20,7 +41,8 @@ class SettlementInstructionFactory(Creatable):
         record_count : int
             Number of settlement instructions to create
         start_id : int
-            Starting id to use when creating message references
+            Starting id to use when creating message references, in the
+            sequence of every settlement instruction of the run
         lock : Lock
             Locks critical section of InstrumentFactory class.
             Defaults to None in all other Factory classes.
@@ -31,17 +53,15 @@ class SettlementInstructionFactory(Creatable):
             Containing 'record_count' settlement instructions
         """
 
-        message_reference_beginning = self.create_random_string(10)
-
         records = []
 
         for i in range(start_id, record_count + start_id):
-            record = self.__create_record(i, message_reference_beginning)
+            record = self.__create_record(i)
             records.append(record)
 
         return records
 
-    def __create_record(self, id, message_reference_beginning):
+    def __create_record(self, id):
         """ Create a single instrument
 
         Returns
@@ -52,19 +72,13 @@ class SettlementInstructionFactory(Creatable):
 
         instrument = self.get_random_instrument()
 
-        message_reference = self.__create_message_reference(
-            message_reference_beginning, id)
+        message_reference = self.__create_message_reference(id)
         function = self.__get_function()
-        message_creation_timestamp = datetime.now(timezone.utc)
-        linked_message = \
-            self.__get_linked_message(self.message_reference_list)
-        # message_reference is added to message_reference_list after
-        # generating linked_message, otherwise the linked_message
-        # could be this settlement instruction's own message reference
-        self.message_reference_list.append(message_reference)
+        message_creation_timestamp = self.get_job_clock().get_timestamp()
+        linked_message = self.__get_linked_message(id)
         linkage_type = self.__get_linkage_type()
         place_of_trade = self.__get_place_of_trade()
-        trade_datetime = datetime.now(timezone.utc)
+        trade_datetime = self.get_job_clock().get_timestamp()
         deal_price = self.__get_deal_price()
         currency = self.create_currency()
         isin = self.__get_isin(instrument)
@@ -111,10 +125,10 @@ class SettlementInstructionFactory(Creatable):
 
         return record
 
-    def __create_message_reference(self, message_reference_beginning, id):
-        """The 10 character string generated will have id appended to it
+    def __create_message_reference(self, id):
+        """The 10 character string of the run will have id appended to it
         to ensure Message Reference is unique"""
-        return message_reference_beginning + str(id)
+        return self.message_reference_beginning + str(id)
 
     def __get_function(self):
         """Randomly select a function
@@ -126,22 +140,26 @@ class SettlementInstructionFactory(Creatable):
         """
         return random.choice(self.FUNCTIONS)
 
-    @staticmethod
-    def __get_linked_message(message_reference_list):
+    def __get_linked_message(self, id):
         """ 50/50 chance of returning EMPTY or the message reference of
-        a previously generated settlement instruction
+        a settlement instruction of a random earlier id, which may have been
+        created by any job of the run
+
+        Parameters
+        ----------
+        id : int
+            Id of the settlement instruction being created
 
         Returns
         -------
         String
             EMPTY or the message reference of
-            a previously generated settlement instruction
+            a settlement instruction of an earlier id
         """
-        if not message_reference_list:
+        if id == 0 or random.choice(self.TRUE_FALSE):
             return "EMPTY"
         else:
-            return random.choice(
-                ["EMPTY", random.choice(message_reference_list)])
+            return self.__create_message_reference(random.randrange(id))
 
     def __get_linkage_type(self):
         """ Randomly select a linkage type
@@ -248,8 +266,7 @@ class SettlementInstructionFactory(Creatable):
 
         return account['iban']
 
-    @staticmethod
-    def __get_settlement_date():
+    def __get_settlement_date(self):
         """ Gets the date in two days' time
 
         Returns
@@ -257,8 +274,7 @@ class SettlementInstructionFactory(Creatable):
         Date
             Date in two days' time
         """
-        day_after_tomorrow = datetime.now(timezone.utc).date() + \
-            timedelta(days=2)
+        day_after_tomorrow = self.get_job_clock().get_date(2)
         settlement_date = day_after_tomorrow.strftime("%Y%m%d")
 
         return settlement_date
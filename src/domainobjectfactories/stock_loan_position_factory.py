@@ -1,5 +1,4 @@
 import random
-from datetime import datetime, timezone
 
 from domainobjectfactories.creatable import Creatable
 
@@ -76,7 +75,7 @@ class StockLoanPositionFactory(Creatable):
                 'account': self.create_account(),
                 'is_callable': self.create_random_boolean(),
                 'return_type': self.create_return_type(),
-                'time_stamp': datetime.now(timezone.utc)
+                'time_stamp': self.get_job_clock().get_timestamp()
             }
 
         for key, value in self.create_dummy_field_generator():
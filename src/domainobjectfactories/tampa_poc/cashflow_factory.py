@@ -15,8 +15,32 @@ class CashflowFactory(Creatable):
     in custom arguments -> cashflow args) would accrue, and if so, create a
     record of such. Only Swap Positions with type 'E' (end of day) will have
     cashflows created.
+
+    Swap positions share a small range of effective dates, so each date is
+    only parsed once per child process. Before the cashflows of a job are
+    created, every effective date of its swap positions not already in the
+    factory's calendar is added to it, keyed by its date string, along with
+    whether it is a quarter end and its pay date in each pay date period.
+    The dates of each cashflow are then looked up in the calendar.
     """
 
+    PAY_DATE_PERIODS = ['END_OF_MONTH', 'END_OF_HALF']
+    QUARTER_ENDS = {(31, 3), (30, 6), (30, 9), (31, 12)}
+
+    def __init__(self, factory_args, shared_args):
+        """ Start with an empty calendar
+
+        Parameters
+        ----------
+        factory_args : dict
+            Factory settings as set by the user
+        shared_args : dict
+            All multiprocessing arguments and their user-assigned values
+        """
+
+        super().__init__(factory_args, shared_args)
+        self.calendar = {}
+
     def create(self, record_count, start_id, lock=None):
         """ Create a set number of cashflows
 
@@ -37,6 +61,9 @@ class CashflowFactory(Creatable):
             self.retrieve_batch_records('swap_positions',
                                         record_count, start_id)
         cashflow_gen_args = self.get_cashflow_gen_args()
+        self.extend_calendar(swap_position['effective_date']
+                             for swap_position in swap_position_batch
+                             if swap_position['position_type'] == 'E')
 
         records = [self.create_record(swap_position, cf_arg)
                    for swap_position in swap_position_batch
@@ -64,17 +91,15 @@ class CashflowFactory(Creatable):
 
         accrual = cf_arg['cashFlowAccrual']
         probability = cf_arg['cashFlowAccrualProbability']
-        effective_date = self.effective_date(swap_position['effective_date'])
-        if self.cashflow_accrues(effective_date, accrual, probability):
+        calendar_day = self.calendar[swap_position['effective_date']]
+        if self.cashflow_accrues(calendar_day, accrual, probability):
             pay_date_period = cf_arg['cashFlowPaydatePeriod']
-            p_date_func = self.create_pay_date_func(pay_date_period)
             record = {
                 'swap_contract_id': swap_position['swap_contract_id'],
                 'ric': swap_position['ric'],
                 'cashflow_type': cf_arg['cashFlowType'],
-                'pay_date': datetime.strftime(p_date_func(effective_date),
-                                              '%Y-%m-%d'),
-                'effective_date': effective_date,
+                'pay_date': calendar_day['pay_dates'][pay_date_period],
+                'effective_date': calendar_day['effective_date'],
                 'currency': self.create_currency(),
                 'amount': self.create_random_integer(),
                 'long_short': swap_position['long_short']
@@ -85,6 +110,33 @@ class CashflowFactory(Creatable):
 
             return record
 
+    def extend_calendar(self, date_strings):
+        """ Adds each date not already in the calendar to it, keyed by its
+        date string, holding the parsed date, whether it is a quarter end,
+        and its pay date in each pay date period as a date string
+
+        Parameters
+        ----------
+        date_strings : Iterable
+            Effective dates of swap positions. Expected format '%Y-%m-%d'
+        """
+
+        for date_string in set(date_strings).difference(self.calendar):
+            effective_date = self.effective_date(date_string)
+            self.calendar[date_string] = {
+                'effective_date': effective_date,
+                'is_quarter_end': (effective_date.day, effective_date.month)
+                in self.QUARTER_ENDS,
+                'pay_dates': {
+                    pay_date_period: datetime.strftime(
+                        self.create_pay_date_func(pay_date_period)(
+                            effective_date
+                        ),
+                        '%Y-%m-%d'
+                    ) for pay_date_period in self.PAY_DATE_PERIODS
+                }
+            }
+
     def effective_date(self, effective_date):
         """ Parse string time into Datetime type
 
@@ -169,14 +221,14 @@ class CashflowFactory(Creatable):
             "END_OF_HALF": self.calc_eoh
         }.get(pay_date_period, lambda: "Invalid pay date period")
 
-    def cashflow_accrues(self, effective_date, accrual, probability):
+    def cashflow_accrues(self, calendar_day, accrual, probability):
         """ Returns True where a particular cashflow with accrual
         rate/probability has been simulated as accruing.
 
         Parameters
         ----------
-        effective_date : Date
-            Date the cashflow is effective from
+        calendar_day : dict
+            Calendar day of the date the cashflow is effective from
         accrual : String
             Rate at which the cashflow accrues, daily, quarterly, or chance
         probability : int
@@ -190,9 +242,7 @@ class CashflowFactory(Creatable):
 
         if accrual == "DAILY":
             return True
-        elif accrual == "QUARTERLY" and \
-                (effective_date.day, effective_date.month) in \
-                [(31, 3), (30, 6), (30, 9), (31, 12)]:
+        elif accrual == "QUARTERLY" and calendar_day['is_quarter_end']:
             return True
         elif accrual == "CHANCE_ACCRUAL" and \
                 random.random() < (int(probability) / 100):
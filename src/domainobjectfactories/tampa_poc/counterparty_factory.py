@@ -1,5 +1,3 @@
-from datetime import datetime, timezone
-
 from domainobjectfactories.creatable import Creatable
 
 
@@ -49,7 +47,7 @@ class CounterpartyFactory(Creatable):
         record = {
             'counterparty_id': current_id,
             'book': self.create_random_string(5, include_numbers=False),
-            'time_stamp': datetime.now(timezone.utc)
+            'time_stamp': self.get_job_clock().get_timestamp()
         }
 
         for key, value in self.create_dummy_field_generator():
@@ -1,6 +1,6 @@
 import random
 import string
-from datetime import datetime, timezone
+from datetime import datetime
 
 import pandas as pd
 
@@ -17,6 +17,11 @@ class SwapPositionFactory(Creatable):
     created prior, then for each position type (start of day, intraday,
     end of day), create a record for every date from the user specified
     start-date until today's date.
+
+    As the number of positions grows with the date range rather than with
+    the number of swap contracts requested, positions are created lazily and
+    yielded by create_chunks in chunks of at most the 'max_records_per_chunk'
+    of the shared args, where set.
     """
 
     PURPOSES = ['Outright']
@@ -38,25 +43,78 @@ class SwapPositionFactory(Creatable):
             Containing 'record_count' swap positions
         """
 
+        return [record for chunk in self.create_chunks(record_count, start_id)
+                for record in chunk]
+
+    def create_chunks(self, record_count, start_id):
+        """ Yield the swap positions of a set number of swap contracts in
+        chunks of at most the maximum number of records per chunk, or as a
+        single chunk where no maximum is set. The positions are created
+        lazily as the chunks are taken, and the end of day positions of each
+        chunk are persisted before it is yielded, so that only a chunk of
+        positions is held at once however long the date range.
+
+        Parameters
+        ----------
+        record_count : int
+            Number of swap contracts to create swap positions for
+        start_id : int
+            Starting id of the swap contracts
+
+        Yields
+        ------
+        List
+            Swap positions, the last chunk possibly empty
+        """
+
+        max_records_per_chunk = self.get_max_records_per_chunk()
+        chunk = []
+
+        for record in self.generate_records(record_count, start_id):
+            chunk.append(record)
+            if len(chunk) == max_records_per_chunk:
+                self.persist_records('swap_positions')
+                yield chunk
+                chunk = []
+
+        self.persist_records('swap_positions')
+        yield chunk
+
+    def generate_records(self, record_count, start_id):
+        """ Generate the swap positions of a set number of swap contracts,
+        one at a time: for each swap contract, for each of a random number of
+        instruments, for each position type, a position for every date from
+        the user specified start date until today's date
+
+        Parameters
+        ----------
+        record_count : int
+            Number of swap contracts to create swap positions for
+        start_id : int
+            Starting id of the swap contracts
+
+        Yields
+        ------
+        dict
+            A single swap position
+        """
+
         self.all_instruments = self.retrieve_records('instruments')
 
         start_date = datetime.strptime(self.get_start_date(), '%Y%m%d')
         date_range = pd.date_range(
-            start_date, datetime.now(timezone.utc).date(), freq='D'
+            start_date, self.get_job_clock().today, freq='D'
         )
         swap_contract_batch =\
             self.retrieve_batch_records('swap_contracts',
                                         record_count, start_id)
 
-        records = [self.create_record(swap_contract, instrument,
-                                        position_type, date)
-                   for swap_contract in swap_contract_batch
-                   for instrument in self.get_random_instruments()
-                   for position_type in self.POSITION_TYPES
-                   for date in date_range]
-
-        self.persist_records('swap_positions')
-        return records
+        for swap_contract in swap_contract_batch:
+            for instrument in self.get_random_instruments():
+                for position_type in self.POSITION_TYPES:
+                    for date in date_range:
+                        yield self.create_record(swap_contract, instrument,
+                                                 position_type, date)
 
     def create_record(self, swap_contract, instrument, position_type, date):
         """ Create a single swap position
@@ -108,7 +166,7 @@ class SwapPositionFactory(Creatable):
             'long_short': long_short,
             'td_quantity': quantity,
             'purpose': purpose,
-            'time_stamp': datetime.now(timezone.utc)
+            'time_stamp': self.get_job_clock().get_timestamp()
         }
 
         for key, value in self.create_dummy_field_generator():
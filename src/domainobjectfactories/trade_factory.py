@@ -1,18 +1,22 @@
-import random
-from datetime import datetime, timezone, timedelta
+from datetime import datetime, time, timezone
+
+import numpy as np
 
 from domainobjectfactories.creatable import Creatable
+from multi_processing.record_batch import RecordBatch
 
 
 class TradeFactory(Creatable):
     """ Class to create trades. Create method will create a
-    set amount of trades. """
+    set amount of trades, attribute by attribute. """
 
     TRADE_LEGS = ["EMPTY", "1", "2"]
     DIRECTIONS = ["BUY", "SELL"]
 
     def create(self, record_count, start_id, lock=None):
-        """ Create a set number of trades
+        """ Create a set number of trades. Each attribute of the trades is
+        created as a whole column of values at once, and the columns are
+        returned as a batch without building a dictionary of each trade.
 
         Parameters
         ----------
@@ -26,16 +30,40 @@ class TradeFactory(Creatable):
 
         Returns
         -------
-        List
+        RecordBatch
             Containing 'record_count' trades
         """
 
-        records = []
-
-        for i in range(start_id, start_id+record_count):
-            records.append(self.create_record(i))
+        booking_datetimes = self.__create_booking_datetimes(record_count)
+        instruments = self.sample_instruments(record_count)
+        quantities = self.__create_quantities(record_count)
+
+        columns = {
+            'trade_id': range(start_id, start_id + record_count),
+            'contract_id': self.__create_contract_ids(record_count),
+            'booking_datetime': booking_datetimes,
+            'trade_datetime': booking_datetimes,
+            'value_datetime':
+                [self.__create_value_datetime()] * record_count,
+            'order_id': self.__create_order_ids(record_count),
+            'account_id': self.__get_account_ids(record_count),
+            'counterparty_id': self.__get_counterparty_ids(record_count),
+            'trader_id': self.__create_trader_ids(record_count),
+            'price': self.__create_prices(quantities),
+            'currency': self.choices(record_count, self.CURRENCIES),
+            'isin': [instrument['isin'] for instrument in instruments],
+            'market': [instrument['market'] for instrument in instruments],
+            'trade_leg': self.choices(record_count, self.TRADE_LEGS),
+            'is_otc': self.choices(record_count, self.TRUE_FALSE),
+            'direction': self.choices(record_count, self.DIRECTIONS),
+            'quantity': quantities,
+            'created_timestamp': self.__create_created_timestamps(
+                record_count
+            )
+        }
+        columns.update(self.create_dummy_field_columns(record_count))
 
-        return records
+        return RecordBatch(columns)
 
     def create_record(self, id):
         """ Create a single trade
@@ -51,183 +79,120 @@ class TradeFactory(Creatable):
             A single trade object
         """
 
-        booking_datetime, trade_datetime, value_datetime = \
-            self.__create_trade_lifecycle_dates()
-        isin, market = self.__get_instrument_details()
-        quantity = self.__create_quantity()
-
-        record = {
-            'trade_id': id,
-            'contract_id': self.__create_contract_id(),
-            'booking_datetime': booking_datetime,
-            'trade_datetime': trade_datetime,
-            'value_datetime': value_datetime,
-            'order_id': self.__create_order_id(),
-            'account_id': self.__get_account_id(),
-            'counterparty_id': self.__get_counterparty_id(),
-            'trader_id': self.__create_trader_id(),
-            'price': self.__create_price(quantity),
-            'currency': self.create_currency(),
-            'isin': isin,
-            'market': market,
-            'trade_leg': self.__create_trade_leg(),
-            'is_otc': self.create_random_boolean(),
-            'direction': self.__create_direction(),
-            'quantity': quantity,
-            'created_timestamp': self.__create_created_timestamp()
-        }
-
-        for key, value in self.create_dummy_field_generator():
-            record[key] = value
-
-        return record
-
-    def __get_instrument_details(self):
-        """ Return the isin and market of an instrument persisted in the
-        local database.
+        return self.create(1, id)[0]
 
+    def __create_contract_ids(self, record_count):
+        """ Return ids of the trade contracts
         Returns
         -------
-        String
-            isin of instrument from local database
-        String
-            market of instrument from local database
+        List
+            10 character random strings representing trade contract ids
         """
-        instrument = self.get_random_instrument()
-        isin = instrument['isin']
-        market = instrument['market']
-        return isin, market
+        return self.random_strings(record_count, 10)
+
+    def __create_booking_datetimes(self, record_count):
+        """ return datetime objects representing when each trade was booked
+        and executed, both of which are currently hard coded to be the
+        current datetime in UTC
 
-    def __create_contract_id(self):
-        """ Return id of the trade contract
         Returns
         -------
-        String
-            10 character random string representing trade contract id
+        List
+            Datetime objects in UTC representing booking and trade datetimes
+            - set to use the current datetime of the job
         """
-        return self.create_random_string(10)
+        return self.get_job_clock().get_timestamps(record_count)
 
-    @staticmethod
-    def __create_trade_lifecycle_dates():
-        """ return datetime objects representing when the trade was booked,
-        executed and due to be settled respectively. These are currently hard
-        coded to be the current date for booking and executing, and 2 days in
-        the future for settlement. Datetimes are in UTC, and value date is set
-        to 1 minute past midnight on the morning of T+2
+    def __create_value_datetime(self):
+        """ return the datetime at which trades are due to be settled. This
+        is currently hard coded to be 2 days in the future for settlement.
+        Datetimes are in UTC, and value date is set to 1 minute past midnight
+        on the morning of T+2
 
         Returns
         -------
-        Datetime
-            Datetime object in UTC representing booking datetime - set to use
-            current datetime
-        Datetime
-            Datetime object in UTC representing trade datetime - set to use
-            current datetime
         Datetime
             Datetime object in UTC representing expected value datetime - set
             to 1 minute past midgnight on the morning of T+2, where the
             current date is T
         """
-        booking_datetime = trade_datetime = datetime.now(timezone.utc)
-        day_after_tomorrow = datetime.now(timezone.utc) + timedelta(days=2)
-        value_datetime = day_after_tomorrow.replace(
-            hour=0, minute=1, second=0, microsecond=0
-        )
-        return booking_datetime, trade_datetime, value_datetime
+        return datetime.combine(self.get_job_clock().get_date(2),
+                                time(minute=1), tzinfo=timezone.utc)
 
-    def __create_order_id(self):
-        """ Return id of the order
+    def __create_order_ids(self, record_count):
+        """ Return ids of the orders
         Returns
         -------
-        Integer
-            random integer between 1 and 10000
+        List
+            random integers between 1 and 10000
         """
-        return self.create_random_integer()
+        return self.random_ints(record_count)
 
-    def __get_account_id(self):
-        """ Return the account id value of an account persisted in the
-        database that is type 'Client' or 'Firm'
+    def __get_account_ids(self, record_count):
+        """ Return the account id values of accounts persisted in the
+        database that are type 'Client' or 'Firm'
 
         Returns
         -------
-        String
-            account id of 'Client' or 'Firm' type account from database
+        List
+            account ids of 'Client' or 'Firm' type accounts from database
         """
-        account = self.get_random_record_with_valid_attribute(
-            'accounts', 'account_type', ['Client', 'Firm']
+        accounts = self.get_random_records_with_valid_attribute(
+            'accounts', 'account_type', ['Client', 'Firm'], record_count
         )
-        return account['account_id']
+        return [account['account_id'] for account in accounts]
 
-    def __get_counterparty_id(self):
-        """ Return the account id value of an account persisted in the
-        database that is type 'Counterparty'
+    def __get_counterparty_ids(self, record_count):
+        """ Return the account id values of accounts persisted in the
+        database that are type 'Counterparty'
 
         Returns
         -------
-        String
-            account id of 'Counterparty' type account from database
+        List
+            account ids of 'Counterparty' type accounts from database
         """
-        account = self.get_random_record_with_valid_attribute(
-            'accounts', 'account_type', ['Counterparty']
+        accounts = self.get_random_records_with_valid_attribute(
+            'accounts', 'account_type', ['Counterparty'], record_count
         )
-        return account['account_id']
-
-    def __create_trader_id(self):
-        """ Return id of the trader
-        Returns
-        -------
-        String
-            10 character random string representing trader id
-        """
-        return self.create_random_string(10)
+        return [account['account_id'] for account in accounts]
 
-    def __create_price(self, quantity):
-        """ Return total value of the trade, found by multiplying instrument
-        quantity by a randomly generated unit price. Unit price is generated
-        to represent the trade being done at a different price to the market
-        price that might be given by a Price domain object
+    def __create_trader_ids(self, record_count):
+        """ Return ids of the traders
         Returns
         -------
-        Float
-            Total trade price to 2 decimal places
-        """
-        unit_price = self.create_random_decimal(min=1, max=10)
-        return round(unit_price * quantity, 2)
-
-    def __create_trade_leg(self):
-        """ Return trade leg
-        Returns
-        -------
-        String
-            one of "1", "2" or "EMPTY"
+        List
+            10 character random strings representing trader ids
         """
-        return random.choice(self.TRADE_LEGS)
+        return self.random_strings(record_count, 10)
 
-    def __create_direction(self):
-        """ Return direction
+    def __create_prices(self, quantities):
+        """ Return total values of the trades, found by multiplying each
+        instrument quantity by a randomly generated unit price. Unit prices
+        are generated to represent the trades being done at a different price
+        to the market price that might be given by a Price domain object
         Returns
         -------
-        String
-            one of "BUY", "SELL"
+        List
+            Total trade prices to 2 decimal places
         """
-        return random.choice(self.DIRECTIONS)
+        unit_prices = self.random_decimals(len(quantities), min=1, max=10)
+        return np.round(np.multiply(unit_prices, quantities), 2).tolist()
 
-    def __create_quantity(self):
-        """ Return quantity of instruments in the trade
+    def __create_quantities(self, record_count):
+        """ Return quantities of instruments in the trades
         Returns
         -------
-        Integer
-            random integer between 1 and 10000
+        List
+            random integers between 1 and 10000
         """
-        return self.create_random_integer()
+        return self.random_ints(record_count)
 
-    @staticmethod
-    def __create_created_timestamp():
-        """ return datetime representing when the trade was entered into the
-        system in UTC
+    def __create_created_timestamps(self, record_count):
+        """ return datetimes representing when each trade was entered into
+        the system in UTC
         Returns
         -------
-        Datetime
-            Datetime object in UTC
+        List
+            Datetime objects in UTC
         """
-        return datetime.now(timezone.utc)
+        return self.get_job_clock().get_timestamps(record_count)
@@ -1,27 +1,32 @@
 from filebuilders.file_builder import FileBuilder
+from multi_processing.record_batch import MISSING, as_record_batch
 import csv
 import os
 
 
 class CSVBuilder(FileBuilder):
     """ A class to generate a CSV file from records. Uses the csv library to
-    achieve this. """
+    achieve this, writing the values of each record in the schema order of
+    their batch without building a dictionary of each. """
 
     def build(self, file_number, data):
         output_dir = self.get_output_directory()
         file_name = self.get_file_name().format(f'{file_number:03}')
 
-        if not os.path.exists(output_dir):
-            os.mkdir(output_dir)
+        self.make_output_directory()
 
         with open(os.path.join(output_dir, file_name),
                   'w+', newline='') as output_file:
-            fieldnames = data[0].keys()  # get keys from first dict
-            dict_writer = csv.DictWriter(output_file, restval="-",
-                                         fieldnames=fieldnames,
-                                         delimiter=',')
-            dict_writer.writeheader()
-            dict_writer.writerows(data)
+            records = as_record_batch(data)
+            rows = records.get_rows()
+            if records.has_missing_values:
+                # attributes a record does not have are written as "-"
+                rows = (['-' if value is MISSING else value for value in row]
+                        for row in rows)
+
+            writer = csv.writer(output_file, delimiter=',')
+            writer.writerow(records.schema)
+            writer.writerows(rows)
 
         if self.google_drive_connector_exists():
             self.upload_to_google_drive(output_dir, file_name)
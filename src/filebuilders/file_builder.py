@@ -42,6 +42,8 @@ class FileBuilder(abc.ABC):
         Closes the current file
     get_output_directory()
         Returns the output directory
+    make_output_directory()
+        Creates the output directory if it does not exist
     get_file_name()
         Returns the file name
     get_google_drive_connector()
@@ -94,8 +96,9 @@ class FileBuilder(abc.ABC):
         ----------
         file_number : int
             The current file number to be writing to
-        data : List
-            List of records to be writen to file
+        data : RecordBatch
+            Batch of records to be writen to file, iterated as dictionaries
+            by builders which serialise each record
         """
         pass
 
@@ -151,6 +154,12 @@ class FileBuilder(abc.ABC):
         """
         return self.__output_dir
 
+    def make_output_directory(self):
+        """ Create the directory where files are output to, if it does not
+        exist already. Several write processes may create it at once, so it
+        is not an error for another process to have created it first. """
+        os.makedirs(self.__output_dir, exist_ok=True)
+
     def get_file_name(self):
         """ Return the name of current file
 
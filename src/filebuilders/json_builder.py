@@ -11,11 +11,10 @@ class JSONBuilder(FileBuilder):
         output_dir = self.get_output_directory()
         file_name = self.get_file_name().format(f'{file_number:03}')
 
-        if not os.path.exists(output_dir):
-            os.mkdir(output_dir)
+        self.make_output_directory()
 
         with open(os.path.join(output_dir, file_name), 'w') as output_file:
-            ujson.dump(data, output_file)
+            ujson.dump(list(data), output_file)
 
         if self.google_drive_connector_exists():
             self.upload_to_google_drive(output_dir, file_name)
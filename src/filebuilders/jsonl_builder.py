@@ -11,8 +11,7 @@ class JSONLBuilder(FileBuilder):
         output_dir = self.get_output_directory()
         file_name = self.get_file_name().format(f'{file_number:03}')
 
-        if not os.path.exists(output_dir):
-            os.mkdir(output_dir)
+        self.make_output_directory()
 
         with open(os.path.join(output_dir, file_name), 'w') as output_file:
             to_output = [ujson.dumps(record) for record in data]
@@ -12,14 +12,13 @@ class XMLBuilder(FileBuilder):
         file_name = self.get_file_name().format(f'{file_number:03}')
         root_element_name = self.get_root_element_name()
 
-        if not os.path.exists(output_dir):
-            os.mkdir(output_dir)
+        self.make_output_directory()
 
         with open(os.path.join(output_dir, file_name), 'w') as output_file:
             # convert data to bytes
             item_func = self.get_item_func()
             xml = dicttoxml.dicttoxml(
-                data, custom_root=root_element_name,
+                list(data), custom_root=root_element_name,
                 ids=False, item_func=item_func
             )
 
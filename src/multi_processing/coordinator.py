@@ -1,8 +1,31 @@
-from multiprocessing import Manager, Process
+from multiprocessing import Process, SimpleQueue
+from queue import Empty
 from multi_processing.creator import Creator
+from multi_processing.dependency_writer import DependencyWriter
+from multi_processing.in_flight_limit import InFlightRecordLimit
+from multi_processing.job_sizing import JobSizeTuner, DEFAULT_JOB_SIZING, \
+    DEFAULT_TARGET_JOB_DURATION
+from multi_processing.queue_transport import QueueTransport, \
+    DEFAULT_QUEUE_TRANSPORT
 from multi_processing.writer import Writer
+import itertools
 import math
 
+EXECUTION_MODES = ['pipelined', 'fused']
+DEFAULT_EXECUTION_MODE = 'pipelined'
+
+# domain objects whose factories create a number of records depending on
+# the records of the domain objects they depend on, rather than the quantity
+# of their create jobs, so whose files cannot be numbered in 'fused' mode by
+# the range of records each job creates
+UNSIZED_DOMAIN_OBJECTS = ['swap_contract', 'swap_position', 'cashflow']
+
+# seconds to wait for a domain object to be completed before checking that
+# none of the parent processes has exited, and for each parent process to
+# exit once one has, before it is terminated
+PARENT_PROCESS_CHECK_INTERVAL = 1
+PARENT_PROCESS_EXIT_TIMEOUT = 60
+
 # Class to coordinate the multiprocessing implementation. It is
 # required to abstract the multiprocessing logic from any unpickleable
 # objects, such as the database connection.
@@ -14,8 +37,39 @@ class Coordinator:
     program, such as database connections. Holds, instantiates and passes job
     queues to create and write processes, additionally starts these.
 
+    A single Coordinator is used for the whole generation run. The create and
+    write parent processes, and the pools of child processes they own, are
+    started once and stay alive across all domain objects. Domain objects are
+    streamed through them as they become ready to be created, several at a
+    time where they do not depend on each other, and the processes and their
+    pools are torn down exactly once when 'join_parent_processes' is called
+    at the end of the run.
+
+    Two execution modes are supported, selected by the optional
+    'execution_mode' key of the shared args. In 'pipelined' mode (default),
+    records are created by the create child processes, passed back through
+    the create and write parent processes and written by the write child
+    processes. In 'fused' mode, each create job covers a fixed range of output
+    files, and the create child process running it writes the records it
+    creates straight to those files. Only a small completion message is
+    returned to the create parent process, and no records are put on the
+    created record queue. Fused mode numbers files by the range of IDs each
+    job creates, so it is only accepted for domain objects whose factory
+    creates exactly the quantity of records requested of it, see
+    UNSIZED_DOMAIN_OBJECTS.
+
+    Jobs are sized as requested by the optional 'job_sizing' key of the shared
+    args, see the job_sizing module.
+
+    A third process, the dependency writer process, is the only process to
+    write to the dependency store, inserting the records persisted by the
+    child create processes, see the dependency_writer module.
+
     Attributes
     ----------
+    queue_transport : QueueTransport
+        Creates the queues below using the transport requested by the
+        optional 'queue_transport' key of the shared args
     create_job_queue : Multiprocessing Queue
         Multiprocessing-safe, holds jobs for the create parent process to
         dequeue and run
@@ -23,6 +77,18 @@ class Coordinator:
         Multiprocessing-safe, holds lists of records created by the create
         parent process for the write parent process to dequeue and write to
         file
+    completed_object_queue : Multiprocessing Queue
+        Multiprocessing-safe, receives the name, peak resident set size and
+        number of failed write jobs of each domain object from the write
+        parent process once all of its records have been written
+    dependency_queue : Multiprocessing SimpleQueue
+        Multiprocessing-safe, holds records persisted by the child create
+        processes for the dependency writer process to insert, along with
+        flush messages from the create parent process
+    dependency_flushed_queue : Multiprocessing Queue
+        Multiprocessing-safe, receives the name of each domain object whose
+        persisted records have been committed by the dependency writer
+        process
     create_coordinator : Creator
         Manages the create parent processes and pool of child processes. Holds
         both 'create_job_queue' and 'created_record_queue' to dequeue jobs
@@ -32,81 +98,240 @@ class Coordinator:
         Manages the write  parent processes and pool of child processes.
         Holds the 'created_record_queue', dequeuing batches of jobs from it as
         they arrive and running them over its pool of subprocesses.
-    object_factory : Creatable
-        Instantiated subclass of Creatable to be used for creating the records
-        when running create jobs
+    dependency_writer : DependencyWriter
+        Manages the dependency writer process, which inserts the records on
+        the 'dependency_queue' into the dependency store
+    shared_args : dict
+        User arguments defining parameters for multiprocessing, which are
+        fixed for all object factories and file builders
+    execution_mode : String
+        One of EXECUTION_MODES, taken from the shared args
+    job_sizing : String
+        One of JOB_SIZINGS, taken from the shared args
+    in_flight_limit : InFlightRecordLimit
+        Caps the number of records in flight between the create and write
+        parent processes, as requested by the optional
+        'max_records_in_flight' key of the shared args
     parent_processes : list
         Contains pointers to the create and write parent processes such that
         they can accessed be terminated upon completion.
 ...........................................
     Methods
     -------
-    populate_create_job_queue()
-        Populate the create job queue with jobs based on the number of records
+    populate_create_job_queue(domain_objects)
+        Populate the create job queue with the interleaved jobs of one or more
+        domain objects
+
+    get_create_jobs(domain_object, file_builder, object_factory)
+        Generate the jobs of a domain object based on the number of records
         to generate and the maximum number of records per job as specified in
         the user config
 
+    get_fused_number_of_records_per_job(max_records_per_file)
+        Return the number of records each fused create job is to create
+
+    wait_for_domain_object_completion()
+        Block until the write parent process reports that a domain object has
+        been written to file, and return its name, peak resident set size
+        and number of failed write jobs
+    check_parent_processes()
+        Raise ChildProcessError once the other parent processes have exited,
+        should any parent process have exited before the end of the run
+
     start_create_parent_process()
         Start the create parent process and append to 'parent_processes'
 
     start_write_parent_process(pool_size)
         Start the write parent process and append to 'parent_processes'
 
+    start_dependency_writer_process()
+        Start the dependency writer process and append to 'parent_processes'
+
     join_parent_processes()
-        Wait for create & write coordinators to terminate
+        Instruct create & write coordinators to terminate and wait for them
     """
 
-    def __init__(self, file_builder, object_factory):
+    def __init__(self, shared_args, object_factories,
+                 dependency_fingerprints=None):
         """Set initial values of instance attributes. Process coordinators will
         not run until their 'parent_process' methods are called.
 
         Parameters
         ----------
-        file_builder : File_Builder
-            Instantiated and pre-configured file builder to write files of
-            the necessary format.
-        object_factory : Creatable
-            Instantiated and pre-configured object factory which produces
-            the current object.
+        shared_args : dict
+            User arguments defining parameters for multiprocessing, which are
+            fixed for all object factories and file builders
+        object_factories : dict
+            Instantiated and pre-configured object factories of every domain
+            object of the run, keyed by domain object name, to be installed
+            in each child create process
+        dependency_fingerprints : dict, optional
+            Fingerprint of each domain object persisting records to the
+            dependency store, recorded by the dependency writer process once
+            every record of it has been committed
         """
 
-        queue_manager = Manager()
-        self.__create_job_queue = queue_manager.Queue()
-        self.__created_record_queue = queue_manager.Queue()
+        self.__queue_transport = QueueTransport(
+            shared_args.get('queue_transport', DEFAULT_QUEUE_TRANSPORT)
+        )
+        self.__create_job_queue = self.__queue_transport.create_queue()
+        self.__created_record_queue = self.__queue_transport.create_queue()
+        self.__completed_object_queue = self.__queue_transport.create_queue()
+
+        # puts to a SimpleQueue are written to its pipe before returning, so
+        # records put by a child create process precede anything put after
+        # its job has finished, see the dependency_writer module
+        self.__dependency_queue = SimpleQueue()
+        self.__dependency_flushed_queue = \
+            self.__queue_transport.create_queue()
+
+        self.__execution_mode = shared_args.get(
+            'execution_mode', DEFAULT_EXECUTION_MODE
+        )
+
+        self.__job_sizing = shared_args.get('job_sizing', DEFAULT_JOB_SIZING)
+
+        if self.__job_sizing == 'adaptive':
+            job_size_tuner = JobSizeTuner(
+                shared_args['number_of_records_per_job'],
+                shared_args.get(
+                    'target_job_duration', DEFAULT_TARGET_JOB_DURATION
+                )
+            )
+        else:
+            job_size_tuner = None
+
+        self.__in_flight_limit = InFlightRecordLimit(
+            shared_args.get('max_records_in_flight')
+        )
 
         self.__create_coordinator = Creator(
             self.__create_job_queue,
-            self.__created_record_queue
+            self.__created_record_queue,
+            self.__dependency_queue,
+            self.__dependency_flushed_queue,
+            object_factories,
+            self.__execution_mode,
+            self.__in_flight_limit,
+            job_size_tuner
         )
 
         self.__write_coordinator = Writer(
             self.__created_record_queue,
-            file_builder.get_max_objects_per_file(),
-            file_builder
+            self.__completed_object_queue,
+            self.__in_flight_limit
         )
 
-        self.__object_factory = object_factory
-        self.__parent_processes = []
+        self.__dependency_writer = DependencyWriter(
+            self.__dependency_queue,
+            self.__dependency_flushed_queue,
+            shared_args,
+            dependency_fingerprints
+        )
 
-    def populate_create_job_queue(self):
-        """Populate the create job queue with create jobs.
+        self.__shared_args = shared_args
+        self.__parent_processes = []
 
-        A create job is a 2-element dictionary. Quantity and Start_ID are
-        arguments for an object factory's create call. Quantity informs as to
-        the number of objects to produce. Start_ID keeps track of the batch of
-        IDs the job will be producing in the case of sequentially ID'd domain
-        objects.
+    def populate_create_job_queue(self, domain_objects):
+        """Populate the create job queue with the create jobs of one or more
+        domain objects, which are created at the same time.
+
+        The jobs of each domain object are preceded by a message holding the
+        name of the domain object and the file builder to use for it, which
+        the create parent process passes on to the write parent process. The
+        object factory is only used here to size the jobs, as the child
+        create processes already hold the factory of every domain object.
+        The jobs of the domain objects are then interleaved, one job of each
+        domain object at a time, so that the domain objects share the pools
+        of child processes rather than queue behind each other.
+
+        A create job is a dictionary. Domain_Object names the domain object
+        the job belongs to. Quantity and Start_ID are arguments for an object
+        factory's create call. Quantity informs as to the number of objects to
+        produce. Start_ID keeps track of the batch of IDs the job will be
+        producing in the case of sequentially ID'd domain objects. For domain
+        objects created from the rows of the table of another, such as swap
+        positions from swap contracts, Start_ID and Quantity instead hand the
+        job the range of ROWIDs from Start_ID + 1 to Start_ID + Quantity of
+        that table, see Sqlite_Database.retrieve_batch.
+
+        In 'fused' execution mode, each create job is sized to fill a whole
+        number of output files, and additionally holds File_Number, the number
+        of the first file it is to write.
+
+        In 'adaptive' job sizing mode, a single create job covering every
+        record of the domain object is queued instead, which the create parent
+        process carves into jobs of tuned size.
+
+        An end of domain object message, holding the name of the domain
+        object, is added to the queue after its last create job. This informs
+        the parent processes that every record of the domain object has been
+        queued, so that residual records can be written and completion
+        reported.
 
-        A termination flag is added to the queue last. This informs the
-        create parent process to stop awaiting instruction once read, causing
-        it to terminate once the currently-running jobs have ceased.
+        Parameters
+        ----------
+        domain_objects : list
+            Dictionaries, each holding the name of a domain object under
+            'domain_object', and its instantiated and pre-configured file
+            builder and object factory under 'file_builder' and
+            'object_factory' respectively
         """
 
-        number_of_records_to_create = self.__object_factory.get_record_count()
-        number_of_records_per_job = self.__object_factory.get_shared_args()[
-            'number_of_records_per_job'
+        for domain_object in domain_objects:
+            self.__create_job_queue.put({
+                'domain_object': domain_object['domain_object'],
+                'file_builder': domain_object['file_builder']
+            })
+
+        create_job_generators = [
+            self.get_create_jobs(
+                domain_object['domain_object'],
+                domain_object['file_builder'],
+                domain_object['object_factory']
+            ) for domain_object in domain_objects
         ]
 
+        for create_jobs in itertools.zip_longest(*create_job_generators):
+            for create_job in create_jobs:
+                if create_job is not None:
+                    self.__create_job_queue.put(create_job)
+
+    def get_create_jobs(self, domain_object, file_builder, object_factory):
+        """ Generator of the create jobs of a single domain object, followed
+        by its end of domain object message.
+
+        Parameters
+        ----------
+        domain_object : String
+            Name of the domain object, as given in the user config
+        file_builder : File_Builder
+            Instantiated and pre-configured file builder to write files of
+            the necessary format.
+        object_factory : Creatable
+            Instantiated and pre-configured object factory which produces
+            the current object.
+
+        Yields
+        ------
+        dict
+            Each create job of the domain object, then the end of domain
+            object message
+        """
+
+        number_of_records_to_create = object_factory.get_record_count()
+        max_records_per_file = file_builder.get_max_objects_per_file()
+
+        if self.__job_sizing == 'adaptive':
+            number_of_records_per_job = max(1, number_of_records_to_create)
+        elif self.__execution_mode == 'fused':
+            number_of_records_per_job = \
+                self.get_fused_number_of_records_per_job(max_records_per_file)
+        else:
+            number_of_records_per_job = self.__shared_args[
+                'number_of_records_per_job'
+            ]
+
         # round up using math.ceil to ensure a job is created for residual
         # records that do not take up a whole file's worth of records
 
@@ -124,23 +349,127 @@ class Coordinator:
             )
 
             create_job = {
+                'domain_object': domain_object,
                 'quantity': quantity,
                 'start_id': start_id
             }
 
-            self.__create_job_queue.put(create_job)
+            if self.__execution_mode == 'fused' and \
+                    self.__job_sizing == 'fixed':
+                create_job['file_number'] = start_id // max_records_per_file
+
+            yield create_job
 
             start_id += number_of_records_per_job
             number_of_records_without_create_jobs -= quantity
 
-        self.__create_job_queue.put("terminate")
+        yield {'end_of_domain_object': domain_object}
+
+    def get_fused_number_of_records_per_job(self, max_records_per_file):
+        """ Returns the number of records each fused create job is to create.
+        This is the largest whole number of output files whose records do
+        not exceed 'number_of_records_per_job', and is at least one file.
+
+        Parameters
+        ----------
+        max_records_per_file : int
+            The maximum number of records in each output file of the domain
+            object
+
+        Returns
+        -------
+        int
+            Number of records in each fused create job
+        """
+
+        number_of_files_per_job = max(
+            1,
+            self.__shared_args['number_of_records_per_job']
+            // max_records_per_file
+        )
+        return number_of_files_per_job * max_records_per_file
+
+    def wait_for_domain_object_completion(self):
+        """ Block until the write parent process reports that all records of
+        one of the domain objects being processed have been written.
+
+        Returns
+        -------
+        dict
+            Holds the name of the domain object which has been written to
+            file under 'domain_object', and the largest resident set size of
+            any create or write process seen while processing it, in bytes,
+            under 'peak_resident_set_size', and the number of its write jobs
+            which failed under 'failed_write_jobs'
+
+        Raises
+        ------
+        ChildProcessError
+            Where a parent process has exited, such as the create parent
+            process after a create job failed, so that no domain object will
+            be completed
+        """
+
+        while True:
+            try:
+                return self.__completed_object_queue.get(
+                    timeout=PARENT_PROCESS_CHECK_INTERVAL
+                )
+            except Empty:
+                pass
+
+            self.check_parent_processes()
+
+    def check_parent_processes(self):
+        """ Checks that every parent process is still running, as they only
+        exit once instructed to at the end of the run. Should one have
+        exited, the others are given time to exit themselves, as the create
+        parent process instructs them to when it fails, and are terminated
+        otherwise.
+
+        Raises
+        ------
+        ChildProcessError
+            Where a parent process has exited, naming the first to have
+            failed, or to have exited should none have failed, and its exit
+            code
+        """
+
+        exited_processes = [
+            process for process in self.__parent_processes
+            if not process.is_alive()
+        ]
+
+        if not exited_processes:
+            return
+
+        for process in self.__parent_processes:
+            process.join(timeout=PARENT_PROCESS_EXIT_TIMEOUT)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+
+        failed_processes = [
+            process for process in exited_processes if process.exitcode
+        ]
+        exited_process = (failed_processes or exited_processes)[0]
+
+        raise ChildProcessError(
+            f"The {exited_process.name} exited with code " +
+            f"{exited_process.exitcode} before the end of the run"
+        )
 
     def start_create_parent_process(self):
         """ Start the create parent process """
 
+        number_of_create_child_processes = self.__shared_args[
+            'number_of_create_child_processes'
+        ]
+
         create_parent_process = Process(
+            name='create parent process',
             target=self.__create_coordinator.parent_process,
-            args=(self.__object_factory,)
+            args=(number_of_create_child_processes,)
         )
 
         create_parent_process.start()
@@ -150,12 +479,12 @@ class Coordinator:
     def start_write_parent_process(self):
         """ Starts the write parent process """
 
-        number_of_write_child_processes =\
-            self.__object_factory.get_shared_args()[
-                'number_of_write_child_processes'
-            ]
+        number_of_write_child_processes = self.__shared_args[
+            'number_of_write_child_processes'
+        ]
 
         write_parent_process = Process(
+            name='write parent process',
             target=self.__write_coordinator.parent_process,
             args=(number_of_write_child_processes,)
         )
@@ -164,7 +493,23 @@ class Coordinator:
 
         self.__parent_processes.append(write_parent_process)
 
+    def start_dependency_writer_process(self):
+        """ Starts the dependency writer process """
+
+        dependency_writer_process = Process(
+            name='dependency writer process',
+            target=self.__dependency_writer.parent_process
+        )
+
+        dependency_writer_process.start()
+
+        self.__parent_processes.append(dependency_writer_process)
+
     def join_parent_processes(self):
-        """Waits for spawned child processes to terminate."""
+        """Instructs the parent processes to tear down their pools and
+        terminate, then waits for them to do so."""
+
+        self.__create_job_queue.put("terminate")
+
         for process in self.__parent_processes:
             process.join()
@@ -1,12 +1,15 @@
-import time
+import threading
+from multiprocessing import SimpleQueue
+from queue import Empty
 from multi_processing import pool_tasks
+from multi_processing.memory_usage import get_resident_set_size
 
 
 class Creator:
     """ A class to coordinate the creation of domain objects as specified by
     'create jobs' from the multiprocessing-safe queue 'create_job_queue'.
     'Create jobs' are sequentially dequeued in batches and run over a pool of
-    child processes, returning a list containing all created records from the
+    child processes, returning a batch containing all created records from the
     jobs in that batch.
 
     A 'create job' is a dictionary specifying a quantity of domain object
@@ -14,45 +17,156 @@ class Creator:
     quantity of records in a 'create job' is specified in the 'shared_args'
     section of the user config by the 'number_of_records_per_job' key.
 
-    The create parent process will wait until the 'create_job_queue' is not
-    empty, at which point it will dequeue 'create jobs' and add them to a list.
+    The create parent process is started once per generation run. It creates
+    its pool of child create processes when it starts, and keeps that pool
+    alive for every domain object processed during the run. The pool is
+    closed once the "terminate" flag is dequeued.
+
+    The object factories of every domain object of the run are given to the
+    Creator up front, and installed in each child create process once when
+    the pool is created, so that 'create jobs' only need to name their domain
+    object. The 'create jobs' of each domain object are preceded on the queue
+    by a message holding the name of the domain object and the file builder
+    to write them with, and followed by an end of domain object message. The
+    file builder message is passed on to the write parent process, as is the
+    end of domain object message once the jobs before it have run. The jobs of
+    several domain objects may be interleaved on the queue, each job naming
+    the domain object it belongs to.
+
+    The create parent process blocks on the 'create_job_queue' until an item
+    is put on it, so it is woken as soon as work arrives rather than polling
+    the queue. It then dequeues any further 'create jobs' that are already
+    waiting without blocking, and adds them to a list.
     It will not dequeue more than double the number of child create processes
     worth of create jobs at a time to ensure that the child processes work on
     reasonable sized batches of create jobs.
 
-    The dequeued 'create jobs' in the list are executed over a pool of child
-    create processes which, upon termination of all child processes, returns
-    a list of created records. This list contains the collated output from that
-    batch of 'create jobs'.
-
-    As batches of 'create jobs' are run, the returned lists of records are
-    added to a FIFO 'generated_record_queue'. This queue is shared between the
-    create and write parent processes.
+    The dequeued 'create jobs' in the list are executed over the pool of child
+    create processes which, once every job has finished, returns a batch of
+    created records for each domain object in the batch. Each batch contains
+    the collated output from that batch of 'create jobs' for its domain
+    object.
+
+    As batches of 'create jobs' are run, the returned batches of records are
+    added to a FIFO 'generated_record_queue', along with the name of their
+    domain object. This queue is shared between the create and write parent
+    processes.
+
+    Before running a batch of 'create jobs' in 'pipelined' execution mode, the
+    create parent process waits until the number of records in flight to the
+    write parent process is below the cap set in the user config, so that it
+    cannot run arbitrarily far ahead of the writers.
+
+    In 'adaptive' job sizing mode, all records of a domain object arrive as a
+    single 'create job', which is kept as outstanding work. Each batch is
+    then carved from the outstanding work of every domain object in turn,
+    using the job size the JobSizeTuner currently holds for each domain
+    object. The create parent process only blocks on the 'create_job_queue'
+    while there is no outstanding work, and passes on the end of domain object
+    message of a domain object once all of its outstanding work has been run.
+
+    Records persisted by the object factories for dependant domain objects
+    are sent by the child create processes to the dependency writer process
+    over the 'dependency_queue'. Before passing on the end of domain object
+    message of a domain object, the create parent process waits for the
+    dependency writer process to commit every record persisted for it, so
+    that domain objects depending on it can read them once it is complete.
+
+    Factories may yield the records of a job in chunks, see the
+    'create_chunks' method of Creatable, in which case the child create
+    processes stream every chunk of a job but the last over the
+    'streamed_record_queue' as soon as it is created. A thread of the create
+    parent process forwards these chunks onto the 'created_record_queue' as
+    they arrive, waiting for room under the cap on records in flight first,
+    so that a job creating more records than the cap holds its child process
+    back rather than filling memory. Before passing on the end of domain
+    object message of a domain object, the create parent process waits for
+    the thread to forward every chunk streamed before it.
+
+    In 'fused' execution mode, each child create process also writes the
+    records of its 'create job' to file, so nothing but the file builder
+    messages and the end of domain object messages are put on the
+    'generated_record_queue'.
 
     Attributes
     ----------
     create_job_queue : Multiprocess Queue
         Multiprocess safe queue from which jobs to create records are taken
     created_record_queue : Multiprocess Queue
-        Multiprocess safe queue into which lists of created records are placed
+        Multiprocess safe queue into which batches of created records are
+        placed
+    dependency_queue : Multiprocess SimpleQueue
+        Multiprocess safe queue over which persisted records and flush
+        messages are sent to the dependency writer process
+    dependency_flushed_queue : Multiprocess Queue
+        Multiprocess safe queue on which the dependency writer process
+        acknowledges flush messages
+    streamed_record_queue : Multiprocess SimpleQueue
+        Multiprocess safe queue over which the child create processes stream
+        chunks of records in 'pipelined' execution mode, None until the pool
+        is created
+    streamed_records_drained : threading Event
+        Set by the forwarding thread once it has forwarded every chunk
+        streamed before a drain message
+    execution_mode : String
+        'pipelined' or 'fused', see the Coordinator class
+    in_flight_limit : InFlightRecordLimit
+        Count of records in flight to the write parent process, which blocks
+        the create parent process while at its cap
+    job_size_tuner : JobSizeTuner
+        Tunes the size of the jobs of each domain object in 'adaptive' job
+        sizing mode, None in 'fixed' job sizing mode
+    outstanding_work : dict
+        Records of each domain object not yet carved into jobs in 'adaptive'
+        job sizing mode, as a create job covering them all, keyed by domain
+        object name
+    peak_resident_set_sizes : dict
+        Largest resident set size of the create parent and child processes
+        seen while creating each domain object, keyed by domain object name
+    object_factories : dict
+        Object factories of every domain object of the run, keyed by domain
+        object name, installed in each child create process
+    file_builders : dict
+        File builders of the domain objects currently being created, keyed by
+        domain object name, used to write files directly from the child
+        processes in 'fused' mode
     terminate_dequeued : Boolean
         Boolean flag which when True indicates the coordinator is to terminate
+    ended_domain_objects : list
+        Names of the domain objects whose create jobs have all been dequeued,
+        but whose end of domain object messages have not yet been passed on
 
     Methods
     -------
-    parent_process(object_factory)
-        Until the "terminate" flag is dequeued, cycle through a loop that waits
-        until the create job queue is not empty, then dequeues and runs a batch
-        of jobs, and puts a list of created records from that batch onto the
-        created record queue.
-    sleep_while_create_job_queue_empty()
-        Sleep whilst the create job queue is empty
+    parent_process(number_of_create_child_processes)
+        Until the "terminate" flag is dequeued, cycle through a loop that
+        blocks until the create job queue is not empty, then dequeues and runs
+        a batch of jobs, and puts the batches of created records of each domain
+        object from that batch onto the created record queue.
     get_dequeued_create_jobs(maximum_number_of_create_jobs_to_dequeue)
         Return a list containing a batch of jobs dequeued from the create job
         queue such that they can be run over a pool of child processes
+    get_adaptive_create_jobs(maximum_number_of_create_jobs)
+        Return a batch of jobs carved from the outstanding work of each
+        domain object, sized by the job size tuner
+    carve_create_job(domain_object)
+        Return the next job of a domain object's outstanding work
+    pass_on_ended_domain_objects()
+        Pass on the end of domain object messages of every ended domain object
+        without outstanding work
+    flush_dependencies(domain_object)
+        Wait for the records persisted for a domain object to be committed
+    forward_streamed_records()
+        Forward the chunks of records streamed by the child create processes
+        onto the created record queue, until terminated
+    drain_streamed_records()
+        Wait for every chunk of records streamed so far to be forwarded
     """
 
-    def __init__(self, create_job_queue, created_record_queue):
+    def __init__(self, create_job_queue, created_record_queue,
+                 dependency_queue, dependency_flushed_queue,
+                 object_factories, execution_mode, in_flight_limit,
+                 job_size_tuner=None):
         """ Assign variables from input, and set termination to False
 
         Parameters
@@ -61,59 +175,145 @@ class Creator:
             Queue containing jobs to create a certain quantity of domain
             objects
         created_record_queue : Multiprocessed Queue
-            Queue containing lists of records creating from running
+            Queue containing batches of records creating from running
             'create jobs'
+        dependency_queue : Multiprocessing SimpleQueue
+            Queue over which persisted records and flush messages are sent to
+            the dependency writer process
+        dependency_flushed_queue : Multiprocessing Queue
+            Queue on which the dependency writer process acknowledges flush
+            messages
+        object_factories : dict
+            Instantiated and pre-configured object factories of every domain
+            object of the run, keyed by domain object name
+        execution_mode : String
+            'pipelined' to pass created records on to the write parent
+            process, or 'fused' to write them from the child create processes
+        in_flight_limit : InFlightRecordLimit
+            Count of records in flight to the write parent process, shared
+            with the write parent process
+        job_size_tuner : JobSizeTuner
+            Tunes the size of the jobs of each domain object in 'adaptive'
+            job sizing mode, None in 'fixed' job sizing mode
         """
 
         self.create_job_queue = create_job_queue
         self.created_record_queue = created_record_queue
+        self.dependency_queue = dependency_queue
+        self.dependency_flushed_queue = dependency_flushed_queue
+        self.streamed_record_queue = None
+        self.streamed_records_drained = threading.Event()
+        self.execution_mode = execution_mode
+        self.in_flight_limit = in_flight_limit
+        self.job_size_tuner = job_size_tuner
+        self.outstanding_work = {}
+        self.peak_resident_set_sizes = {}
+        self.object_factories = object_factories
+        self.file_builders = {}
         self.terminate_dequeued = False
+        self.ended_domain_objects = []
 
-    def parent_process(self, object_factory):
+    def parent_process(self, number_of_create_child_processes):
         """ Begin the cycle of waiting for, formatting, and running jobs,
         continuing this until an instruction to terminate is observed.
 
         Parameters
         ----------
-        object_factory : Creatable
-            Instantiated and pre-configured object factory used to create
-            records from create jobs
+        number_of_create_child_processes : int
+            The number of processes sitting within the pool for execution of
+            create jobs
         """
 
-        number_of_create_child_processes =\
-            object_factory.get_shared_args()[
-                'number_of_create_child_processes'
-            ]
-
         # the maximum number of jobs to dequeue for processing is proportional
         # to the number of processes available to execute the jobs
 
         maximum_number_of_create_jobs_to_dequeue = \
             number_of_create_child_processes * 2
 
-        while not self.terminate_dequeued:
-            self.sleep_while_create_job_queue_empty()
-
-            dequeued_create_jobs = self.get_dequeued_create_jobs(
-                maximum_number_of_create_jobs_to_dequeue
+        # chunks of records are only streamed to be forwarded to the write
+        # parent process, as they are written by the child create processes
+        # themselves in 'fused' mode
+        if self.execution_mode != 'fused':
+            self.streamed_record_queue = SimpleQueue()
+            forwarding_thread = threading.Thread(
+                target=self.forward_streamed_records
             )
-
-            created_records_from_multiple_jobs = \
-                pool_tasks.run_create_jobs(
-                    dequeued_create_jobs,
-                    number_of_create_child_processes,
-                    object_factory
+            forwarding_thread.start()
+
+        create_pool = pool_tasks.create_create_pool(
+            number_of_create_child_processes,
+            self.object_factories,
+            self.dependency_queue,
+            self.streamed_record_queue
+        )
+
+        # should a batch of jobs fail, the pool is torn down and the other
+        # processes instructed to terminate before the exception is raised,
+        # so that they finish and release the dependency store rather than
+        # wait for jobs which will never come
+        try:
+            while not self.terminate_dequeued:
+                dequeued_create_jobs = self.get_dequeued_create_jobs(
+                    maximum_number_of_create_jobs_to_dequeue
                 )
 
-            self.created_record_queue.put(created_records_from_multiple_jobs)
-
-        self.created_record_queue.put("terminate")
-
-    def sleep_while_create_job_queue_empty(self):
-        """ Sleep until jobs are on the queue """
-
-        while self.create_job_queue.empty():
-            time.sleep(1)
+                if self.job_size_tuner is not None:
+                    for create_job in dequeued_create_jobs:
+                        self.outstanding_work[create_job['domain_object']] = \
+                            create_job
+
+                    dequeued_create_jobs = self.get_adaptive_create_jobs(
+                        maximum_number_of_create_jobs_to_dequeue
+                    )
+
+                if dequeued_create_jobs and self.execution_mode == 'fused':
+                    pool_tasks.run_fused_jobs(
+                        dequeued_create_jobs,
+                        create_pool,
+                        self.file_builders,
+                        self.peak_resident_set_sizes,
+                        self.job_size_tuner
+                    )
+                elif dequeued_create_jobs:
+                    self.in_flight_limit.wait_for_capacity()
+
+                    created_records_from_multiple_jobs = \
+                        pool_tasks.run_create_jobs(
+                            dequeued_create_jobs,
+                            create_pool,
+                            self.peak_resident_set_sizes,
+                            self.job_size_tuner
+                        )
+
+                    resident_set_size = get_resident_set_size()
+
+                    for domain_object, created_records in \
+                            created_records_from_multiple_jobs.items():
+                        pool_tasks.update_peak_resident_set_size(
+                            self.peak_resident_set_sizes,
+                            domain_object,
+                            resident_set_size
+                        )
+                        self.in_flight_limit.add_records(len(created_records))
+                        self.created_record_queue.put({
+                            'domain_object': domain_object,
+                            'records': created_records
+                        })
+
+                self.pass_on_ended_domain_objects()
+        except Exception:
+            create_pool.terminate()
+            raise
+        finally:
+            create_pool.close()
+            create_pool.join()
+
+            if self.streamed_record_queue is not None:
+                self.streamed_record_queue.put("terminate")
+                forwarding_thread.join()
+
+            self.dependency_queue.put("terminate")
+            self.created_record_queue.put("terminate")
 
     def get_dequeued_create_jobs(
             self, maximum_number_of_create_jobs_to_dequeue
@@ -121,19 +321,27 @@ class Creator:
         """ Dequeues 'create jobs' from the Multiprocess Safe Queue
         'create_job_queue' and places them into a list for later execution.
 
+        The first item is dequeued with a blocking get, so the create parent
+        process sleeps until work arrives and is woken immediately when it
+        does. Further items are only dequeued if already waiting on the queue.
+        Where there is outstanding work in 'adaptive' job sizing mode, no
+        item is waited for.
+
         If twice the number of create child processes are dequeued, then the
         list is returned - this is to ensure the pool of child processes will
         not run over an inefficiently large batch of 'create jobs'.
 
-        If the termination flag is observed, then this list is returned.
+        If the termination flag or an end of domain object message is
+        observed, then this list is returned.
+
+        If a message holding the file builder of a new domain object is
+        observed, the file builder is stored for the jobs of that domain
+        object and passed on to the write parent process.
 
         If the queue becomes empty, then the list so far is returned.
 
         Parameters
         ----------
-        object_factory : Creatable
-            Instantiated and pre-configured object factory which produces
-            the current object.
         maximum_number_of_create_jobs_to_dequeue : int
             the maximum number of jobs to dequeue for processing
 
@@ -146,15 +354,187 @@ class Creator:
         """
 
         dequeued_create_jobs = []
+        block = not self.outstanding_work
 
-        while not self.create_job_queue.empty() and len(dequeued_create_jobs) \
-                < maximum_number_of_create_jobs_to_dequeue:
+        while len(dequeued_create_jobs) < \
+                maximum_number_of_create_jobs_to_dequeue:
 
-            create_job = self.create_job_queue.get()
+            try:
+                create_job = self.create_job_queue.get(block=block)
+            except Empty:
+                break
+
+            block = False
 
             if create_job == "terminate":
                 self.terminate_dequeued = True
+                break
+            elif 'end_of_domain_object' in create_job:
+                self.ended_domain_objects.append(
+                    create_job['end_of_domain_object']
+                )
+                break
+            elif 'file_builder' in create_job:
+                domain_object = create_job['domain_object']
+                self.file_builders[domain_object] = create_job['file_builder']
+                self.created_record_queue.put({
+                    'domain_object': domain_object,
+                    'file_builder': create_job['file_builder']
+                })
             else:
                 dequeued_create_jobs.append(create_job)
 
         return dequeued_create_jobs
+
+    def get_adaptive_create_jobs(self, maximum_number_of_create_jobs):
+        """ Returns a batch of jobs carved from the outstanding work of each
+        domain object in turn, until the batch is full or there is no
+        outstanding work left.
+
+        Parameters
+        ----------
+        maximum_number_of_create_jobs : int
+            the maximum number of jobs in the batch
+
+        Returns
+        -------
+        List
+            Containing the create jobs of the batch
+        """
+
+        create_jobs = []
+
+        while self.outstanding_work and \
+                len(create_jobs) < maximum_number_of_create_jobs:
+            for domain_object in list(self.outstanding_work):
+                if len(create_jobs) == maximum_number_of_create_jobs:
+                    break
+                create_jobs.append(self.carve_create_job(domain_object))
+
+        return create_jobs
+
+    def carve_create_job(self, domain_object):
+        """ Returns the next job of a domain object's outstanding work, of the
+        size the job size tuner currently holds for the domain object. In
+        'fused' execution mode, the job size is rounded down to a whole
+        number of files, of at least one file.
+
+        Parameters
+        ----------
+        domain_object : String
+            Name of the domain object
+
+        Returns
+        -------
+        dict
+            The create job carved from the front of the outstanding work
+        """
+
+        outstanding_work = self.outstanding_work[domain_object]
+        job_size = self.job_size_tuner.get_job_size(domain_object)
+
+        if self.execution_mode == 'fused':
+            max_records_per_file = \
+                self.file_builders[domain_object].get_max_objects_per_file()
+            job_size = max(1, job_size // max_records_per_file) * \
+                max_records_per_file
+
+        quantity = min(job_size, outstanding_work['quantity'])
+
+        create_job = {
+            'domain_object': domain_object,
+            'quantity': quantity,
+            'start_id': outstanding_work['start_id']
+        }
+
+        if self.execution_mode == 'fused':
+            create_job['file_number'] = \
+                outstanding_work['start_id'] // max_records_per_file
+
+        outstanding_work['start_id'] += quantity
+        outstanding_work['quantity'] -= quantity
+
+        if outstanding_work['quantity'] == 0:
+            del self.outstanding_work[domain_object]
+
+        return create_job
+
+    def pass_on_ended_domain_objects(self):
+        """ Passes on the end of domain object message of every ended domain
+        object without outstanding work to the write parent process, along
+        with its peak resident set size, once the records persisted for it
+        have been committed, and forgets its file builder.
+        """
+
+        for domain_object in list(self.ended_domain_objects):
+            if domain_object in self.outstanding_work:
+                continue
+
+            self.flush_dependencies(domain_object)
+            self.drain_streamed_records()
+
+            self.created_record_queue.put({
+                'end_of_domain_object': domain_object,
+                'peak_resident_set_size':
+                    self.peak_resident_set_sizes.pop(domain_object, 0)
+            })
+            del self.file_builders[domain_object]
+            if self.job_size_tuner is not None:
+                self.job_size_tuner.remove_domain_object(domain_object)
+            self.ended_domain_objects.remove(domain_object)
+
+    def flush_dependencies(self, domain_object):
+        """ Sends a flush message for a domain object to the dependency writer
+        process, and blocks until it acknowledges that every record persisted
+        before it has been committed. Every create job of the domain object
+        has finished by the time this is called, so its records are all on
+        the dependency queue ahead of the flush message.
+
+        Parameters
+        ----------
+        domain_object : String
+            Name of the domain object whose create jobs have all run
+        """
+
+        self.dependency_queue.put({'flush': domain_object})
+        self.dependency_flushed_queue.get()
+
+    def forward_streamed_records(self):
+        """ Forwards each chunk of records streamed by the child create
+        processes onto the created record queue once there is room for it
+        under the cap on records in flight, run on a thread of the create
+        parent process until the "terminate" flag is dequeued. A drain
+        message, put on the streamed record queue by the create parent
+        process itself, is acknowledged by setting the drained event, as
+        every chunk streamed before it has then been forwarded.
+        """
+
+        while True:
+            streamed_records = self.streamed_record_queue.get()
+
+            if streamed_records == "terminate":
+                break
+            elif streamed_records == "drain":
+                self.streamed_records_drained.set()
+            else:
+                self.in_flight_limit.wait_for_capacity()
+                self.in_flight_limit.add_records(
+                    len(streamed_records['records'])
+                )
+                self.created_record_queue.put(streamed_records)
+
+    def drain_streamed_records(self):
+        """ Sends a drain message to the forwarding thread, and blocks until
+        it has forwarded every chunk of records streamed before it. Every
+        child create process puts its chunks on the streamed record queue
+        before returning the result of its job, so once the jobs of a domain
+        object have all finished its chunks are ahead of the drain message,
+        and are forwarded ahead of its end of domain object message.
+        """
+
+        if self.streamed_record_queue is None:
+            return
+
+        self.streamed_records_drained.clear()
+        self.streamed_record_queue.put("drain")
+        self.streamed_records_drained.wait()
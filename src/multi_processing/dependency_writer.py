@@ -0,0 +1,205 @@
+""" Single writer of the records persisted to the dependency store.
+
+Factories of domain objects which others depend on, such as instruments and
+accounts, persist part of each record they create to the dependency
+store. Were every child create process to write to the SQLite store itself,
+they would contend for SQLite's single write lock, while the shared memory
+store can only be written by a single process. Instead, each child create
+process is given the 'dependency_queue' by the pool initializer, and sends
+the value lists it persists over it to the dependency writer process, which
+is the only process to write to the store during a run.
+
+Dependant domain objects may only read the records of a domain object once they
+have been committed, and the dependency writer process only commits them then,
+so that every record of a domain object is committed together. Once every
+create job of a domain object has run, the create parent process puts a flush
+message on the 'dependency_queue' and waits for the dependency writer process
+to acknowledge it on the 'dependency_flushed_queue'. As the child create
+processes put their records on the queue before their jobs finish, and the
+'dependency_queue' is a SimpleQueue whose puts are written to its pipe before
+returning, the flush message always follows every record of the domain object
+on the queue.
+
+The records of the SNAPSHOT_TABLES, instruments and accounts, are also
+published to shared memory where the store is not held there already, from
+where each child create process reads them in place as a TableSnapshot.
+Records already in the store when the run starts, kept from an earlier run
+by --reuse_dependencies, are published before any others. Where shared
+memory is unavailable, before Python 3.8, nothing is published, and the child
+create processes read the snapshot tables from the store instead.
+
+Alongside the last records of each domain object, the fingerprint of the
+config they were created from is recorded, committed with them, so that a
+later run may reuse them, see the dependency_fingerprints module.
+"""
+
+from database.dependency_store import SNAPSHOT_TABLES
+from database.dependency_stores import open_dependency_store, \
+    is_shared_memory_available
+from database.shared_memory_store import SharedMemoryStore
+
+# number of records of a snapshot table read at once from the dependency
+# store, when publishing the records it held at the start of the run
+SNAPSHOT_BATCH_SIZE = 50000
+
+
+class DependencyWriter:
+    """ Writes the records sent over the dependency queue to the dependency
+    store, committing them once flushed.
+
+    Attributes
+    ----------
+    dependency_queue : Multiprocessing SimpleQueue
+        Holds the value lists persisted by the child create processes, flush
+        messages from the create parent process, and the "terminate" flag
+    dependency_flushed_queue : Multiprocessing Queue
+        Receives the name of each domain object whose records have all been
+        committed, in reply to its flush message
+    shared_args : dict
+        All multiprocessing arguments and their user-assigned values, which
+        choose the dependency store
+    dependency_fingerprints : dict
+        Fingerprint of each domain object persisting records, recorded when
+        it is flushed
+    snapshot_store : SharedMemoryStore
+        Store publishing the records of the snapshot tables to shared memory,
+        None where the dependency store publishes them itself
+    terminate_dequeued : Boolean
+        Boolean flag which when True indicates the writer is to terminate
+
+    Methods
+    -------
+    parent_process()
+        Until the "terminate" flag is dequeued, insert the records sent over
+        the dependency queue, and commit them on flush messages before
+        acknowledging them
+    handle_dequeued_item(dequeued_item, database)
+        Insert the records of a single item from the dependency queue, or
+        acknowledge it once committed where it is a flush message
+    publish_existing_snapshot_records(database)
+        Publish the records the snapshot tables held at the start of the run
+    """
+
+    def __init__(self, dependency_queue, dependency_flushed_queue,
+                 shared_args, dependency_fingerprints=None):
+        """ Assign variables from input, and set termination to False
+
+        Parameters
+        ----------
+        dependency_queue : Multiprocessing SimpleQueue
+            Queue on which records to persist and flush messages are sent
+        dependency_flushed_queue : Multiprocessing Queue
+            Queue on which flushed domain objects are acknowledged
+        shared_args : dict
+            All multiprocessing arguments and their user-assigned values
+        dependency_fingerprints : dict, optional
+            Fingerprint of each domain object persisting records, keyed by
+            domain object name
+        """
+
+        self.dependency_queue = dependency_queue
+        self.dependency_flushed_queue = dependency_flushed_queue
+        self.shared_args = shared_args
+        self.dependency_fingerprints = dependency_fingerprints or {}
+        self.snapshot_store = None
+        self.terminate_dequeued = False
+
+    def parent_process(self):
+        """ Until an instruction to terminate is observed, block until an
+        item is sent over the dependency queue, then handle it and every
+        further item already waiting. Where any was a flush message, commit
+        every record inserted so far, then acknowledge the flush. """
+
+        database = open_dependency_store(self.shared_args)
+        if is_shared_memory_available() and \
+                not isinstance(database, SharedMemoryStore):
+            self.snapshot_store = SharedMemoryStore()
+            self.publish_existing_snapshot_records(database)
+
+        while not self.terminate_dequeued:
+            flushed_domain_objects = self.handle_dequeued_item(
+                self.dependency_queue.get(), database
+            )
+
+            while not self.terminate_dequeued and \
+                    not self.dependency_queue.empty():
+                flushed_domain_objects += self.handle_dequeued_item(
+                    self.dependency_queue.get(), database
+                )
+
+            # records need only be readable by other processes once the
+            # domain object persisting them has been flushed
+            if flushed_domain_objects or self.terminate_dequeued:
+                database.commit_changes()
+                if self.snapshot_store is not None:
+                    self.snapshot_store.commit_changes()
+
+            for domain_object in flushed_domain_objects:
+                self.dependency_flushed_queue.put(domain_object)
+
+        database.close_connection()
+        if self.snapshot_store is not None:
+            self.snapshot_store.close_connection()
+
+    def handle_dequeued_item(self, dequeued_item, database):
+        """ Acts on a single item taken from the dependency queue. Records
+        are inserted without being committed, flush messages are returned to
+        be acknowledged once committed, and the terminate flag is recorded.
+
+        Parameters
+        ----------
+        dequeued_item : dict or String
+            Item taken from the dependency queue
+        database : DependencyStore
+            The dependency store
+
+        Returns
+        -------
+        List
+            Name of the domain object to acknowledge once committed, where the
+            item is a flush message, otherwise empty
+        """
+
+        if dequeued_item == "terminate":
+            self.terminate_dequeued = True
+            return []
+
+        if 'flush' in dequeued_item:
+            domain_object = dequeued_item['flush']
+            if domain_object in self.dependency_fingerprints:
+                database.record_fingerprint(
+                    domain_object, self.dependency_fingerprints[domain_object]
+                )
+            return [domain_object]
+
+        table_name = dequeued_item['table_name']
+        database.persist_batch(table_name, dequeued_item['value_lists'])
+        if self.snapshot_store is not None and table_name in SNAPSHOT_TABLES:
+            self.snapshot_store.persist_batch(
+                table_name, dequeued_item['value_lists']
+            )
+        return []
+
+    def publish_existing_snapshot_records(self, database):
+        """ Publishes the records held by the snapshot tables of the
+        dependency store at the start of the run, which are only there where
+        kept from an earlier run, reading them in batches.
+
+        Parameters
+        ----------
+        database : DependencyStore
+            The dependency store
+        """
+
+        for table_name in SNAPSHOT_TABLES:
+            table_size = database.get_table_size(table_name) or 0
+
+            for offset in range(0, table_size, SNAPSHOT_BATCH_SIZE):
+                rows = database.retrieve_batch(
+                    table_name, SNAPSHOT_BATCH_SIZE, offset
+                )
+                self.snapshot_store.persist_batch(
+                    table_name, [list(row) for row in rows]
+                )
+
+        self.snapshot_store.commit_changes()
@@ -0,0 +1,101 @@
+""" Backpressure between the create and write parent processes.
+
+Records are in flight from the moment the create parent process puts them on
+the created record queue until the write parent process dequeues them.
+Without a bound, the create side can run arbitrarily far ahead of slow
+writers, growing the created record queue without limit. The write parent
+process only dequeues records while its window of running write jobs has
+room, so slow writers still hold back the create parent process.
+
+The optional 'max_records_in_flight' key in the 'shared_args' section of the
+user config caps the number of records in flight. Once the cap is reached,
+the create parent process blocks before running its next batch of create
+jobs until the writers have caught up. As a whole batch is run once there is
+capacity, up to one batch of create jobs worth of records more than the cap
+may be in flight.
+
+Records held back by the write parent process because they do not yet fill a
+whole file are not counted as in flight. There are fewer of these than the
+maximum number of records per file for each domain object being written.
+"""
+
+from multiprocessing import Condition, Value
+
+
+class InFlightRecordLimit:
+    """ Counts the records in flight between the create and write parent
+    processes, blocking the create parent process while the count is at or
+    above the user-configured cap.
+
+    Attributes
+    ----------
+    max_records_in_flight : int
+        Cap on the number of records in flight, None where unbounded
+    records_in_flight : Multiprocessing Value
+        Number of records currently in flight, shared between processes
+    condition : Multiprocessing Condition
+        Condition notified whenever records stop being in flight
+
+    Methods
+    -------
+    wait_for_capacity()
+        Block until the number of records in flight is below the cap
+    add_records(number_of_records)
+        Count records put on the created record queue as in flight
+    remove_records(number_of_records)
+        Stop counting records dequeued by the write parent process as in
+        flight
+    """
+
+    def __init__(self, max_records_in_flight=None):
+        """ Create the shared count of records in flight.
+
+        Parameters
+        ----------
+        max_records_in_flight : int
+            Cap on the number of records in flight, None where unbounded
+        """
+
+        self.__max_records_in_flight = max_records_in_flight
+        self.__records_in_flight = Value('q', 0, lock=False)
+        self.__condition = Condition()
+
+    def wait_for_capacity(self):
+        """ Block until the number of records in flight is below the cap.
+        Returns immediately where there is no cap. """
+
+        if self.__max_records_in_flight is None:
+            return
+
+        with self.__condition:
+            self.__condition.wait_for(
+                lambda: self.__records_in_flight.value <
+                self.__max_records_in_flight
+            )
+
+    def add_records(self, number_of_records):
+        """ Count records put on the created record queue as in flight.
+
+        Parameters
+        ----------
+        number_of_records : int
+            Number of records put on the created record queue
+        """
+
+        with self.__condition:
+            self.__records_in_flight.value += number_of_records
+
+    def remove_records(self, number_of_records):
+        """ Stop counting records dequeued by the write parent process as in
+        flight, and wake the create parent process if it is waiting for
+        capacity.
+
+        Parameters
+        ----------
+        number_of_records : int
+            Number of records dequeued by the write parent process
+        """
+
+        with self.__condition:
+            self.__records_in_flight.value -= number_of_records
+            self.__condition.notify_all()
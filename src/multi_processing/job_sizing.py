@@ -0,0 +1,184 @@
+""" Sizing of 'create jobs'.
+
+Two job sizing modes are supported, selected by the optional 'job_sizing' key
+in the 'shared_args' section of the user config:
+
+    * 'fixed' (default) - the Coordinator slices every domain object into
+      jobs of 'number_of_records_per_job' records.
+    * 'adaptive' - the Coordinator queues all records of a domain object as a
+      single piece of work, which the create parent process carves into jobs
+      as it runs them. Each domain object starts with jobs of
+      'number_of_records_per_job' records, and the size of its jobs is then
+      grown or shrunk towards the optional 'target_job_duration' (in seconds)
+      from the measured duration of its finished jobs. Jobs are also kept
+      small enough that the records they return to the create parent process
+      stay under MAX_JOB_PAYLOAD_BYTES once pickled.
+
+Adaptive job sizes are independent of the maximum number of records per file
+of each domain object, except in 'fused' execution mode where each job must
+still cover a whole number of files.
+"""
+
+JOB_SIZINGS = ['fixed', 'adaptive']
+DEFAULT_JOB_SIZING = 'fixed'
+DEFAULT_TARGET_JOB_DURATION = 0.5
+MAX_JOB_PAYLOAD_BYTES = 16 * 1024 * 1024
+
+# jobs may at most double or halve in size after each finished job, to keep
+# a single unusually fast or slow job from swinging the size too far
+MAX_JOB_SIZE_GROWTH = 2.0
+MAX_JOB_SIZE_SHRINK = 0.5
+
+# weight given to the most recent job when smoothing the measured time and
+# payload per record
+SMOOTHING_WEIGHT = 0.5
+
+
+class JobSizeTuner:
+    """ Tracks the size of the 'create jobs' of each domain object in
+    'adaptive' job sizing mode, adjusting it after every finished job.
+
+    Attributes
+    ----------
+    initial_job_size : int
+        Number of records in the first jobs of each domain object
+    target_job_duration : float
+        Duration in seconds each job should ideally take to run
+    job_sizes : dict
+        Current number of records per job, keyed by domain object name
+    seconds_per_record : dict
+        Smoothed measured time to create one record, keyed by domain object
+        name
+    bytes_per_record : dict
+        Smoothed measured pickled size of one record, keyed by domain object
+        name
+
+    Methods
+    -------
+    get_job_size(domain_object)
+        Return the number of records the next job of a domain object is to
+        create
+    record_job(domain_object, quantity, duration, payload_size)
+        Update the job size of a domain object from a finished job
+    remove_domain_object(domain_object)
+        Forget the measurements of a domain object once it is complete
+    """
+
+    def __init__(self, initial_job_size,
+                 target_job_duration=DEFAULT_TARGET_JOB_DURATION):
+        """ Set the starting job size and target job duration.
+
+        Parameters
+        ----------
+        initial_job_size : int
+            Number of records in the first jobs of each domain object
+        target_job_duration : float
+            Duration in seconds each job should ideally take to run
+        """
+
+        self.__initial_job_size = initial_job_size
+        self.__target_job_duration = target_job_duration
+        self.__job_sizes = {}
+        self.__seconds_per_record = {}
+        self.__bytes_per_record = {}
+
+    def get_job_size(self, domain_object):
+        """ Returns the number of records the next job of a domain object is
+        to create.
+
+        Parameters
+        ----------
+        domain_object : String
+            Name of the domain object
+
+        Returns
+        -------
+        int
+            Number of records in the next job of the domain object
+        """
+
+        return self.__job_sizes.get(domain_object, self.__initial_job_size)
+
+    def record_job(self, domain_object, quantity, duration, payload_size):
+        """ Update the job size of a domain object from the measurements of
+        one of its finished jobs.
+
+        Parameters
+        ----------
+        domain_object : String
+            Name of the domain object the job belonged to
+        quantity : int
+            Number of records the job created
+        duration : float
+            Time in seconds the job took to create its records
+        payload_size : int
+            Pickled size in bytes of the records returned by the job
+        """
+
+        if quantity <= 0:
+            return
+
+        self.__seconds_per_record[domain_object] = self.__smooth(
+            self.__seconds_per_record.get(domain_object),
+            duration / quantity
+        )
+        self.__bytes_per_record[domain_object] = self.__smooth(
+            self.__bytes_per_record.get(domain_object),
+            payload_size / quantity
+        )
+
+        job_size = quantity
+
+        if self.__seconds_per_record[domain_object] > 0:
+            job_size = self.__target_job_duration / \
+                self.__seconds_per_record[domain_object]
+
+        if self.__bytes_per_record[domain_object] > 0:
+            job_size = min(
+                job_size,
+                MAX_JOB_PAYLOAD_BYTES / self.__bytes_per_record[domain_object]
+            )
+
+        # limits are relative to the measured job rather than the current job
+        # size, so that the jobs of a batch, which all ran at the same size,
+        # cannot compound each other's growth or shrinkage
+        job_size = min(job_size, quantity * MAX_JOB_SIZE_GROWTH)
+        job_size = max(job_size, quantity * MAX_JOB_SIZE_SHRINK)
+
+        self.__job_sizes[domain_object] = max(1, int(job_size))
+
+    def remove_domain_object(self, domain_object):
+        """ Forget the job size and measurements of a domain object once all
+        of its jobs have been run.
+
+        Parameters
+        ----------
+        domain_object : String
+            Name of the domain object
+        """
+
+        self.__job_sizes.pop(domain_object, None)
+        self.__seconds_per_record.pop(domain_object, None)
+        self.__bytes_per_record.pop(domain_object, None)
+
+    @staticmethod
+    def __smooth(previous_value, measured_value):
+        """ Returns the exponentially smoothed value of a measurement.
+
+        Parameters
+        ----------
+        previous_value : float
+            Smoothed value so far, None where this is the first measurement
+        measured_value : float
+            Newly measured value
+
+        Returns
+        -------
+        float
+            The new smoothed value
+        """
+
+        if previous_value is None:
+            return measured_value
+        return SMOOTHING_WEIGHT * measured_value + \
+            (1 - SMOOTHING_WEIGHT) * previous_value
@@ -0,0 +1,55 @@
+""" Measurement of the memory used by the processes of a generation run.
+
+The resident set size of a process is read from /proc where available. On
+platforms without /proc the peak resident set size of the process so far is
+used instead, as reported by the resource module, and where neither is
+available the resident set size is reported as zero.
+"""
+
+import os
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+def get_resident_set_size():
+    """ Returns the resident set size of the calling process.
+
+    Returns
+    -------
+    int
+        Resident set size of the calling process in bytes
+    """
+
+    try:
+        with open('/proc/self/statm') as statm:
+            resident_pages = int(statm.read().split()[1])
+        return resident_pages * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+
+    if resource is not None:
+        # ru_maxrss is given in kilobytes on Linux and bytes on macOS, the
+        # only platform expected to reach this point
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    return 0
+
+
+def format_bytes(number_of_bytes):
+    """ Returns a number of bytes as a human readable string in megabytes.
+
+    Parameters
+    ----------
+    number_of_bytes : int
+        Number of bytes to format
+
+    Returns
+    -------
+    String
+        The number of bytes in megabytes, to one decimal place
+    """
+
+    return f'{number_of_bytes / (1024 * 1024):.1f} MB'
@@ -7,149 +7,575 @@ method of this module to run them over a pool of child processes.
 The write parent process similarly executes the 'parent_process' method of the
 Writer class, which waits until the parent process of the Creator class has run
 'create jobs' to produce records, then dequeues these created records and
-assigns them to 'write jobs' which are stored in a list.
+assigns them to 'write jobs'.
 
 'Write jobs' are run by being passed to file builder objects to be written to
-file, and are run in batches over a pool of write child processes.
+file. Each is submitted to a pool of write child processes as soon as it is
+created, using 'submit_write_job', and reports its completion to the write
+parent process through a callback.
+
+Both pools of child processes are created once, when their parent process
+starts, and are kept alive for the whole generation run rather than being
+rebuilt for every batch of jobs.
+
+The object factory of every domain object of the run is installed in each
+child create process once, by the pool initializer, along with a cache of
+the reference tables read from the dependency database, and the queue over
+which records persisted by the factories are sent to the dependency writer
+process. 'Create jobs' then
+name the domain object they belong to rather than carrying its factory, so
+factories are not pickled for every job, and whatever a factory or the cache
+loads in a child process, such as the instruments table, is kept for every
+later job the process runs.
+
+In 'fused' execution mode, the create parent process instead calls
+'run_fused_jobs', whose child processes create the records of a 'create job'
+and write them to file themselves, so that records never leave the child
+process which created them.
+
+Each job run over either pool also reports the resident set size of the
+child process which ran it, once the job's records have been created or
+written. The largest of these is kept for each domain object, so that the
+peak memory use of each domain object can be reported at the end of the run.
+Create jobs additionally report how long they took to create their records,
+and the estimated pickled size of the records they return, from which the
+sizes of later jobs are tuned in 'adaptive' job sizing mode.
+
+The records of every create job are returned, and passed on to the write
+child processes, as a RecordBatch, whichever form their factory creates them
+in, so that the attribute names of the records are pickled once per batch.
+
+Factories may yield the records of a job in several chunks, see the
+'create_chunks' method of Creatable. In 'pipelined' execution mode, every
+chunk of a job but the last is streamed to the create parent process as soon
+as it is created, over a queue installed by the pool initializer, and the
+last chunk is returned as the job's result. In 'fused' execution mode, each
+file is written as soon as enough chunks have been created to fill it.
 """
 
-from multiprocessing import Pool, Lock
+import pickle
+import sys
+import time
+import traceback
+from multiprocessing import Pool
+
+import numpy as np
+
+from database.reference_table_cache import ReferenceTableCache
+from domainobjectfactories.creatable import Creatable
+from multi_processing.memory_usage import get_resident_set_size
+from multi_processing.record_batch import RecordBatch, as_record_batch
 
+# set by the pool initializer in child create processes which stream chunks
+# of records to the create parent process, see make_global
+resident_streamed_record_queue = None
 
-def run_create_jobs(
-        dequeued_create_jobs, number_of_create_child_processes, object_factory
-):
-    """ Instantiates a Pool with a number of processes as given in the user
-    config by the 'number_of_create_child_processes' line, and begins execution
-    of the provided batch of 'create jobs' on the pool.
+
+def create_create_pool(number_of_create_child_processes, object_factories,
+                       dependency_queue, streamed_record_queue=None):
+    """ Instantiates the Pool used to run 'create jobs', with a number of
+    processes as given in the user config by the
+    'number_of_create_child_processes' line. The pool is created once by the
+    create parent process and reused for every batch of every domain object.
 
     Parameters
     ----------
-    dequeued_create_jobs : list
-        List of create jobs taken from the create job queue
     number_of_create_child_processes : int
         The number of processes sitting within the pool for execution of jobs
         to be ran on.
-    object_factory : Creatable
-        Instantiated subclass of Creatable to be used to create records using
-        its create method
+    object_factories : dict
+        Instantiated subclasses of Creatable for every domain object of the
+        run, keyed by domain object name, installed in each child process
+    dependency_queue : Multiprocessing SimpleQueue
+        Queue over which records persisted by the object factories are sent
+        to the dependency writer process
+    streamed_record_queue : Multiprocessing SimpleQueue
+        Queue over which chunks of records are streamed to the create parent
+        process before their job has finished, None where they are not
+        streamed
 
     Returns
     -------
-    List
-        List of created records collated from the results of each 'create job'.
+    Pool
+        Pool of child create processes, each holding the object factories, a
+        reference table cache and the dependency and streamed record queues
     """
 
-    # multiprocessing lock used to define critical section in the
-    # InstrumentFactory class
-    local_lock = Lock()
-    create_pool = Pool(
+    return Pool(
         processes=number_of_create_child_processes,
         initializer=make_global,
-        initargs=(local_lock,)
+        initargs=(object_factories, dependency_queue, streamed_record_queue)
     )
 
-    # use a list comprehension to collect the result of each child processes
-    # the apply_async method is used in such that multiple arguments can
-    # be passed to the 'create_records_from_create_job' function, which is not
-    # possible using the Pool.map method
-    nested_list_of_created_records = [
-        async_result_object.get() for async_result_object in [
-            create_pool.apply_async(
-                create_records_from_create_job, args=(
-                    create_job, object_factory
-                )
-            ) for create_job in dequeued_create_jobs
-        ]
-    ]
 
-    # use a list comprehension to flatten the list of lists created above
-    created_records_from_multiple_jobs = [
-        created_record
-        for list_of_created_records in nested_list_of_created_records
-        for created_record in list_of_created_records
+def run_create_jobs(dequeued_create_jobs, create_pool,
+                    peak_resident_set_sizes, job_size_tuner=None):
+    """ Begins execution of the provided batch of 'create jobs' on the
+    long-lived pool of child create processes, and waits for their results.
+
+    Parameters
+    ----------
+    dequeued_create_jobs : list
+        List of create jobs taken from the create job queue
+    create_pool : Pool
+        The pool of child create processes, as made by 'create_create_pool'
+    peak_resident_set_sizes : dict
+        Largest resident set size seen so far for each domain object, updated
+        with those of the child processes running this batch
+    job_size_tuner : JobSizeTuner
+        Tuner updated with the measurements of each job in 'adaptive' job
+        sizing mode, None otherwise
+
+    Returns
+    -------
+    dict
+        Batches of created records collated from the results of each 'create
+        job', keyed by the name of their domain object
+    """
+
+    # only the job itself is sent to the child process, which creates its
+    # records with the object factory installed by the pool initializer
+    async_result_objects = [
+        create_pool.apply_async(
+            create_and_measure_records_from_create_job, args=(create_job,)
+        ) for create_job in dequeued_create_jobs
     ]
 
-    create_pool.close()
-    create_pool.join()
+    # collate the results of each job onto the list of its domain object
+    created_records_from_multiple_jobs = {}
+    for create_job, async_result_object in zip(dequeued_create_jobs,
+                                               async_result_objects):
+        created_records, job_measurement = async_result_object.get()
+
+        created_records_from_multiple_jobs.setdefault(
+            create_job['domain_object'], RecordBatch()
+        ).extend(created_records)
+        record_job_measurement(
+            create_job, job_measurement, peak_resident_set_sizes,
+            job_size_tuner
+        )
 
     return created_records_from_multiple_jobs
 
 
-def make_global(local_lock):
-    """ helper function used in run_create_jobs that assigns the local_lock
-    parameter to a global lock variable. This is required since a
-    multiprocessing Lock object cannot otherwise be passed to a Pool method
-    since it is not pickleable (required due to implementation of Pool in the
-    multiprocessing module).
+def record_job_measurement(job, job_measurement, peak_resident_set_sizes,
+                           job_size_tuner=None):
+    """ Records the measurements reported by a finished job against its
+    domain object.
+
+    Parameters
+    ----------
+    job : dict
+        The finished create or write job, holding the name of its domain
+        object
+    job_measurement : dict
+        Measurements reported by the job. Always holds the resident set size
+        of the child process which ran it, and for create jobs also holds the
+        duration and payload size of the job.
+    peak_resident_set_sizes : dict
+        Largest resident set size seen so far for each domain object
+    job_size_tuner : JobSizeTuner
+        Tuner updated with the duration and payload size of create jobs in
+        'adaptive' job sizing mode, None otherwise
+    """
+
+    update_peak_resident_set_size(
+        peak_resident_set_sizes,
+        job['domain_object'],
+        job_measurement['resident_set_size']
+    )
+
+    if job_size_tuner is not None:
+        job_size_tuner.record_job(
+            job['domain_object'],
+            job['quantity'],
+            job_measurement['duration'],
+            job_measurement['payload_size']
+        )
+
+
+def log_failed_job(description, exception):
+    """ Prints the exception raised by a failed create or write job to
+    standard error, along with the traceback of the child process which ran
+    it, which the pool attaches to the exception.
+
+    Parameters
+    ----------
+    description : String
+        Describes the job which failed, naming its domain object
+    exception : Exception
+        The exception raised by the job
+    """
+
+    print(f"{description} failed:", file=sys.stderr)
+    traceback.print_exception(
+        type(exception), exception, exception.__traceback__
+    )
+
+
+def update_peak_resident_set_size(peak_resident_set_sizes, domain_object,
+                                  resident_set_size):
+    """ Keeps the larger of a domain object's peak resident set size so far,
+    and a newly measured resident set size.
+
+    Parameters
+    ----------
+    peak_resident_set_sizes : dict
+        Largest resident set size seen so far for each domain object
+    domain_object : String
+        Name of the domain object the measurement was taken for
+    resident_set_size : int
+        Newly measured resident set size in bytes
+    """
+
+    peak_resident_set_sizes[domain_object] = max(
+        peak_resident_set_sizes.get(domain_object, 0), resident_set_size
+    )
+
+
+def make_global(object_factories, dependency_queue,
+                streamed_record_queue=None):
+    """ helper function used in create_create_pool that assigns the object
+    factories of the run to a global variable, so that they stay resident in
+    the child process for every job it runs. A reference table cache is
+    installed for every factory in the process to share, along with a NumPy
+    random generator seeded afresh in each process, and the dependency and
+    streamed record queues, which like a multiprocessing Lock cannot
+    otherwise be passed to a Pool method since they are not pickleable
+    (required due to implementation of Pool in the multiprocessing module).
 
     For more information see this SO thread (with line break for PEP8):
     https://stackoverflow.com/
     questions/25557686/python-sharing-a-lock-between-processes
     """
-    global lock
-    lock = local_lock
+    global resident_object_factories, resident_streamed_record_queue
+    resident_object_factories = object_factories
+    resident_streamed_record_queue = streamed_record_queue
+    Creatable.reference_table_cache = ReferenceTableCache()
+    Creatable.dependency_queue = dependency_queue
+    Creatable.random_generator = np.random.default_rng()
+
+
+def create_record_chunks_from_create_job(create_job):
+    """ Yields the chunks of records created as specified by a single
+    'create job' using the object factory of its domain object resident in
+    the child process, each as a batch. Chunks created as lists of
+    dictionaries are gathered into batches. The factory's job clock is
+    started first, so that the records of the job are dated from a single
+    reading of the current time.
+
+    Parameters
+    ----------
+    create_job : dict
+        dictionary specifying the domain object, a quantity of records to
+        create and the ID to start from (for domain objects with sequential
+        unique IDs)
+
+    Yields
+    ------
+    RecordBatch
+        Batch containing a chunk of the records created for this job
+    """
 
+    quantity, start_id = create_job['quantity'], create_job['start_id']
+    object_factory = resident_object_factories[create_job['domain_object']]
+    object_factory.start_job_clock()
 
-def create_records_from_create_job(create_job, object_factory):
-    """ Returns a list of records created as specified by a single 'create job'
+    for chunk in object_factory.create_chunks(quantity, start_id):
+        yield as_record_batch(chunk)
+
+
+def create_records_from_create_job(create_job):
+    """ Returns a batch of records created as specified by a single 'create
+    job'. Where the factory yields the records in several chunks and the
+    process has a streamed record queue, every chunk but the last is put on
+    the queue as soon as the next has been created, and only the last chunk
+    is returned. Otherwise the chunks are collated into a single batch.
 
     Parameters
     ----------
     create_job : dict
-        dictionary specifying a quantity of records to create and the ID to
-        start from (for domain objects with sequential unique IDs)
-    object_factory : Creatable
-        Instantiated and pre-configured object factory used to create
-        records from create jobs
+        dictionary specifying the domain object, a quantity of records to
+        create and the ID to start from (for domain objects with sequential
+        unique IDs)
 
     Returns
     -------
-    list
-        List containing all the records created for this job
+    RecordBatch
+        Batch containing the records created for this job not streamed to
+        the create parent process
     """
 
-    quantity, start_id = create_job['quantity'], create_job['start_id']
+    created_records = None
 
-    # The InstrumentFactory is the only factory which has a critical section
-    # and therefore requires a lock
-    if object_factory.__class__.__name__ == "InstrumentFactory":
-        created_records = object_factory.create(quantity, start_id, lock=lock)
-    else:
-        created_records = object_factory.create(quantity, start_id)
+    for chunk in create_record_chunks_from_create_job(create_job):
+        if created_records is None:
+            created_records = chunk
+        elif resident_streamed_record_queue is None:
+            created_records.extend(chunk)
+        else:
+            resident_streamed_record_queue.put({
+                'domain_object': create_job['domain_object'],
+                'records': created_records
+            })
+            created_records = chunk
 
     return created_records
 
 
-def run_write_jobs(write_jobs, number_of_write_child_processes, file_builder):
-    """ Instantiates a Pool with a number of processes as given in the user
-    config by the 'number_of_write_child_processes' line, and begins execution
-    of the provided batch of 'write jobs' on the pool.
+def create_and_measure_records_from_create_job(create_job):
+    """ Returns the records created as specified by a single 'create job',
+    along with measurements of the job.
+
+    The payload size of the job is estimated from the pickled size of its
+    first record, see estimate_payload_size, as pickling every record a
+    second time to measure them would be almost as costly as returning them.
+
+    Parameters
+    ----------
+    create_job : dict
+        dictionary specifying the domain object, a quantity of records to
+        create and the ID to start from (for domain objects with sequential
+        unique IDs)
+
+    Returns
+    -------
+    tuple
+        Batch containing all the records created for this job, and a
+        dictionary holding the resident set size of the child process and the
+        payload size of the records in bytes, and the duration of the job in
+        seconds
+    """
+
+    start_time = time.perf_counter()
+    created_records = create_records_from_create_job(create_job)
+    duration = time.perf_counter() - start_time
+
+    return created_records, {
+        'resident_set_size': get_resident_set_size(),
+        'duration': duration,
+        'payload_size': estimate_payload_size(created_records)
+    }
+
+
+def estimate_payload_size(record_batch):
+    """ Returns the estimated pickled size of a batch of records, being
+    the pickled size of its schema, and of the values of its first record
+    for every record.
+
+    Parameters
+    ----------
+    record_batch : RecordBatch
+        The batch of records
+
+    Returns
+    -------
+    int
+        Estimated pickled size of the batch in bytes
+    """
+
+    if not len(record_batch):
+        return 0
+
+    schema_size = len(pickle.dumps(record_batch.schema))
+    first_record_size = len(pickle.dumps(record_batch[:1])) - schema_size
+    return schema_size + first_record_size * len(record_batch)
+
+
+def run_fused_jobs(dequeued_create_jobs, create_pool, file_builders,
+                   peak_resident_set_sizes, job_size_tuner=None):
+    """ Begins execution of the provided batch of fused 'create jobs' on the
+    long-lived pool of child create processes, and waits for every job in the
+    batch to finish writing its files. Should any job fail, the exception of
+    the first failed job is raised once every job has finished.
+
+    Parameters
+    ----------
+    dequeued_create_jobs : list
+        List of create jobs taken from the create job queue, each holding the
+        number of the first file it is to write
+    create_pool : Pool
+        The pool of child create processes, as made by 'create_create_pool'
+    file_builders : dict
+        Instantiated subclasses of FileBuilder, keyed by the name of their
+        domain object, used to write created records to file
+    peak_resident_set_sizes : dict
+        Largest resident set size seen so far for each domain object, updated
+        with those of the child processes running this batch
+    job_size_tuner : JobSizeTuner
+        Tuner updated with the measurements of each job in 'adaptive' job
+        sizing mode, None otherwise
+    """
+
+    async_result_objects = [
+        create_pool.apply_async(
+            create_and_write_records_from_create_job, args=(
+                create_job,
+                file_builders[create_job['domain_object']]
+            )
+        ) for create_job in dequeued_create_jobs
+    ]
+
+    wait_and_measure_jobs(
+        dequeued_create_jobs, async_result_objects, peak_resident_set_sizes,
+        job_size_tuner
+    )
+
+
+def wait_and_measure_jobs(jobs, async_result_objects,
+                          peak_resident_set_sizes, job_size_tuner=None):
+    """ Waits for every job of a batch run over a pool to finish, and records
+    the measurements reported by its successful jobs. The exception of every
+    failed job is printed, and that of the first failed job raised once every
+    job has finished, so that the other jobs of the batch finish writing
+    their files first.
+
+    Parameters
+    ----------
+    jobs : list
+        The jobs of the batch, each holding the name of its domain object
+    async_result_objects : list
+        The result of each job of the batch, in the same order as 'jobs'
+    peak_resident_set_sizes : dict
+        Largest resident set size seen so far for each domain object
+    job_size_tuner : JobSizeTuner
+        Tuner updated with the measurements of each create job in 'adaptive'
+        job sizing mode, None otherwise
+
+    Raises
+    ------
+    Exception
+        The exception raised by the first failed job of the batch
+    """
+
+    first_exception = None
+
+    for job, async_result_object in zip(jobs, async_result_objects):
+        try:
+            job_measurement = async_result_object.get()
+        except Exception as exception:
+            log_failed_job(
+                f"Create job of '{job['domain_object']}' from record " +
+                f"{job['start_id']}", exception
+            )
+            if first_exception is None:
+                first_exception = exception
+            continue
+
+        record_job_measurement(
+            job, job_measurement, peak_resident_set_sizes, job_size_tuner
+        )
+
+    if first_exception is not None:
+        raise first_exception
+
+
+def create_and_write_records_from_create_job(create_job, file_builder):
+    """ Creates the records specified by a single fused 'create job', and
+    writes them to consecutive files starting at the job's file number. Each
+    file holds the maximum number of records per file, except possibly the
+    last file of the domain object. Each file is written as soon as enough
+    chunks of records have been created to fill it, so that no more than a
+    file and a chunk of records are held at once.
+
+    Parameters
+    ----------
+    create_job : dict
+        dictionary specifying the domain object, a quantity of records to
+        create, the ID to start from and the number of the first file to write
+    file_builder : FileBuilder
+        Instantiated subclass of FileBuilder used to write the output files
+
+    Returns
+    -------
+    dict
+        Holds the resident set size of the child process in bytes once the
+        records have been created and written, and the duration of their
+        creation in seconds, less the time spent writing them. The payload
+        size is zero, as no records are returned.
+    """
+
+    start_time = time.perf_counter()
+    write_duration = 0
+
+    max_records_per_file = file_builder.get_max_objects_per_file()
+    file_number = create_job['file_number']
+    created_records = RecordBatch()
+
+    for chunk in create_record_chunks_from_create_job(create_job):
+        created_records.extend(chunk)
+
+        while len(created_records) >= max_records_per_file:
+            write_start_time = time.perf_counter()
+            file_builder.build(
+                file_number, created_records.pop_front(max_records_per_file)
+            )
+            write_duration += time.perf_counter() - write_start_time
+            file_number += 1
+
+    if len(created_records):
+        write_start_time = time.perf_counter()
+        file_builder.build(file_number, created_records)
+        write_duration += time.perf_counter() - write_start_time
+
+    return {
+        'resident_set_size': get_resident_set_size(),
+        'duration': time.perf_counter() - start_time - write_duration,
+        'payload_size': 0
+    }
+
+
+def create_write_pool(number_of_write_child_processes):
+    """ Instantiates the Pool used to run 'write jobs', with a number of
+    processes as given in the user config by the
+    'number_of_write_child_processes' line. The pool is created once by the
+    write parent process and reused for every batch of every domain object.
 
     Parameters
     ----------
-    write_jobs : list
-        List of write jobs to be run over the pool of child processes
     number_of_write_child_processes : int
         The number of processes sitting within the pool for execution of jobs
         to be ran on.
-    file_builder : FileBuilder
-        Instantiated subclass of FileBuilder used to write created records to
-        file
+
+    Returns
+    -------
+    Pool
+        Pool of child write processes
     """
 
-    write_pool = Pool(number_of_write_child_processes)
+    return Pool(number_of_write_child_processes)
 
-    # the apply_async method is used in a for loop such that multiple arguments
-    # can be passed to the 'build_file_from_write_job' function, which is not
-    # possible using the Pool.map method
-    for write_job in write_jobs:
-        write_pool.apply_async(
-            build_file_from_write_job, args=(write_job, file_builder)
-        )
 
-    write_pool.close()
-    write_pool.join()
+def submit_write_job(write_job, write_pool, file_builder, callback,
+                     error_callback):
+    """ Submits a single 'write job' to the long-lived pool of child write
+    processes without waiting for it to finish. One of the callbacks is run
+    in the write parent process once the job has finished.
+
+    Parameters
+    ----------
+    write_job : dict
+        Write job to be run over the pool of child processes
+    write_pool : Pool
+        The pool of child write processes, as made by 'create_write_pool'
+    file_builder : FileBuilder
+        Instantiated subclass of FileBuilder used to write the job's records
+        to file
+    callback : callable
+        Called with the measurements reported by the job once it has finished
+    error_callback : callable
+        Called with the exception raised by the job should it fail
+    """
+
+    # the apply_async method is used such that multiple arguments can be
+    # passed to the 'build_file_from_write_job' function, which is not
+    # possible using the Pool.map method
+    write_pool.apply_async(
+        build_file_from_write_job,
+        args=(write_job, file_builder),
+        callback=callback,
+        error_callback=error_callback
+    )
 
 
 def build_file_from_write_job(write_job, file_builder):
@@ -161,6 +587,13 @@ def build_file_from_write_job(write_job, file_builder):
         number used to uniquely name the output file
     file_builder : FileBuilder
         Instantiated subclass of FileBuilder used to write the output file
+
+    Returns
+    -------
+    dict
+        Holds the resident set size of the child process in bytes, once the
+        file has been written
     """
     file_number, records = write_job['file_number'], write_job['records']
     file_builder.build(file_number, records)
+    return {'resident_set_size': get_resident_set_size()}
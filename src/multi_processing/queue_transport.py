@@ -0,0 +1,81 @@
+""" Construction of the multiprocessing-safe queues used to pass jobs and
+records between the main process and the create and write parent processes.
+
+Two transports are supported, selected by the optional 'queue_transport' key
+in the 'shared_args' section of the user config:
+
+    * 'queue' (default) - plain multiprocessing Queues. Items are pickled once
+      and written straight down a pipe between the two processes involved.
+    * 'manager' - Queues proxied through a multiprocessing Manager server
+      process. Every put and get is a round-trip to the server process, with
+      an extra pickling of the item on each hop.
+"""
+
+from multiprocessing import Manager, Queue
+
+QUEUE_TRANSPORTS = ['queue', 'manager']
+DEFAULT_QUEUE_TRANSPORT = 'queue'
+
+
+class QueueTransport:
+    """ Creates queues of the transport requested in the user config. Where
+    the 'manager' transport is used, the Manager server process is started
+    once and kept alive for as long as this object is referenced.
+
+    Attributes
+    ----------
+    queue_transport : String
+        Name of the transport, one of QUEUE_TRANSPORTS
+    queue_manager : SyncManager
+        Started Manager serving the queues, None unless the transport is
+        'manager'
+
+    Methods
+    -------
+    create_queue()
+        Returns a new, empty, multiprocessing-safe queue
+    get_queue_transport()
+        Returns the name of the transport in use
+    """
+
+    def __init__(self, queue_transport=DEFAULT_QUEUE_TRANSPORT):
+        """ Start a Manager server process if one is required by the
+        transport.
+
+        Parameters
+        ----------
+        queue_transport : String
+            Name of the transport, one of QUEUE_TRANSPORTS
+        """
+
+        self.__queue_transport = queue_transport
+
+        if queue_transport == 'manager':
+            self.__queue_manager = Manager()
+        else:
+            self.__queue_manager = None
+
+    def create_queue(self):
+        """ Returns a new, empty, multiprocessing-safe queue
+
+        Returns
+        -------
+        Multiprocessing Queue
+            A plain Queue, or a Manager proxy of one for the 'manager'
+            transport
+        """
+
+        if self.__queue_manager is not None:
+            return self.__queue_manager.Queue()
+        return Queue()
+
+    def get_queue_transport(self):
+        """ Returns the name of the transport in use
+
+        Returns
+        -------
+        String
+            One of QUEUE_TRANSPORTS
+        """
+
+        return self.__queue_transport
@@ -0,0 +1,288 @@
+""" Columnar batches of the records of a domain object.
+
+Records are passed from the create child processes to the write parent
+process, and on to the write child processes, as a RecordBatch: the names of
+their attributes once, as its schema, and a column holding the values of each
+attribute. Pickled as a list of dictionaries, every record would carry its
+attribute names again on each of those hops, and for records with many dummy
+fields the names can outweigh the values.
+
+Factories may create a RecordBatch directly from columns of values. The
+records of factories returning a list of dictionaries are instead gathered
+into a RecordBatch by the create child process, see as_record_batch. File
+builders writing rows, such as CSVBuilder, write the columns as they are,
+while those serialising dictionaries build each record as they write it.
+
+Records of one batch are expected to share their attributes. Where they do
+not, the schema holds every attribute in the order first seen, and the
+values a record does not have are held as MISSING, which is left out of the
+dictionary of the record.
+"""
+
+from collections.abc import Sequence
+
+
+class _Missing:
+    """ Type of the MISSING placeholder, kept the same object when
+    unpickled """
+
+    def __reduce__(self):
+        return 'MISSING'
+
+    def __repr__(self):
+        return 'MISSING'
+
+
+# value held for an attribute a record of a batch does not have
+MISSING = _Missing()
+
+
+class RecordBatch(Sequence):
+    """ Records of a domain object held as a column of values per attribute.
+    Indexing a batch by position returns the record as a dictionary, and by
+    a slice returns a new batch of those records.
+
+    Attributes
+    ----------
+    schema : tuple
+        Names of the attributes of the records, in order
+    columns : List
+        List of values of each attribute, in schema order
+    has_missing_values : Boolean
+        Whether any record lacks an attribute of the schema
+
+    Methods
+    -------
+    from_records(records)
+        Return a batch of the given dictionaries
+    get_column(attribute_name)
+        Return the values of an attribute
+    get_rows()
+        Return an iterator over the values of each record, in schema order
+    to_records()
+        Return the records as a list of dictionaries
+    extend(record_batch)
+        Append the records of another batch
+    pop_front(number_of_records)
+        Remove the first records of the batch, returning them as a batch
+    """
+
+    def __init__(self, columns=None):
+        """ Create a batch from columns of values of the same length. The
+        columns are copied, so may be shared or changed by the caller.
+
+        Parameters
+        ----------
+        columns : dict, optional
+            Column of values of each attribute, keyed by attribute name, in
+            the order of the attributes of each record. An empty batch, which
+            takes the schema of the first batch extending it, where omitted.
+        """
+
+        columns = columns or {}
+        self.schema = tuple(columns)
+        self.columns = [list(column) for column in columns.values()]
+        self.has_missing_values = False
+
+    @classmethod
+    def from_records(cls, records):
+        """ Returns a batch of the given records. The schema is taken from
+        the first record, unless later records have other attributes.
+
+        Parameters
+        ----------
+        records : List
+            Records, each a dictionary keyed by attribute name
+
+        Returns
+        -------
+        RecordBatch
+            Batch of the records
+        """
+
+        record_batch = cls()
+        if not records:
+            return record_batch
+
+        schema = tuple(records[0])
+        number_of_attributes = len(schema)
+
+        try:
+            if any(len(record) != number_of_attributes for record in records):
+                raise KeyError
+            # records with as many attributes as the schema and every one of
+            # its attributes have exactly the attributes of the schema
+            columns = [[record[attribute_name] for record in records]
+                       for attribute_name in schema]
+        except KeyError:
+            schema = tuple({attribute_name: None for record in records
+                            for attribute_name in record})
+            columns = [[record.get(attribute_name, MISSING)
+                        for record in records]
+                       for attribute_name in schema]
+            record_batch.has_missing_values = True
+
+        record_batch.schema = schema
+        record_batch.columns = columns
+        return record_batch
+
+    def __len__(self):
+        """ Returns the number of records of the batch """
+
+        return len(self.columns[0]) if self.columns else 0
+
+    def __getitem__(self, position):
+        """ Returns the record at a position as a dictionary, or the records
+        of a slice as a new batch.
+
+        Parameters
+        ----------
+        position : int or slice
+            Position of the record, or slice of the records
+
+        Returns
+        -------
+        dict or RecordBatch
+            The record, or a batch of the records
+        """
+
+        if isinstance(position, slice):
+            record_batch = RecordBatch()
+            record_batch.schema = self.schema
+            record_batch.columns = [column[position]
+                                    for column in self.columns]
+            record_batch.has_missing_values = self.has_missing_values
+            return record_batch
+
+        if position < -len(self) or position >= len(self):
+            raise IndexError('record batch index out of range')
+
+        return self.__to_record(
+            [column[position] for column in self.columns]
+        )
+
+    def __iter__(self):
+        """ Iterates over the records of the batch as dictionaries """
+
+        for values in self.get_rows():
+            yield self.__to_record(values)
+
+    def __to_record(self, values):
+        """ Returns the dictionary of a record from its values in schema
+        order, leaving out MISSING values """
+
+        if self.has_missing_values:
+            return {attribute_name: value
+                    for attribute_name, value in zip(self.schema, values)
+                    if value is not MISSING}
+        return dict(zip(self.schema, values))
+
+    def get_column(self, attribute_name):
+        """ Returns the values of an attribute of every record.
+
+        Parameters
+        ----------
+        attribute_name : String
+            Name of the attribute
+
+        Returns
+        -------
+        List
+            Value of the attribute of each record, MISSING where a record
+            does not have it
+        """
+
+        return self.columns[self.schema.index(attribute_name)]
+
+    def get_rows(self):
+        """ Returns an iterator over the values of each record, as a tuple
+        in schema order, MISSING where a record does not have an attribute.
+
+        Returns
+        -------
+        Iterator
+            Tuple of the values of each record
+        """
+
+        return zip(*self.columns)
+
+    def to_records(self):
+        """ Returns the records of the batch as dictionaries.
+
+        Returns
+        -------
+        List
+            Records, each a dictionary keyed by attribute name
+        """
+
+        return list(self)
+
+    def extend(self, record_batch):
+        """ Appends the records of another batch of the same domain object.
+        An empty batch takes the schema of the batch extending it.
+
+        Parameters
+        ----------
+        record_batch : RecordBatch
+            Batch whose records are appended
+        """
+
+        if not len(record_batch):
+            return
+
+        if not len(self):
+            self.schema = record_batch.schema
+            self.columns = [list(column) for column in record_batch.columns]
+            self.has_missing_values = record_batch.has_missing_values
+        elif self.schema == record_batch.schema:
+            for column, other_column in zip(self.columns,
+                                            record_batch.columns):
+                column.extend(other_column)
+            self.has_missing_values |= record_batch.has_missing_values
+        else:
+            merged = RecordBatch.from_records(
+                self.to_records() + record_batch.to_records()
+            )
+            self.schema = merged.schema
+            self.columns = merged.columns
+            self.has_missing_values = merged.has_missing_values
+
+    def pop_front(self, number_of_records):
+        """ Removes the first records of the batch, returning them.
+
+        Parameters
+        ----------
+        number_of_records : int
+            Number of records to remove
+
+        Returns
+        -------
+        RecordBatch
+            Batch of the removed records
+        """
+
+        front = self[:number_of_records]
+        for column in self.columns:
+            del column[:number_of_records]
+        return front
+
+
+def as_record_batch(records):
+    """ Returns the given records as a RecordBatch, gathering them into one
+    where they are not one already.
+
+    Parameters
+    ----------
+    records : RecordBatch or Iterable
+        A batch of records, or records each a dictionary keyed by attribute
+        name
+
+    Returns
+    -------
+    RecordBatch
+        Batch of the records
+    """
+
+    if isinstance(records, RecordBatch):
+        return records
+    return RecordBatch.from_records(list(records))
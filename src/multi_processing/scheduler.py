@@ -0,0 +1,135 @@
+""" Scheduling of domain objects according to the dependencies between them.
+
+Dependant domain objects read records of the domain objects they depend on
+from the dependency database, so may only be created once every record of
+those domain objects has been created. Domain objects which do not depend on
+each other may be created at the same time, sharing the pools of create and
+write child processes owned by the Coordinator.
+
+The dependencies of each supported domain object are held below, keyed by
+the name used for it in the 'factory_definitions' section of the user config.
+"""
+
+DOMAIN_OBJECT_DEPENDENCIES = {
+    'instrument': [],
+    'account': [],
+    'price': ['instrument'],
+    'trade': ['instrument', 'account'],
+    'front_office_position': ['instrument', 'account'],
+    'back_office_position': ['instrument', 'account'],
+    'depot_position': ['instrument', 'account'],
+    'cash_balance': ['account'],
+    'cash_flow': ['account'],
+    'settlement_instruction': ['instrument', 'account'],
+    'stock_loan_position': ['instrument'],
+    'counterparty': [],
+    'swap_contract': ['counterparty'],
+    'swap_position': ['swap_contract', 'instrument'],
+    'cashflow': ['swap_position']
+}
+
+
+class DependencyScheduler:
+    """ Tracks which domain objects of a generation run are ready to be
+    created, based on which of the domain objects they depend on have been
+    written to file.
+
+    Dependencies on domain objects which are not part of the run are ignored.
+    A domain object with no entry in DOMAIN_OBJECT_DEPENDENCIES is taken to
+    depend on every domain object listed before it in the user config, so it
+    is created no earlier than it would be were domain objects created one
+    after another.
+
+    Attributes
+    ----------
+    dependencies : dict
+        Maps the name of each domain object of the run to the list of names
+        of domain objects of the run it depends on
+    started_domain_objects : set
+        Names of domain objects which have been handed out as ready
+    completed_domain_objects : set
+        Names of domain objects which have been written to file
+
+    Methods
+    -------
+    get_ready_domain_objects()
+        Return the domain objects not yet started whose dependencies have all
+        been completed, and mark them as started
+    mark_complete(domain_object)
+        Record that every record of a domain object has been written
+    is_complete()
+        Return whether every domain object of the run has been completed
+    """
+
+    def __init__(self, domain_objects):
+        """ Build the dependency graph of the domain objects of the run.
+
+        Parameters
+        ----------
+        domain_objects : list
+            Names of the domain objects to create, in the order they are
+            listed in the user config
+        """
+
+        self.__dependencies = {}
+
+        for position, domain_object in enumerate(domain_objects):
+            if domain_object in DOMAIN_OBJECT_DEPENDENCIES:
+                self.__dependencies[domain_object] = [
+                    dependency for dependency
+                    in DOMAIN_OBJECT_DEPENDENCIES[domain_object]
+                    if dependency in domain_objects
+                ]
+            else:
+                self.__dependencies[domain_object] = \
+                    list(domain_objects[:position])
+
+        self.__started_domain_objects = set()
+        self.__completed_domain_objects = set()
+
+    def get_ready_domain_objects(self):
+        """ Return the domain objects which have not yet been started and
+        whose dependencies have all been completed, in the order they were
+        given, and mark them as started.
+
+        Returns
+        -------
+        list
+            Names of the domain objects which are ready to be created
+        """
+
+        ready_domain_objects = [
+            domain_object
+            for domain_object, dependencies in self.__dependencies.items()
+            if domain_object not in self.__started_domain_objects
+            and all(dependency in self.__completed_domain_objects
+                    for dependency in dependencies)
+        ]
+
+        self.__started_domain_objects.update(ready_domain_objects)
+        return ready_domain_objects
+
+    def mark_complete(self, domain_object):
+        """ Record that every record of a domain object has been written,
+        allowing the domain objects depending on it to be started.
+
+        Parameters
+        ----------
+        domain_object : String
+            Name of the completed domain object
+        """
+
+        self.__completed_domain_objects.add(domain_object)
+
+    def is_complete(self):
+        """ Returns whether every domain object of the run has been
+        completed.
+
+        Returns
+        -------
+        Boolean
+            True once every domain object has been marked complete
+        """
+
+        return len(self.__completed_domain_objects) == \
+            len(self.__dependencies)
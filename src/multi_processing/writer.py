@@ -1,5 +1,8 @@
-import time
+import threading
+from functools import partial
 from multi_processing import pool_tasks
+from multi_processing.memory_usage import get_resident_set_size
+from multi_processing.record_batch import RecordBatch
 
 
 class Writer:
@@ -7,88 +10,165 @@ class Writer:
     compiling pre-generated records from a Multiprocessed Queue into larger
     sets such that files can be written in user-requested sizes.
 
-    The write parent process waits until the 'generated_record_queue' is not
-    empty, at which point it retrieves lists of records from the queue and
-    collates all records from those lists into a
-    'dequeued_created_records_not_yet_written_to_file' list.
+    The write parent process is started once per generation run, creating its
+    pool of child write processes when it starts and keeping it alive for
+    every domain object. The records of each domain object are preceded on the
+    'generated_record_queue' by a message holding the file builder to write
+    them with, and followed by an end of domain object message. The records
+    of several domain objects may be interleaved on the queue, so every
+    message names the domain object it belongs to, and records are collated
+    separately for each domain object.
 
-    It then creates a list of 'write jobs', each of which is a dictionary
-    containing a portion of the records from the
-    'dequeued_created_records_not_yet_written_to_file' list to write to file,
-    and the ID of the output file. A single output file can have multiple
-    'write jobs', but a 'write job' can only refer to one output file.
+    The write parent process blocks on the 'generated_record_queue' until an
+    item is put on it, at which point it retrieves the batch of records from
+    it and collates them into the
+    'dequeued_created_records_not_yet_written_to_file' batch of their domain
+    object.
 
-    The 'write jobs' in the list are run over a pool of child write processes,
-    which build the output files then terminate. Upon termination of all
-    processes, the 'write job' list is emptied and the next iteration begins by
-    dequeuing any further records from the 'generated_record_queue'.
+    Whenever a whole file's worth of records has been collated, a 'write job'
+    is created, which is a dictionary containing those records, the ID of
+    the output file and the name of the domain object. A 'write job' refers
+    to exactly one output file.
+
+    Each 'write job' is submitted to the pool of child write processes as
+    soon as it is created, without waiting for earlier jobs to finish. A
+    sliding window allows up to twice the number of child write processes
+    worth of 'write jobs' to be in progress at once. When the window is full,
+    the write parent process waits for a job to finish before submitting the
+    next, and so stops dequeuing records. A callback run as each job finishes
+    frees its place in the window, so dequeuing and slicing new records
+    overlaps with the writing of files, and the child write processes are
+    given new jobs as soon as they finish their last.
+
+    Records are no longer counted as in flight once they have been dequeued,
+    which may wake a create parent process waiting for the writers to catch
+    up. As the write parent process stops dequeuing while its window is full,
+    a slow writer still holds back the create parent process. Records which do
+    not yet fill a whole file stay in the
+    'dequeued_created_records_not_yet_written_to_file' batch of their domain
+    object, which therefore never holds a whole file's worth of records.
+
+    When the end of domain object message of a domain object is dequeued, any
+    residual records of it are submitted as a final 'write job'. Once every
+    'write job' of the domain object has finished, the name of the domain
+    object is reported on the 'completed_object_queue', along with the
+    largest resident set size of any create or write process seen while
+    creating and writing it.
+
+    A write job which fails does not stop the other files being written. Its
+    exception is printed to standard error, and the number of failed write
+    jobs of its domain object is reported along with its completion, so that
+    the run can be marked as failed.
 
     Attributes
     ----------
     created_record_queue : Multiprocessed Queue
-        Contains results of the generation process. Each element is a list of
-        lists of records.
-    dequeued_created_records_not_yet_written_to_file : list
-        list collating all records dequeued from the created record queue that
-        have not yet been written to file
-    number_of_next_file_to_write : int
-        The current file number to be writing to.
-    max_records_per_file : int
-        The maximum number of records in each output file.
-    write_jobs : list
-        List of jobs to be run
+        Contains results of the generation process. Each element holds a batch
+        of records and the name of their domain object.
+    completed_object_queue : Multiprocessed Queue
+        Receives the name, peak resident set size and number of failed
+        write jobs of each domain object once all of its records have been
+        written to file
+    in_flight_limit : InFlightRecordLimit
+        Count of records in flight from the create parent process, reduced
+        as records are dequeued
+    peak_resident_set_sizes : dict
+        Largest resident set size of the create and write processes seen
+        while creating and writing each domain object, keyed by domain object
+        name
+    dequeued_created_records_not_yet_written_to_file : dict
+        Batches collating all records dequeued from the created record queue
+        that have not yet been written to file, keyed by domain object name
+    number_of_next_file_to_write : dict
+        The current file number to be writing to, keyed by domain object name
+    max_records_per_file : dict
+        The maximum number of records in each output file, keyed by domain
+        object name
+    write_jobs_in_progress : dict
+        Number of submitted write jobs which have not yet finished, keyed by
+        domain object name
+    failed_write_jobs : dict
+        Number of write jobs which have failed, keyed by the name of each
+        domain object with failed write jobs
+    ended_domain_objects : set
+        Names of the domain objects whose records have all been dequeued, but
+        whose completion has not yet been reported
     terminate_dequeued : boolean
         Boolean flag which when True indicates the coordinator is to terminate
-    file_builder : FileBuilder
-        Instantiated file builder, pre-configured to output the necessary file
-        extension.
+    file_builders : dict
+        Instantiated file builders, pre-configured to output the necessary
+        file extension, keyed by domain object name
+    write_window : threading Semaphore
+        Holds one place for each write job which may be in progress at once,
+        created when the write parent process starts
+    write_job_lock : threading Lock
+        Guards the state shared with the callbacks of finished write jobs,
+        created when the write parent process starts
 
     Methods
     -------
     parent_process()
-        Begin the cycle of waiting for, handling and running jobs. Continue
+        Begin the cycle of waiting for, handling and submitting jobs. Continue
         this until termination instruction observed
-    sleep_while_created_record_queue_empty()
-        Sleeps until items are observed on the Multiprocessed Queue.
-    create_write_jobs()
-        Takes items from the created records queue and adds write jobs to
-        the write jobs list representing these records. If a terminate
-        instruction is dequeued, the appropriate flag is set.
-    get_write_job()
+    handle_dequeued_item(dequeued_item, write_pool)
+        Act on a single item taken from the created records queue, submitting
+        write jobs for any whole files of records
+    submit_write_job(write_job, write_pool)
+        Wait for a place in the window of write jobs, then submit the job
+    finish_write_job(domain_object, job_measurement)
+        Callback run as a write job finishes, freeing its place in the window
+    fail_write_job(domain_object, file_number, exception)
+        Callback run as a write job fails, printing its exception and
+        counting it as failed before freeing its place in the window
+    report_if_written(domain_object)
+        Report completion of an ended domain object without write jobs in
+        progress
+    set_file_builder(domain_object, file_builder)
+        Start writing a new domain object with the given file builder
+    remove_file_builder(domain_object)
+        Forget the writing state of a domain object once it has been written
+    get_write_job(domain_object)
         Create a single write job representing the records at the front of
-        the 'dequeued_created_records_not_yet_written_to_file' list. Delete
-        these records from the list, then return the write job.
+        the domain object's 'dequeued_created_records_not_yet_written_to_file'
+        batch. Delete these records from the batch, then return the write
+        job.
     """
 
-    def __init__(
-            self, created_record_queue, max_records_per_file, file_builder
-    ):
+    def __init__(self, created_record_queue, completed_object_queue,
+                 in_flight_limit):
         """ Initialise instance attributes.
 
         Parameters
         ----------
         created_record_queue : Multiprocessing Queue
-            Shared, multiprocessing safe, queue holding lists of lists of
-            records
-        max_records_per_file : int
-            Value representing the maximum number of records per file
-        file_builder : File_Builder
-            Instantiated file builder, pre-configured to output the necessary
-            file extension.
+            Shared, multiprocessing safe, queue holding batches of records
+        completed_object_queue : Multiprocessing Queue
+            Shared, multiprocessing safe, queue on which completion of each
+            domain object is reported
+        in_flight_limit : InFlightRecordLimit
+            Count of records in flight from the create parent process, shared
+            with the create parent process
         """
 
         self.created_record_queue = created_record_queue
-        self.dequeued_created_records_not_yet_written_to_file = []
-        self.number_of_next_file_to_write = 0
-        self.max_records_per_file = max_records_per_file
-        self.write_jobs = []
+        self.completed_object_queue = completed_object_queue
+        self.in_flight_limit = in_flight_limit
+        self.peak_resident_set_sizes = {}
+        self.dequeued_created_records_not_yet_written_to_file = {}
+        self.number_of_next_file_to_write = {}
+        self.max_records_per_file = {}
+        self.write_jobs_in_progress = {}
+        self.failed_write_jobs = {}
+        self.ended_domain_objects = set()
         self.terminate_dequeued = False
-        self.file_builder = file_builder
+        self.file_builders = {}
+        self.write_window = None
+        self.write_job_lock = None
 
     def parent_process(self, number_of_write_child_processes):
-        """ Begin the cycle of waiting for, handling, and running jobs,
-        continuing this until an instruction to terminate is observed. Once
-        observed, calculate any residual write to be made and terminate.
+        """ Begin the cycle of waiting for, handling, and submitting jobs,
+        continuing this until an instruction to terminate is observed, then
+        wait for every submitted job to finish.
 
         Parameters
         ----------
@@ -96,86 +176,276 @@ class Writer:
             The number of processes running in the generator's pool
         """
 
-        maximum_number_of_write_jobs_to_create = \
+        # the window is sized in proportion to the number of processes
+        # available to run the jobs, so each process has a job waiting for it
+        # as soon as it finishes its last
+        self.write_window = threading.BoundedSemaphore(
             2 * number_of_write_child_processes
+        )
+        self.write_job_lock = threading.Lock()
+
+        write_pool = pool_tasks.create_write_pool(
+            number_of_write_child_processes
+        )
 
         while not self.terminate_dequeued:
-            self.sleep_while_created_record_queue_empty()
-            self.create_write_jobs(
-                maximum_number_of_write_jobs_to_create
+            self.handle_dequeued_item(
+                self.created_record_queue.get(), write_pool
             )
-            pool_tasks.run_write_jobs(
-                self.write_jobs,
-                number_of_write_child_processes,
-                self.file_builder
+
+        write_pool.close()
+        write_pool.join()
+
+    def handle_dequeued_item(self, dequeued_item, write_pool):
+        """ Acts on a single item taken from the created records queue. If a
+        terminate instruction is dequeued, the appropriate flag is set. If an
+        end of domain object message is dequeued, the residual records of the
+        domain object are submitted as a final write job. Otherwise, the file
+        builder or records of a domain object are stored, and write jobs are
+        submitted for any whole files of records.
+
+        Parameters
+        ----------
+        dequeued_item : dict or String
+            Item taken from the created records queue
+        write_pool : Pool
+            The pool of child write processes, as made by
+            'create_write_pool'
+        """
+
+        if dequeued_item == "terminate":
+            self.terminate_dequeued = True
+            return
+
+        if 'end_of_domain_object' in dequeued_item:
+            domain_object = dequeued_item['end_of_domain_object']
+
+            if self.dequeued_created_records_not_yet_written_to_file[
+                    domain_object
+            ]:
+                # batch is not empty - there are some residual records
+                # remaining
+                self.submit_write_job(
+                    self.get_write_job(domain_object), write_pool
+                )
+
+            with self.write_job_lock:
+                pool_tasks.update_peak_resident_set_size(
+                    self.peak_resident_set_sizes,
+                    domain_object,
+                    dequeued_item['peak_resident_set_size']
+                )
+                self.ended_domain_objects.add(domain_object)
+                self.report_if_written(domain_object)
+            return
+
+        domain_object = dequeued_item['domain_object']
+
+        if 'file_builder' in dequeued_item:
+            self.set_file_builder(domain_object, dequeued_item['file_builder'])
+            return
+
+        records_not_yet_written_to_file = \
+            self.dequeued_created_records_not_yet_written_to_file[
+                domain_object
+            ]
+        records_not_yet_written_to_file.extend(dequeued_item['records'])
+        self.in_flight_limit.remove_records(len(dequeued_item['records']))
+
+        with self.write_job_lock:
+            pool_tasks.update_peak_resident_set_size(
+                self.peak_resident_set_sizes,
+                domain_object,
+                get_resident_set_size()
             )
-            self.write_jobs = []
-
-        if self.dequeued_created_records_not_yet_written_to_file:
-            # list is not empty - there are some residual records remaining
-            pool_tasks.run_write_jobs(
-                [self.get_write_job()],
-                number_of_write_child_processes,
-                self.file_builder
+
+        while len(records_not_yet_written_to_file) >= \
+                self.max_records_per_file[domain_object]:
+            self.submit_write_job(
+                self.get_write_job(domain_object), write_pool
             )
 
-    def sleep_while_created_record_queue_empty(self):
-        """ Sleep until records are on the queue """
+    def submit_write_job(self, write_job, write_pool):
+        """ Waits for a place in the window of write jobs in progress, then
+        submits the write job to the pool of child write processes without
+        waiting for it to finish.
+
+        Parameters
+        ----------
+        write_job : dict
+            The write job to submit
+        write_pool : Pool
+            The pool of child write processes, as made by
+            'create_write_pool'
+        """
+
+        domain_object = write_job['domain_object']
+
+        self.write_window.acquire()
 
-        while self.created_record_queue.empty():
-            time.sleep(1)
-        return
+        with self.write_job_lock:
+            self.write_jobs_in_progress[domain_object] += 1
+
+        pool_tasks.submit_write_job(
+            write_job,
+            write_pool,
+            self.file_builders[domain_object],
+            partial(self.finish_write_job, domain_object),
+            partial(self.fail_write_job, domain_object,
+                    write_job['file_number'])
+        )
 
-    def create_write_jobs(self, maximum_number_of_write_jobs_to_create):
-        """ Takes items from the created records queue and adds write jobs to
-        the write jobs list representing these records. If a terminate
-        instruction is dequeued, the appropriate flag is set.
+    def finish_write_job(self, domain_object, job_measurement):
+        """ Callback run by the pool once a write job has finished. Frees the
+        job's place in the window, and reports completion of its domain object
+        if it was the last write job of the domain object.
 
         Parameters
         ----------
-        maximum_number_of_write_jobs_to_create : int
-            The maximum number of write jobs to add to self.write_jobs
+        domain_object : String
+            Name of the domain object the write job belonged to
+        job_measurement : dict
+            Measurements reported by the write job, None if it failed
         """
 
-        while not self.created_record_queue.empty() and \
-                len(self.write_jobs) < maximum_number_of_write_jobs_to_create:
+        with self.write_job_lock:
+            self.write_jobs_in_progress[domain_object] -= 1
 
-            dequeued_created_records = self.created_record_queue.get()
-
-            if dequeued_created_records == "terminate":
-                self.terminate_dequeued = True
-            else:
-                self.dequeued_created_records_not_yet_written_to_file.extend(
-                    dequeued_created_records
+            if job_measurement is not None:
+                pool_tasks.update_peak_resident_set_size(
+                    self.peak_resident_set_sizes,
+                    domain_object,
+                    job_measurement['resident_set_size']
                 )
-                while len(
-                        self.dequeued_created_records_not_yet_written_to_file
-                ) >= self.max_records_per_file:
-                    self.write_jobs.append(self.get_write_job())
 
-    def get_write_job(self):
+            self.report_if_written(domain_object)
+
+        self.write_window.release()
+
+    def fail_write_job(self, domain_object, file_number, exception):
+        """ Callback run by the pool if a write job raises an exception. The
+        exception is printed and the job counted as failed against its domain
+        object. As with finished jobs, the job's place in the window is then
+        freed, so a failed file does not stop the other files being written.
+
+        Parameters
+        ----------
+        domain_object : String
+            Name of the domain object the write job belonged to
+        file_number : int
+            Number of the file the write job was to write
+        exception : Exception
+            The exception raised by the write job
+        """
+
+        pool_tasks.log_failed_job(
+            f"Write job of file {file_number} of '{domain_object}'", exception
+        )
+
+        with self.write_job_lock:
+            self.failed_write_jobs[domain_object] = \
+                self.failed_write_jobs.get(domain_object, 0) + 1
+
+        self.finish_write_job(domain_object, None)
+
+    def report_if_written(self, domain_object):
+        """ Reports completion of a domain object on the completed object
+        queue, and forgets its writing state, if all of its records have been
+        dequeued and none of its write jobs are still in progress. Must be
+        called holding the 'write_job_lock'.
+
+        Parameters
+        ----------
+        domain_object : String
+            Name of the domain object
+        """
+
+        if domain_object not in self.ended_domain_objects or \
+                self.write_jobs_in_progress[domain_object] > 0:
+            return
+
+        self.completed_object_queue.put({
+            'domain_object': domain_object,
+            'peak_resident_set_size':
+                self.peak_resident_set_sizes.pop(domain_object, 0),
+            'failed_write_jobs':
+                self.failed_write_jobs.pop(domain_object, 0)
+        })
+        self.ended_domain_objects.remove(domain_object)
+        self.remove_file_builder(domain_object)
+
+    def set_file_builder(self, domain_object, file_builder):
+        """ Start writing a new domain object, using the given file builder
+        and numbering its files from zero.
+
+        Parameters
+        ----------
+        domain_object : String
+            Name of the domain object, as given in the user config
+        file_builder : File_Builder
+            Instantiated file builder, pre-configured to output the necessary
+            file extension.
+        """
+
+        self.file_builders[domain_object] = file_builder
+        self.max_records_per_file[domain_object] = \
+            file_builder.get_max_objects_per_file()
+        self.number_of_next_file_to_write[domain_object] = 0
+        self.dequeued_created_records_not_yet_written_to_file[
+            domain_object
+        ] = RecordBatch()
+
+        with self.write_job_lock:
+            self.write_jobs_in_progress[domain_object] = 0
+
+    def remove_file_builder(self, domain_object):
+        """ Forget the file builder and writing state of a domain object once
+        all of its records have been written.
+
+        Parameters
+        ----------
+        domain_object : String
+            Name of the domain object, as given in the user config
+        """
+
+        del self.file_builders[domain_object]
+        del self.max_records_per_file[domain_object]
+        del self.number_of_next_file_to_write[domain_object]
+        del self.dequeued_created_records_not_yet_written_to_file[
+            domain_object
+        ]
+        del self.write_jobs_in_progress[domain_object]
+
+    def get_write_job(self, domain_object):
         """ Create a single write job representing the records at the front of
-        the 'dequeued_created_records_not_yet_written_to_file' list. Delete
-        these records from the list, then return the write job.
+        the domain object's 'dequeued_created_records_not_yet_written_to_file'
+        batch. Delete these records from the batch, then return the write
+        job.
+
+        Parameters
+        ----------
+        domain_object : String
+            Name of the domain object, as given in the user config
         """
 
+        records_not_yet_written_to_file = \
+            self.dequeued_created_records_not_yet_written_to_file[
+                domain_object
+            ]
+
         number_of_records = min(
-            self.max_records_per_file, len(
-                self.dequeued_created_records_not_yet_written_to_file
-            )
+            self.max_records_per_file[domain_object],
+            len(records_not_yet_written_to_file)
         )
 
         write_job = {
-            'file_number': self.number_of_next_file_to_write,
-            'records': self.dequeued_created_records_not_yet_written_to_file[
-                       :number_of_records
-                       ]
+            'domain_object': domain_object,
+            'file_number': self.number_of_next_file_to_write[domain_object],
+            'records': records_not_yet_written_to_file.pop_front(
+                number_of_records
+            )
         }
 
-        self.number_of_next_file_to_write += 1
-
-        del self.dequeued_created_records_not_yet_written_to_file[
-            :number_of_records
-            ]
+        self.number_of_next_file_to_write[domain_object] += 1
 
         return write_job
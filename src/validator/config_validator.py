@@ -6,6 +6,14 @@ Error list to be returned, and used as a basis to feedback to the user that
 the configuration as-is is insufficient for successful operation.
 """
 from validator.validation_result import ValidationResult
+from multi_processing.queue_transport import QUEUE_TRANSPORTS
+from multi_processing.coordinator import EXECUTION_MODES, \
+    UNSIZED_DOMAIN_OBJECTS
+from multi_processing.job_sizing import JOB_SIZINGS
+from database.sqlite_database import DEPENDENCY_DATABASE_MODES
+from database.dependency_stores import DEPENDENCY_STORES, \
+    is_shared_memory_available
+from domainobjectfactories.job_clock import TIMESTAMP_MODES
 
 
 def validate(configurations):
@@ -47,7 +55,15 @@ def validate(configurations):
         validate_output_file_extensions(dev_file_builder_args,
                                         factory_definitions),
         validate_pool_sizes_non_zero(shared_args),
-        validate_number_of_records_per_job(shared_args, factory_definitions)
+        validate_number_of_records_per_job(shared_args, factory_definitions),
+        validate_queue_transport(shared_args),
+        validate_execution_mode(shared_args, factory_definitions),
+        validate_max_records_in_flight(shared_args),
+        validate_job_sizing(shared_args),
+        validate_dependency_database_mode(shared_args),
+        validate_dependency_store(shared_args),
+        validate_timestamps(shared_args),
+        validate_max_records_per_chunk(shared_args)
     ]
 
     # Remove instances of None or empty lists from error list
@@ -225,6 +241,14 @@ def validate_number_of_records_per_job(shared_args, factory_definitions):
     if not isinstance(number_of_records_per_job, int):
         errors.append("- 'number_of_records_per_job' must be an integer")
 
+    elif shared_args.get('job_sizing') == 'adaptive':
+        # adaptive job sizes are decoupled from file sizes, the value is only
+        # the size of the first jobs of each domain object
+        if not 0 < number_of_records_per_job:
+            errors.append(
+                "- 'number_of_records_per_job' must be greater than 0"
+            )
+
     else:
         try:
             minmax_objects_per_file = min(
@@ -259,6 +283,236 @@ def validate_number_of_records_per_job(shared_args, factory_definitions):
     return errors
 
 
+def validate_queue_transport(shared_args):
+    """ Ensure the optional 'queue_transport' value, where given, names one
+    of the supported queue transports.
+
+    Parameters
+    ----------
+    shared_args : dict
+        Dictionary of the "shared_config" section of the config file
+
+    Returns
+    -------
+    List
+        Errors where relevant, or empty if none found
+    """
+
+    errors = []
+
+    queue_transport = shared_args.get('queue_transport')
+    if queue_transport is not None and \
+            queue_transport not in QUEUE_TRANSPORTS:
+        errors.append(f"- Invalid queue transport '{queue_transport}', " +
+                      f"must be one of {QUEUE_TRANSPORTS}")
+    return errors
+
+
+def validate_execution_mode(shared_args, factory_definitions):
+    """ Ensure the optional 'execution_mode' value, where given, names one
+    of the supported execution modes, and that no domain object whose
+    factory does not create exactly the records of its create jobs is
+    generated in 'fused' mode.
+
+    Parameters
+    ----------
+    shared_args : dict
+        Dictionary of the "shared_config" section of the config file
+    factory_definitions : dict
+        Dictionary of string:dict key/value pairs where keys are names of
+        domain objects, and each value is a dictionary containing the
+        configuration settings for that domain object.
+
+    Returns
+    -------
+    List
+        Errors where relevant, or empty if none found
+    """
+
+    errors = []
+
+    execution_mode = shared_args.get('execution_mode')
+    if execution_mode is not None and \
+            execution_mode not in EXECUTION_MODES:
+        errors.append(f"- Invalid execution mode '{execution_mode}', " +
+                      f"must be one of {EXECUTION_MODES}")
+
+    if execution_mode == 'fused':
+        for domain_object in factory_definitions:
+            if domain_object in UNSIZED_DOMAIN_OBJECTS:
+                errors.append(f"- Domain object '{domain_object}' cannot " +
+                              "be generated in 'fused' execution mode, " +
+                              "as its number of records is not its " +
+                              "record count")
+    return errors
+
+
+def validate_max_records_in_flight(shared_args):
+    """ Ensure the optional 'max_records_in_flight' value, where given, is a
+    whole number above zero.
+
+    Parameters
+    ----------
+    shared_args : dict
+        Dictionary of the "shared_config" section of the config file
+
+    Returns
+    -------
+    List
+        Errors where relevant, or empty if none found
+    """
+
+    errors = []
+
+    max_records_in_flight = shared_args.get('max_records_in_flight')
+    if max_records_in_flight is not None and \
+            (not isinstance(max_records_in_flight, int)
+             or max_records_in_flight <= 0):
+        errors.append("- Max records in flight must be a whole number " +
+                      f"above zero, found {max_records_in_flight}")
+    return errors
+
+
+def validate_job_sizing(shared_args):
+    """ Ensure the optional 'job_sizing' value, where given, names one of the
+    supported job sizing modes, and that the optional 'target_job_duration'
+    value, where given, is a number above zero.
+
+    Parameters
+    ----------
+    shared_args : dict
+        Dictionary of the "shared_config" section of the config file
+
+    Returns
+    -------
+    List
+        Errors where relevant, or empty if none found
+    """
+
+    errors = []
+
+    job_sizing = shared_args.get('job_sizing')
+    if job_sizing is not None and job_sizing not in JOB_SIZINGS:
+        errors.append(f"- Invalid job sizing '{job_sizing}', " +
+                      f"must be one of {JOB_SIZINGS}")
+
+    target_job_duration = shared_args.get('target_job_duration')
+    if target_job_duration is not None and \
+            (not isinstance(target_job_duration, (int, float))
+             or target_job_duration <= 0):
+        errors.append("- Target job duration must be a number of seconds " +
+                      f"above zero, found {target_job_duration}")
+    return errors
+
+
+def validate_dependency_database_mode(shared_args):
+    """ Ensure the optional 'dependency_database_mode' value, where given,
+    names one of the supported dependency database modes.
+
+    Parameters
+    ----------
+    shared_args : dict
+        Dictionary of the "shared_config" section of the config file
+
+    Returns
+    -------
+    List
+        Errors where relevant, or empty if none found
+    """
+
+    errors = []
+
+    dependency_database_mode = shared_args.get('dependency_database_mode')
+    if dependency_database_mode is not None and \
+            dependency_database_mode not in DEPENDENCY_DATABASE_MODES:
+        errors.append("- Invalid dependency database mode " +
+                      f"'{dependency_database_mode}', " +
+                      f"must be one of {DEPENDENCY_DATABASE_MODES}")
+    return errors
+
+
+def validate_dependency_store(shared_args):
+    """ Ensure the optional 'dependency_store' value, where given, names one
+    of the supported dependency stores, and that the 'shared_memory' store
+    is only chosen where the multiprocessing.shared_memory module is
+    available.
+
+    Parameters
+    ----------
+    shared_args : dict
+        Dictionary of the "shared_config" section of the config file
+
+    Returns
+    -------
+    List
+        Errors where relevant, or empty if none found
+    """
+
+    errors = []
+
+    dependency_store = shared_args.get('dependency_store')
+    if dependency_store is not None and \
+            dependency_store not in DEPENDENCY_STORES:
+        errors.append("- Invalid dependency store " +
+                      f"'{dependency_store}', " +
+                      f"must be one of {DEPENDENCY_STORES}")
+    elif dependency_store == 'shared_memory' and \
+            not is_shared_memory_available():
+        errors.append("- The 'shared_memory' dependency store requires " +
+                      "Python 3.8+")
+    return errors
+
+
+def validate_timestamps(shared_args):
+    """ Ensure the optional 'timestamps' value, where given, names one of
+    the supported timestamp modes.
+
+    Parameters
+    ----------
+    shared_args : dict
+        Dictionary of the "shared_config" section of the config file
+
+    Returns
+    -------
+    List
+        Errors where relevant, or empty if none found
+    """
+
+    errors = []
+
+    timestamps = shared_args.get('timestamps')
+    if timestamps is not None and timestamps not in TIMESTAMP_MODES:
+        errors.append(f"- Invalid timestamp mode '{timestamps}', " +
+                      f"must be one of {TIMESTAMP_MODES}")
+    return errors
+
+
+def validate_max_records_per_chunk(shared_args):
+    """ Ensure the optional 'max_records_per_chunk' value, where given, is a
+    whole number above zero.
+
+    Parameters
+    ----------
+    shared_args : dict
+        Dictionary of the "shared_config" section of the config file
+
+    Returns
+    -------
+    List
+        Errors where relevant, or empty if none found
+    """
+
+    errors = []
+
+    max_records_per_chunk = shared_args.get('max_records_per_chunk')
+    if max_records_per_chunk is not None and \
+            (not isinstance(max_records_per_chunk, int)
+             or max_records_per_chunk <= 0):
+        errors.append("- Max records per chunk must be a whole number " +
+                      f"above zero, found {max_records_per_chunk}")
+    return errors
+
+
 def validate_google_drive_flag(factory_definitions):
     """ Ensure the google drive flag for each domain object is valid
     (either 'true' or 'false').
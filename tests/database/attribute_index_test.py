@@ -0,0 +1,109 @@
+import sys
+from collections import Counter
+
+import numpy as np
+
+sys.path.insert(0, 'src/')
+from database.attribute_index import AttributeIndex
+from database.shared_memory_store import SharedMemoryStore
+
+ACCOUNTS = [
+    {'account_id': 'A0', 'account_type': 'Client'},
+    {'account_id': 'A1', 'account_type': 'Firm'},
+    {'account_id': 'A2', 'account_type': 'Client'},
+    {'account_id': 'A3', 'account_type': 'Depot'},
+    {'account_id': 'A4', 'account_type': 'Counterparty'}
+]
+
+
+def test_rows_have_valid_value():
+    """ Ensure only rows with one of the valid values are picked """
+    index = AttributeIndex(ACCOUNTS, 'account_type')
+
+    for _ in range(100):
+        row = index.get_random_row(['Client', 'Firm'])
+        assert row['account_type'] in ['Client', 'Firm']
+
+
+def test_every_valid_row_picked():
+    """ Ensure every row with a valid value can be picked, across buckets
+    of different sizes """
+    index = AttributeIndex(ACCOUNTS, 'account_type')
+    picked = Counter(
+        index.get_random_row(['Client', 'Firm'])['account_id']
+        for _ in range(3000)
+    )
+
+    assert sorted(picked) == ['A0', 'A1', 'A2']
+    assert all(count > 800 for count in picked.values())
+
+
+def test_no_valid_rows():
+    """ Ensure None is returned where no row has a valid value """
+    index = AttributeIndex(ACCOUNTS, 'account_type')
+    assert index.get_random_row(['Unknown']) is None
+
+
+def test_snapshot_rows_picked(tmp_path, monkeypatch):
+    """ Ensure the rows of a table snapshot are bucketed and picked as those
+    of a list """
+    monkeypatch.chdir(tmp_path)
+    store = SharedMemoryStore()
+    store.persist_batch('accounts', [
+        [account['account_id'], account['account_type'], 'GB00']
+        for account in ACCOUNTS
+    ])
+    store.commit_changes()
+
+    index = AttributeIndex(store.get_snapshot('accounts'), 'account_type')
+    picked = Counter(
+        index.get_random_row(['Client', 'Firm'])['account_id']
+        for _ in range(300)
+    )
+
+    assert sorted(picked) == ['A0', 'A1', 'A2']
+    assert index.get_random_row(['Unknown']) is None
+    store.close_connection()
+
+
+def test_many_rows_picked():
+    """ Ensure rows picked at once all have a valid value, and every valid
+    row can be picked """
+    index = AttributeIndex(ACCOUNTS, 'account_type')
+    rows = index.get_random_rows(
+        ['Client', 'Firm'], 3000, np.random.default_rng()
+    )
+
+    assert len(rows) == 3000
+    picked = Counter(row['account_id'] for row in rows)
+    assert sorted(picked) == ['A0', 'A1', 'A2']
+    assert all(count > 800 for count in picked.values())
+    assert index.get_random_rows(
+        ['Unknown'], 2, np.random.default_rng()
+    ) == [None, None]
+
+
+class StubGenerator:
+    """ Random generator drawing bounded integers only, returning the given
+    positions """
+
+    def __init__(self, positions):
+        self.positions = positions
+        self.draws = []
+
+    def integers(self, low, high, size):
+        self.draws.append((low, high, size))
+        return np.array(self.positions)
+
+
+def test_many_rows_drawn_as_bounded_integers():
+    """ Ensure the positions of rows picked at once are drawn as bounded
+    integers across the rows with a valid value, rather than scaled from
+    floats """
+    index = AttributeIndex(ACCOUNTS, 'account_type')
+    random_generator = StubGenerator([2, 0, 1])
+
+    rows = index.get_random_rows(['Client', 'Firm'], 3, random_generator)
+
+    assert random_generator.draws == [(0, 3, 3)]
+    assert sorted(row['account_id'] for row in rows) == ['A0', 'A1', 'A2']
@@ -0,0 +1,66 @@
+import sys
+
+sys.path.insert(0, 'src/')
+from database.dependency_fingerprints import get_fingerprints, \
+    get_reusable_domain_objects
+
+
+def factory_definition(domain_object, record_count, file_name):
+    return {domain_object: {'fixed_args': {'record_count': record_count},
+                            'file_name': file_name}}
+
+
+def factory_definitions_by_name(instrument_count=10, file_name='out'):
+    return {
+        'instrument': factory_definition(
+            'instrument', instrument_count, file_name
+        ),
+        'account': factory_definition('account', 10, file_name),
+        'trade': factory_definition('trade', 10, file_name)
+    }
+
+
+def test_only_persisting_domain_objects_fingerprinted():
+    """ Ensure fingerprints are only given to domain objects persisting
+    records to the dependency database """
+    fingerprints = get_fingerprints(factory_definitions_by_name(), {})
+
+    assert sorted(fingerprints) == ['account', 'instrument']
+
+
+def test_output_keys_ignored():
+    """ Ensure keys only affecting output files leave fingerprints
+    unchanged, while other keys change them """
+    fingerprints = get_fingerprints(factory_definitions_by_name(), {})
+
+    assert get_fingerprints(
+        factory_definitions_by_name(file_name='other'), {}
+    ) == fingerprints
+    assert get_fingerprints(
+        factory_definitions_by_name(instrument_count=20), {}
+    )['instrument'] != fingerprints['instrument']
+
+
+def test_dependency_fingerprints_included():
+    """ Ensure a domain object's fingerprint changes with that of a domain
+    object it depends on, read from the recorded fingerprints where the
+    latter is not in the config """
+    definitions = {
+        'swap_contract': factory_definition('swap_contract', 10, 'out')
+    }
+
+    first = get_fingerprints(definitions, {'counterparty': 'a'})
+    second = get_fingerprints(definitions, {'counterparty': 'b'})
+
+    assert first['swap_contract'] != second['swap_contract']
+
+
+def test_reusable_domain_objects():
+    """ Ensure only domain objects whose fingerprints match those recorded
+    are reusable """
+    fingerprints = {'instrument': 'a', 'account': 'b', 'counterparty': 'c'}
+    recorded_fingerprints = {'instrument': 'a', 'account': 'x'}
+
+    assert get_reusable_domain_objects(
+        fingerprints, recorded_fingerprints
+    ) == ['instrument']
@@ -0,0 +1,54 @@
+import sys
+
+sys.path.insert(0, 'src/')
+from database import reference_table_cache
+from database.reference_table_cache import ReferenceTableCache
+
+
+class StubDatabase:
+    """ Database counting the number of times each table is read """
+
+    def __init__(self):
+        self.reads = {}
+
+    def retrieve(self, table_name):
+        self.reads[table_name] = self.reads.get(table_name, 0) + 1
+        return [table_name]
+
+
+def test_table_read_once():
+    """ Ensure each table is read from the database only once """
+    cache, database = ReferenceTableCache(), StubDatabase()
+
+    for _ in range(3):
+        assert cache.get_table('instruments', database) == ['instruments']
+    cache.get_table('accounts', database)
+
+    assert database.reads == {'instruments': 1, 'accounts': 1}
+
+
+def test_attribute_index_built_once():
+    """ Ensure a table is indexed by an attribute once, from the cached
+    table """
+    cache, database = ReferenceTableCache(), StubDatabase()
+    database.retrieve = lambda table_name: [
+        {'account_id': 'A0', 'account_type': 'Client'}
+    ]
+
+    index = cache.get_attribute_index('accounts', 'account_type', database)
+
+    assert cache.get_attribute_index(
+        'accounts', 'account_type', database) is index
+    assert index.get_random_row(['Client'])['account_id'] == 'A0'
+
+
+def test_snapshot_tables_read_without_shared_memory(monkeypatch):
+    """ Ensure snapshot tables are read from the database where shared memory
+    is unavailable, without opening a shared memory store """
+    monkeypatch.setattr(reference_table_cache, 'is_shared_memory_available',
+                        lambda: False)
+    monkeypatch.setattr(reference_table_cache, 'SharedMemoryStore', None)
+    cache, database = ReferenceTableCache(), StubDatabase()
+
+    assert cache.get_table('instruments', database) == ['instruments']
+    assert database.reads == {'instruments': 1}
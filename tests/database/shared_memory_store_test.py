@@ -0,0 +1,113 @@
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, 'src/')
+from database.dependency_store import DEPENDENCY_TABLES
+from database.shared_memory_store import SharedMemoryStore
+
+ACCOUNTS = [['1', 'Client', 'GB01'],
+            ['2', 'Firm', 'GB02'],
+            ['3', 'Client', 'GB03'],
+            ['4', 'Client', 'GB04']]
+
+
+@pytest.fixture
+def stores(tmp_path, monkeypatch):
+    """ A store persisting records, as the dependency writer process does,
+    and a store reading them, as a create child process does, each named
+    after a directory of their own """
+    monkeypatch.chdir(tmp_path)
+    writer, reader = SharedMemoryStore(), SharedMemoryStore()
+    yield writer, reader
+    reader.close_connection()
+    writer.close_connection()
+    for table_name in DEPENDENCY_TABLES:
+        writer.drop_table(table_name)
+
+
+def test_records_read_once_committed(stores):
+    """ Ensure records persisted by one store are read by another, in the
+    order they were persisted, only once committed """
+    writer, reader = stores
+    writer.persist_batch('accounts', ACCOUNTS[:2])
+    writer.persist_batch('accounts', ACCOUNTS[2:])
+
+    assert reader.retrieve('accounts') == []
+    assert reader.get_table_size('accounts') is None
+
+    writer.commit_changes()
+
+    assert [list(row.values()) for row in reader.retrieve('accounts')] == \
+        ACCOUNTS
+    assert reader.retrieve('accounts')[1] == \
+        {'account_id': '2', 'account_type': 'Firm', 'iban': 'GB02'}
+    assert reader.get_table_size('accounts') == 4
+
+
+def test_batch_and_column_retrieved(stores):
+    """ Ensure a batch of records is sliced from a table, running short at
+    the end of the table, and a column is read whole """
+    writer, reader = stores
+    writer.persist_batch('accounts', ACCOUNTS)
+    writer.commit_changes()
+
+    assert [row['account_id'] for row in
+            reader.retrieve_batch('accounts', 2, 1)] == ['2', '3']
+    assert [row['account_id'] for row in
+            reader.retrieve_batch('accounts', 2, 3)] == ['4']
+    assert reader.retrieve_column_as_list('accounts', 'ACCOUNT_TYPE') == \
+        ['Client', 'Firm', 'Client', 'Client']
+
+
+def test_row_with_valid_attribute(stores):
+    """ Ensure only records with a valid value are picked, and None where
+    there are none """
+    writer, reader = stores
+    writer.persist_batch('accounts', ACCOUNTS)
+    writer.commit_changes()
+
+    for _ in range(20):
+        row = reader.retrieve_row_with_valid_attribute(
+            'accounts', 'account_type', ['Firm', 'Other']
+        )
+        assert row['account_id'] == '2'
+    assert reader.retrieve_row_with_valid_attribute(
+        'accounts', 'account_type', ['Other']) is None
+
+
+def test_republished_table_replaces_earlier(stores):
+    """ Ensure records persisted after a commit are read with the earlier
+    ones once committed again, and none once the table is dropped """
+    writer, reader = stores
+    writer.persist_batch('accounts', ACCOUNTS[:1])
+    writer.commit_changes()
+    assert reader.get_table_size('accounts') == 1
+
+    writer.persist_batch('accounts', ACCOUNTS[1:])
+    writer.commit_changes()
+    assert SharedMemoryStore().get_table_size('accounts') == 4
+
+    writer.drop_table('accounts')
+    assert SharedMemoryStore().retrieve('accounts') == []
+
+
+def test_snapshot_read_in_place(stores):
+    """ Ensure a snapshot decodes records by position, is sampled as a
+    sequence, and groups positions by value """
+    writer, reader = stores
+    writer.persist_batch('accounts', ACCOUNTS)
+    writer.commit_changes()
+
+    snapshot = reader.get_snapshot('accounts')
+
+    assert len(snapshot) == 4
+    assert snapshot[-1] == \
+        {'account_id': '4', 'account_type': 'Client', 'iban': 'GB04'}
+    assert random.choice(snapshot) in reader.retrieve('accounts')
+    assert {value: positions.tolist() for value, positions in
+            snapshot.get_positions_by_value('account_type').items()} == \
+        {'Client': [0, 2, 3], 'Firm': [1]}
+    with pytest.raises(IndexError):
+        snapshot[4]
@@ -3,6 +3,8 @@ import sys
 sys.path.insert(0, 'tests/')
 from utils import helper_methods as helper
 from utils import shared_tests as shared
+sys.path.insert(0, 'src/')
+from database.sqlite_database import Sqlite_Database
 
 
 def test_populate_exchange_table():
@@ -75,17 +77,34 @@ def test_persist_batch():
     helper.drop_test_table(database, table_name)
 
 
-def test_format_list_for_insertion():
-    """ Test that a list for insertion is correctly formatted ready for the
-    SQL insert query """
+def test_persist_batch_binds_values():
+    """ Test that the persist batch method inserts values containing quotes
+    unchanged, in a single transaction left to the caller to commit """
 
+    table_name = "test_instruments"
+    table_def = {"ric": "text",
+                 "cusip": "text",
+                 "isin": "text"}
+
+    helper.delete_local_database_files()
     database = helper.create_db()
+    try:
+        helper.create_test_table(database, table_name, table_def)
+        database.commit_changes()
+
+        instrument_list = [[f"ric'{i}", 'cusip"', 'TEST_ISIN']
+                           for i in range(1000)]
 
-    instrument = ['ric', 'cusip', 'TEST_ISIN']
-    expecetd_string = "('ric','cusip','TEST_ISIN')"
+        database.persist_batch(table_name, instrument_list)
+        rows = [[row['ric'], row['cusip'], row['isin']]
+                for row in database.retrieve(table_name)]
+        shared.expected_value(instrument_list, rows)
 
-    formated_string = database.format_list_for_insertion(instrument)
-    shared.expected_value(expecetd_string, formated_string)
+        database.get_connection().rollback()
+        shared.expected_value([], database.retrieve(table_name))
+    finally:
+        database.close_connection()
+        helper.delete_local_database_files()
 
 
 def test_retrieve():
@@ -213,6 +232,35 @@ def test_retrieve_batch():
     helper.drop_test_table(database, table_name)
 
 
+def test_retrieve_batch_at_end_of_table():
+    """ Test that a batch running past the last record of a table only holds
+    the remaining records """
+
+    table_name = "test_instruments"
+    table_def = {"ric": "text",
+                 "cusip": "text",
+                 "isin": "text"}
+
+    helper.delete_local_database_files()
+    database = helper.create_db()
+    try:
+        helper.create_test_table(database, table_name, table_def)
+
+        database.persist_batch(
+            table_name,
+            [['ric' + str(i), 'cusip' + str(i), 'TEST_ISIN']
+             for i in range(5)]
+        )
+
+        database_rows = database.retrieve_batch(table_name, 3, 3)
+        rows = [row['ric'] for row in database_rows]
+
+        shared.expected_value(['ric3', 'ric4'], rows)
+    finally:
+        database.close_connection()
+        helper.delete_local_database_files()
+
+
 def test_retrieve_sample():
     """ Test that the desired number of records in a table are retrieved when
     using the retrieve sample method """
@@ -379,3 +427,28 @@ def test_create_table_from_dict():
 
     # table has the correct rows
     shared.expected_value(expected_rows, rows)
+
+
+def test_fingerprint_modes_recorded():
+    """ Test that the dependency database mode of the connection recording a
+    fingerprint is recorded along with it, and replaced with it """
+
+    helper.delete_local_database_files()
+    database = helper.create_db()
+    try:
+        database.record_fingerprint('instrument', 'a')
+        database.record_fingerprint('account', 'b')
+        database.commit_changes()
+        database.close_connection()
+
+        database = Sqlite_Database('fast')
+        database.record_fingerprint('account', 'c')
+        database.commit_changes()
+
+        shared.expected_value({'instrument': 'safe', 'account': 'fast'},
+                              database.retrieve_fingerprint_modes())
+        shared.expected_value({'instrument': 'a', 'account': 'c'},
+                              database.retrieve_fingerprints())
+    finally:
+        database.close_connection()
+        helper.delete_local_database_files()
@@ -0,0 +1,37 @@
+import sys
+
+sys.path.insert(0, 'src/')
+from database.static_reference_data import StaticReferenceData
+
+
+def test_exchange_rows_keyed_by_column():
+    """ Ensure exchange rows are read from their CSV file keyed by the lower
+    case names of the exchanges table columns """
+    reference_data = StaticReferenceData()
+    row = reference_data.get_random_row('exchanges')
+
+    assert sorted(row.keys()) == \
+        ['country_of_issuance', 'currency', 'exchange_code']
+    assert row in reference_data.get_rows('exchanges')
+
+
+def test_column_matches_rows():
+    """ Ensure a column holds the value of that column in every row """
+    reference_data = StaticReferenceData()
+    symbols = reference_data.get_column('tickers', 'Symbol')
+
+    assert symbols == [row['symbol']
+                       for row in reference_data.get_rows('tickers')]
+    assert reference_data.get_value_lists('tickers') == \
+        [[symbol] for symbol in symbols]
+
+
+def test_invalidate_rereads_tables():
+    """ Ensure tables are read again once invalidated """
+    reference_data = StaticReferenceData()
+    rows = reference_data.get_rows('exchanges')
+
+    assert reference_data.get_rows('exchanges') is rows
+    reference_data.invalidate()
+    assert reference_data.get_rows('exchanges') is not rows
+    assert reference_data.get_rows('exchanges') == rows
@@ -0,0 +1,192 @@
+import string
+from datetime import timedelta, timezone
+import sys
+
+sys.path.insert(0, 'src/')
+from domainobjectfactories.trade_factory import TradeFactory
+
+DUMMY_FIELD_CONFIG = {
+    'file_type_args': {'xml_item_name': 'trade'},
+    'dummy_fields': [
+        {'data_type': 'string', 'data_length': 6, 'field_count': 2},
+        {'data_type': 'numeric', 'data_length': 4, 'field_count': 0},
+        {'data_type': 'numeric', 'data_length': 3, 'field_count': 1}
+    ]
+}
+
+
+def test_random_strings():
+    """ Ensure random strings are of the given length, drawn only from the
+    characters asked for """
+    factory = TradeFactory(None, None)
+
+    strings = factory.random_strings(500, 8)
+    digits = factory.random_strings(500, 5, include_letters=False)
+
+    assert len(strings) == 500
+    assert all(isinstance(value, str) and len(value) == 8
+               for value in strings)
+    assert set(''.join(strings)) <= \
+        set(string.ascii_uppercase + string.digits)
+    assert set(''.join(digits)) <= set(string.digits)
+    assert factory.random_strings(3, 0) == ['', '', '']
+
+
+def test_random_ints():
+    """ Ensure random integers lie within the given range, both ends of
+    which can be drawn, or are of the given length """
+    factory = TradeFactory(None, None)
+
+    values = factory.random_ints(2000, 1, 3)
+    lengths = factory.random_ints(500, length=10)
+
+    assert all(isinstance(value, int) for value in values)
+    assert set(values) == {1, 2, 3}
+    assert all(len(str(value)) == 10 for value in lengths)
+
+
+def test_random_ints_beyond_64_bits():
+    """ Ensure integers of 19 or more digits, whose range is beyond 64-bit
+    integers, are of the given length """
+    factory = TradeFactory(None, None)
+
+    for length in (18, 19, 20, 30):
+        values = factory.random_ints(200, length=length)
+        assert all(isinstance(value, int) and len(str(value)) == length
+                   for value in values)
+
+    values = factory.random_ints(200, -2 ** 70, 2 ** 70)
+    assert all(-2 ** 70 <= value <= 2 ** 70 for value in values)
+
+
+def test_random_decimals():
+    """ Ensure random decimals lie within the given range to the given
+    number of decimal places """
+    factory = TradeFactory(None, None)
+
+    values = factory.random_decimals(500, 1, 10, dp=2)
+
+    assert all(1 <= value <= 10 for value in values)
+    assert all(round(value, 2) == value for value in values)
+
+
+def test_choices():
+    """ Ensure choices are drawn from the given values, each of which can
+    be drawn """
+    factory = TradeFactory(None, None)
+
+    values = factory.choices(1000, [True, False, 'EMPTY'])
+
+    assert len(values) == 1000
+    assert set(values) == {True, False, 'EMPTY'}
+
+
+def test_dummy_field_columns():
+    """ Ensure a column is created for every dummy field, named as by the
+    dummy field generator """
+    factory = TradeFactory(DUMMY_FIELD_CONFIG, None)
+
+    columns = factory.create_dummy_field_columns(20)
+
+    assert list(columns) == ['trade_field1', 'trade_field2', 'trade_field3']
+    assert [key for key, _ in factory.create_dummy_field_generator()] == \
+        list(columns)
+    assert all(len(column) == 20 for column in columns.values())
+    assert all(len(value) == 6 for value in columns['trade_field2'])
+    assert all(100 <= value <= 999 for value in columns['trade_field3'])
+
+
+
+def test_long_numeric_dummy_fields():
+    """ Ensure numeric dummy fields of 20 or more digits are created, both
+    as columns and record by record """
+    config = {
+        'file_type_args': {'xml_item_name': 'trade'},
+        'dummy_fields': [
+            {'data_type': 'numeric', 'data_length': 20, 'field_count': 1},
+            {'data_type': 'numeric', 'data_length': 32, 'field_count': 1}
+        ]
+    }
+    factory = TradeFactory(config, None)
+
+    columns = factory.create_dummy_field_columns(50)
+    record = dict(factory.create_dummy_field_generator())
+
+    assert all(len(str(value)) == 20 for value in columns['trade_field1'])
+    assert all(len(str(value)) == 32 for value in columns['trade_field2'])
+    assert [len(str(record[name])) for name in columns] == [20, 32]
+
+
+def test_dummy_field_plan():
+    """ Ensure dummy fields of the same data type and length are grouped
+    together, whichever specification of the config they come from """
+    config = {
+        'file_type_args': {'xml_item_name': 'trade'},
+        'dummy_fields': DUMMY_FIELD_CONFIG['dummy_fields'] + [
+            {'data_type': 'string', 'data_length': 6, 'field_count': 1}
+        ]
+    }
+    factory = TradeFactory(config, None)
+
+    assert factory.get_dummy_field_plan() == [
+        ('string', 6, ['trade_field1', 'trade_field2', 'trade_field4']),
+        ('numeric', 3, ['trade_field3'])
+    ]
+    assert factory.get_dummy_field_names() == \
+        ('trade_field1', 'trade_field2', 'trade_field3', 'trade_field4')
+    assert list(factory.create_dummy_field_columns(5)) == \
+        list(factory.get_dummy_field_names())
+
+
+def test_dummy_field_generator_draws_in_bulk():
+    """ Ensure the dummy fields of a record are taken from rows drawn for
+    many records at once """
+    factory = TradeFactory(DUMMY_FIELD_CONFIG, None)
+    draws = []
+    create_dummy_field_columns = factory.create_dummy_field_columns
+
+    def count_draws(number_of_values):
+        draws.append(number_of_values)
+        return create_dummy_field_columns(number_of_values)
+
+    factory.create_dummy_field_columns = count_draws
+    records = [dict(factory.create_dummy_field_generator())
+               for _ in range(TradeFactory.DUMMY_FIELD_ROWS_PER_DRAW + 1)]
+
+    assert draws == [TradeFactory.DUMMY_FIELD_ROWS_PER_DRAW] * 2
+    assert all(list(record) == ['trade_field1', 'trade_field2',
+                                'trade_field3'] for record in records)
+    assert all(100 <= record['trade_field3'] <= 999 for record in records)
+    assert list(TradeFactory(None, None).create_dummy_field_generator()) \
+        == []
+
+
+def test_job_clock_per_job_timestamps():
+    """ Ensure every record of a job is timestamped with the time the job
+    started, and dates are relative to the day it started """
+    factory = TradeFactory(None, None)
+    factory.start_job_clock()
+    job_clock = factory.get_job_clock()
+
+    assert job_clock.get_timestamps(3) == [job_clock.now] * 3
+    assert job_clock.get_timestamp() == job_clock.now
+    assert job_clock.now.tzinfo == timezone.utc
+    assert job_clock.get_date(2) - job_clock.today == timedelta(days=2)
+    assert factory.create_knowledge_date() == job_clock.today
+
+
+def test_job_clock_monotonic_timestamps():
+    """ Ensure monotonic timestamps of a job are distinct and increasing,
+    and a new job's clock is started afresh """
+    factory = TradeFactory(None, {'timestamps': 'monotonic'})
+    job_clock = factory.get_job_clock()
+
+    timestamps = job_clock.get_timestamps(3) + [job_clock.get_timestamp()]
+
+    assert timestamps[0] == job_clock.now
+    assert all(earlier < later
+               for earlier, later in zip(timestamps, timestamps[1:]))
+
+    factory.start_job_clock()
+    assert factory.get_job_clock() is not job_clock
+    assert factory.get_job_clock().get_timestamp() >= job_clock.now
@@ -0,0 +1,54 @@
+import re
+import sys
+
+import numpy as np
+
+sys.path.insert(0, 'src/')
+from domainobjectfactories import identifiers
+
+
+def test_check_digits_of_real_identifiers():
+    """ Ensure the check digits of published identifiers are computed """
+    assert identifiers.get_cusip_check_digits(['03783310', '59491810']) == \
+        ['0', '4']
+    assert identifiers.get_isin_check_digits(
+        ['US037833100', 'GB000263494', 'AU0000XVGZA']
+    ) == ['5', '6', '3']
+    assert identifiers.get_sedol_check_digits(['204625', 'B0YBKJ']) == \
+        ['1', '7']
+    assert identifiers.get_figi_check_digits(
+        ['BBG000BLNNH', 'BBG000B9XRY']
+    ) == ['6', '4']
+
+
+def test_figi_prefixes():
+    """ Ensure every pair of consonants may prefix a FIGI, other than those
+    the standard reserves """
+    assert len(identifiers.FIGI_PREFIXES) == 21 * 21 - 7
+    assert 'BB' in identifiers.FIGI_PREFIXES
+    assert not set(identifiers.FIGI_INVALID_PREFIXES) & \
+        set(identifiers.FIGI_PREFIXES)
+
+
+def test_created_identifiers():
+    """ Ensure identifiers are created in the format of their scheme,
+    ending in their check digit """
+    random_generator = np.random.default_rng()
+
+    cusips = identifiers.create_cusips(200, random_generator)
+    isins = identifiers.create_isins(['US'] * 200, cusips)
+    sedols = identifiers.create_sedols(200, random_generator)
+    figis = identifiers.create_figis(200, random_generator)
+
+    assert all(re.match('^[0-9]{9}$', cusip) for cusip in cusips)
+    assert [cusip[8] for cusip in cusips] == \
+        identifiers.get_cusip_check_digits([cusip[:8] for cusip in cusips])
+    assert [isin[:11] for isin in isins] == ['US' + cusip for cusip in cusips]
+    assert [isin[11] for isin in isins] == \
+        identifiers.get_isin_check_digits([isin[:11] for isin in isins])
+    assert [sedol[6] for sedol in sedols] == \
+        identifiers.get_sedol_check_digits([sedol[:6] for sedol in sedols])
+    assert all(figi[:2] in identifiers.FIGI_PREFIXES and figi[2] == 'G'
+               for figi in figis)
+    assert [figi[11] for figi in figis] == \
+        identifiers.get_figi_check_digits([figi[:11] for figi in figis])
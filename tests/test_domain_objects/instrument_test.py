@@ -4,6 +4,7 @@ import re
 sys.path.insert(0, 'tests/')
 from utils import shared_tests as shared
 from utils import helper_methods as helper
+from domainobjectfactories import identifiers
 
 
 def test_instruments():
@@ -32,9 +33,11 @@ def test_instruments():
 
 
 def sedol_valid(record):
-    """ SEDOLs must both: be integers, and of length 7 """
+    """ SEDOLs must be 6 digits or consonants followed by their check
+    digit """
     sedol = record['sedol']
-    assert shared.is_int(sedol) and shared.is_length(7, sedol)
+    assert re.match('^[0-9BCDFGHJKLMNPQRSTVWXYZ]{6}[0-9]$', sedol)
+    assert sedol[6] == identifiers.get_sedol_check_digits([sedol[:6]])[0]
 
 
 def ticker_valid(record):
@@ -115,14 +118,16 @@ def figi_valid(record):
     assert figi[2] == 'G'
 
     consonants = ['B', 'C', 'D', 'F', 'G', 'H', 'J', 'K', 'L', 'M', 'N',
-                  'P', 'Q', 'R', 'S', 'T', 'U', 'V', 'W', 'Y', 'Z']
-    consonants_and_numbers = consonants + ['1', '2', '3', '4', '5', '6',
+                  'P', 'Q', 'R', 'S', 'T', 'V', 'W', 'X', 'Y', 'Z']
+    consonants_and_numbers = consonants + ['0', '1', '2', '3', '4', '5', '6',
                                            '7', '8', '9']
 
-    for char in figi[3:10]:
+    assert figi[0] in consonants and figi[1] in consonants
+
+    for char in figi[3:11]:
         assert char in consonants_and_numbers
 
-    assert figi[11].isdigit()
+    assert figi[11] == identifiers.get_figi_check_digits([figi[:11]])[0]
 
 
 def issuer_name_valid(record):
@@ -46,8 +46,13 @@ def function_valid(record):
 
 
 def linked_message_valid(record):
-    assert (re.match('^[A-Z0-9]{10}[0-9]+$', record['message_reference']) or
-            record['message_reference'] == 'EMPTY')
+    """ Ensure a linked message is EMPTY, or the message reference of an
+    earlier id of the same run """
+    linked_message = record['linked_message']
+    if linked_message != 'EMPTY':
+        message_reference = record['message_reference']
+        assert linked_message[:10] == message_reference[:10]
+        assert int(linked_message[10:]) < int(message_reference[10:])
 
 
 def linkage_type_valid(record):
@@ -111,3 +116,21 @@ def valid_instruction_type(record):
 
 def valid_status(record):
     assert record['status'] in ['MATCHED', 'UNMATCHED']
+
+
+def test_linked_messages_across_jobs():
+    """ Ensure the jobs of a factory share the beginning of their message
+    references, so that a job links to messages created by earlier jobs """
+    _, domain_obj = helper.set_up_settlement_instruction_tests()
+    first_job = domain_obj.create(50, 0)
+    later_job = domain_obj.create(50, 1000)
+
+    assert {record['message_reference'][:10]
+            for record in first_job + later_job} == \
+        {domain_obj.message_reference_beginning}
+
+    linked_ids = [int(record['linked_message'][10:]) for record in later_job
+                  if record['linked_message'] != 'EMPTY']
+    assert any(linked_id < 1000 for linked_id in linked_ids)
+    for record in later_job:
+        linked_message_valid(record)
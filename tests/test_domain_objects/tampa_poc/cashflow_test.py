@@ -1,4 +1,5 @@
 import sys
+from datetime import datetime
 
 import pytest
 
@@ -6,6 +7,9 @@ sys.path.insert(0, 'tests/')
 from utils import shared_tests as shared
 from utils import helper_methods as helper
 
+sys.path.insert(0, 'src/')
+from domainobjectfactories.tampa_poc.cashflow_factory import CashflowFactory
+
 
 @pytest.mark.skip(reason="Object being tested belongs to Tampa PoC and is "
                          "not mentioned in the one-pager")
@@ -47,3 +51,45 @@ def cashflow_type_exists(record):
         cashflow_types.append(arg['cashFlowType'])
     cashflow_type = record['cashflow_type']
     assert cashflow_type in cashflow_types
+
+
+def test_calendar():
+    """ Ensure each date is added to the calendar once, with its quarter end
+    flag and the pay date of each pay date period """
+    factory = CashflowFactory(None, None)
+    factory.extend_calendar(['2020-06-30', '2020-02-10', '2020-06-30'])
+
+    assert factory.calendar == {
+        '2020-06-30': {
+            'effective_date': datetime(2020, 6, 30),
+            'is_quarter_end': True,
+            'pay_dates': {'END_OF_MONTH': '2020-06-30',
+                          'END_OF_HALF': '2020-06-30'}
+        },
+        '2020-02-10': {
+            'effective_date': datetime(2020, 2, 10),
+            'is_quarter_end': False,
+            'pay_dates': {'END_OF_MONTH': '2020-02-29',
+                          'END_OF_HALF': '2020-06-30'}
+        }
+    }
+
+
+def test_cashflow_dates_looked_up():
+    """ Ensure a cashflow takes its dates from the calendar, and quarterly
+    cashflows only accrue on quarter ends """
+    factory = CashflowFactory(None, None)
+    factory.extend_calendar(['2020-09-30', '2020-10-01'])
+    cf_arg = {'cashFlowType': 'INT', 'cashFlowAccrual': 'QUARTERLY',
+              'cashFlowAccrualProbability': 100,
+              'cashFlowPaydatePeriod': 'END_OF_HALF'}
+    swap_position = {'swap_contract_id': 1, 'ric': 'AAPL.OQ',
+                     'long_short': 'Long', 'effective_date': '2020-09-30'}
+
+    record = factory.create_record(swap_position, cf_arg)
+
+    assert record['effective_date'] == datetime(2020, 9, 30)
+    assert record['pay_date'] == '2020-12-31'
+    assert factory.create_record(
+        dict(swap_position, effective_date='2020-10-01'), cf_arg
+    ) is None
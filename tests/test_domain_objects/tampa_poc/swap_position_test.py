@@ -6,6 +6,10 @@ sys.path.insert(0, 'tests/')
 from utils import shared_tests as shared
 from utils import helper_methods as helper
 
+sys.path.insert(0, 'src/')
+from domainobjectfactories.tampa_poc.swap_position_factory import \
+    SwapPositionFactory
+
 
 @pytest.mark.skip(reason="Object being tested belongs to Tampa PoC and is "
                          "not mentioned in the one-pager")
@@ -39,3 +43,46 @@ def swap_position_quantity_valid(record):
         assert 1 <= quantity <= 10000
     else:
         assert -10000 <= quantity <= -1
+
+
+def get_chunking_factory(monkeypatch, shared_args):
+    """ Returns a swap position factory generating five positions, keeping
+    the number of positions generated when each persist happens """
+    factory = SwapPositionFactory(None, shared_args)
+    generated, persisted = [], []
+
+    def generate_records(record_count, start_id):
+        for position_id in range(5):
+            generated.append(position_id)
+            yield {'id': position_id}
+
+    monkeypatch.setattr(factory, 'generate_records', generate_records)
+    monkeypatch.setattr(factory, 'persist_records',
+                        lambda table_name: persisted.append(len(generated)))
+    return factory, generated, persisted
+
+
+def test_swap_positions_chunked(monkeypatch):
+    """ Ensure swap positions are generated lazily in chunks of at most the
+    maximum number of records per chunk, persisting each chunk before it is
+    yielded """
+    factory, generated, persisted = get_chunking_factory(
+        monkeypatch, {'max_records_per_chunk': 2}
+    )
+
+    chunks = factory.create_chunks(1, 0)
+    assert next(chunks) == [{'id': 0}, {'id': 1}]
+    assert generated == [0, 1] and persisted == [2]
+
+    assert [chunk for chunk in chunks] == [[{'id': 2}, {'id': 3}],
+                                           [{'id': 4}]]
+    assert persisted == [2, 4, 5]
+
+
+def test_swap_positions_unchunked(monkeypatch):
+    """ Ensure every swap position is created as one chunk where no maximum
+    number of records per chunk is set """
+    factory, _, persisted = get_chunking_factory(monkeypatch, {})
+
+    assert factory.create(1, 0) == [{'id': n} for n in range(5)]
+    assert persisted == [5]
@@ -0,0 +1,67 @@
+import sys
+import threading
+from queue import Queue
+
+sys.path.insert(0, 'src/')
+from multi_processing.creator import Creator
+from multi_processing.in_flight_limit import InFlightRecordLimit
+from multi_processing.record_batch import RecordBatch
+
+
+def start_forwarding(max_records_in_flight=None):
+    """ Returns a creator whose forwarding thread has been started, as by
+    its parent process in 'pipelined' execution mode """
+    creator = Creator(Queue(), Queue(), None, None, {}, 'pipelined',
+                      InFlightRecordLimit(max_records_in_flight))
+    creator.streamed_record_queue = Queue()
+    forwarding_thread = threading.Thread(
+        target=creator.forward_streamed_records
+    )
+    forwarding_thread.start()
+    return creator, forwarding_thread
+
+
+def stream_records(creator, first_id):
+    """ Streams a chunk of two trades, as a child create process would """
+    creator.streamed_record_queue.put({
+        'domain_object': 'trade',
+        'records': RecordBatch({'id': range(first_id, first_id + 2)})
+    })
+
+
+def test_streamed_records_forwarded_before_drain():
+    """ Ensure every streamed chunk is forwarded onto the created record
+    queue, in order, by the time a drain returns """
+    creator, forwarding_thread = start_forwarding()
+
+    stream_records(creator, 0)
+    stream_records(creator, 2)
+    creator.drain_streamed_records()
+
+    forwarded = [creator.created_record_queue.get_nowait()
+                 for _ in range(2)]
+    assert [message['records'].get_column('id') for message in forwarded] \
+        == [[0, 1], [2, 3]]
+
+    creator.streamed_record_queue.put("terminate")
+    forwarding_thread.join()
+
+
+def test_streamed_records_held_at_in_flight_cap():
+    """ Ensure a streamed chunk is held back while the records in flight are
+    at their cap, and forwarded once the writers catch up """
+    creator, forwarding_thread = start_forwarding(max_records_in_flight=2)
+
+    stream_records(creator, 0)
+    stream_records(creator, 2)
+    first = creator.created_record_queue.get(timeout=5)
+    forwarding_thread.join(timeout=0.1)
+    assert creator.created_record_queue.empty()
+
+    creator.in_flight_limit.remove_records(len(first['records']))
+    creator.drain_streamed_records()
+    assert creator.created_record_queue.get_nowait()['records'] \
+        .get_column('id') == [2, 3]
+
+    creator.streamed_record_queue.put("terminate")
+    forwarding_thread.join()
@@ -0,0 +1,88 @@
+import sys
+from queue import Queue
+
+sys.path.insert(0, 'src/')
+from multi_processing.dependency_writer import DependencyWriter
+
+
+class StubDatabase:
+    """ Database recording the batches persisted to it """
+
+    def __init__(self):
+        self.persisted = []
+        self.fingerprints = {}
+
+    def persist_batch(self, table_name, value_lists):
+        self.persisted.append((table_name, value_lists))
+
+    def record_fingerprint(self, domain_object, fingerprint):
+        self.fingerprints[domain_object] = fingerprint
+
+
+def test_records_persisted():
+    """ Ensure the value lists of a dequeued item are persisted to their
+    table, and nothing is to be acknowledged """
+    writer, database = DependencyWriter(Queue(), Queue(), {}), \
+        StubDatabase()
+
+    flushed = writer.handle_dequeued_item(
+        {'table_name': 'accounts', 'value_lists': [['1', 'Client']]},
+        database
+    )
+
+    assert flushed == []
+    assert database.persisted == [('accounts', [['1', 'Client']])]
+
+
+def test_flush_returned_for_acknowledgement():
+    """ Ensure a flush message is returned to be acknowledged, without
+    persisting anything """
+    writer, database = DependencyWriter(Queue(), Queue(), {}), \
+        StubDatabase()
+
+    flushed = writer.handle_dequeued_item({'flush': 'instrument'}, database)
+
+    assert flushed == ['instrument']
+    assert database.persisted == []
+    assert not writer.terminate_dequeued
+
+
+def test_fingerprint_recorded_on_flush():
+    """ Ensure the fingerprint of a flushed domain object is recorded, and
+    nothing is recorded for domain objects without one """
+    writer, database = DependencyWriter(
+        Queue(), Queue(), {}, {'instrument': 'abc'}
+    ), StubDatabase()
+
+    writer.handle_dequeued_item({'flush': 'instrument'}, database)
+    writer.handle_dequeued_item({'flush': 'trade'}, database)
+
+    assert database.fingerprints == {'instrument': 'abc'}
+
+
+def test_terminate_dequeued():
+    """ Ensure the terminate flag is recorded """
+    writer, database = DependencyWriter(Queue(), Queue(), {}), \
+        StubDatabase()
+
+    assert writer.handle_dequeued_item("terminate", database) == []
+    assert writer.terminate_dequeued
+
+
+def test_snapshot_tables_published():
+    """ Ensure records of snapshot tables, and only those, are also
+    persisted to the snapshot store """
+    writer, database, snapshot_store = \
+        DependencyWriter(Queue(), Queue(), {}), StubDatabase(), StubDatabase()
+    writer.snapshot_store = snapshot_store
+
+    writer.handle_dequeued_item(
+        {'table_name': 'accounts', 'value_lists': [['1', 'Client']]},
+        database
+    )
+    writer.handle_dequeued_item(
+        {'table_name': 'swap_contracts', 'value_lists': [['1']]}, database
+    )
+
+    assert len(database.persisted) == 2
+    assert snapshot_store.persisted == [('accounts', [['1', 'Client']])]
@@ -0,0 +1,48 @@
+import sys
+
+sys.path.insert(0, 'src/')
+from multi_processing.job_sizing import JobSizeTuner, MAX_JOB_PAYLOAD_BYTES
+
+
+def test_initial_job_size():
+    """ Ensure jobs start at the initial job size """
+    tuner = JobSizeTuner(25, 1.0)
+    assert tuner.get_job_size('trade') == 25
+
+
+def test_fast_jobs_grow_at_most_double():
+    """ Ensure jobs far faster than the target at most double in size """
+    tuner = JobSizeTuner(25, 1.0)
+    tuner.record_job('trade', 25, 0.001, 25)
+    assert tuner.get_job_size('trade') == 50
+
+
+def test_slow_jobs_shrink_at_most_half():
+    """ Ensure jobs far slower than the target at most halve in size """
+    tuner = JobSizeTuner(100, 1.0)
+    tuner.record_job('trade', 100, 100.0, 100)
+    assert tuner.get_job_size('trade') == 50
+
+
+def test_jobs_sized_towards_target_duration():
+    """ Ensure job sizes settle where jobs take the target duration """
+    tuner = JobSizeTuner(100, 1.0)
+    for _ in range(10):
+        job_size = tuner.get_job_size('trade')
+        tuner.record_job('trade', job_size, job_size * 0.005, job_size)
+    assert tuner.get_job_size('trade') == 200
+
+
+def test_jobs_capped_by_payload_size():
+    """ Ensure job sizes are kept under the maximum payload size """
+    tuner = JobSizeTuner(100, 1000.0)
+    bytes_per_record = MAX_JOB_PAYLOAD_BYTES // 150
+    tuner.record_job('trade', 100, 0.001, 100 * bytes_per_record)
+    assert tuner.get_job_size('trade') == 150
+
+
+def test_domain_objects_sized_independently():
+    """ Ensure measurements of one domain object do not size another """
+    tuner = JobSizeTuner(25, 1.0)
+    tuner.record_job('trade', 25, 0.001, 25)
+    assert tuner.get_job_size('price') == 25
@@ -0,0 +1,151 @@
+import sys
+from queue import Queue
+
+import pytest
+
+sys.path.insert(0, 'src/')
+from multi_processing import pool_tasks
+
+
+class StubFactory:
+    """ Factory yielding chunks of records with sequential ids, of the
+    given sizes """
+
+    def __init__(self, chunk_sizes):
+        self.chunk_sizes = chunk_sizes
+
+    def start_job_clock(self):
+        pass
+
+    def create_chunks(self, record_count, start_id):
+        for chunk_size in self.chunk_sizes:
+            yield [{'id': start_id + offset} for offset in range(chunk_size)]
+            start_id += chunk_size
+
+
+class StubFileBuilder:
+    """ File builder of four records per file, keeping each file built """
+
+    def __init__(self):
+        self.built = []
+
+    def get_max_objects_per_file(self):
+        return 4
+
+    def build(self, file_number, records):
+        self.built.append((file_number, [record['id'] for record in records]))
+
+
+def install_factory(monkeypatch, chunk_sizes, streamed_record_queue=None):
+    """ Installs a stub factory as the pool initializer would """
+    monkeypatch.setattr(pool_tasks, 'resident_object_factories',
+                        {'trade': StubFactory(chunk_sizes)}, raising=False)
+    monkeypatch.setattr(pool_tasks, 'resident_streamed_record_queue',
+                        streamed_record_queue)
+
+
+def get_create_job(file_number=None):
+    create_job = {'domain_object': 'trade', 'quantity': 1, 'start_id': 0}
+    if file_number is not None:
+        create_job['file_number'] = file_number
+    return create_job
+
+
+def test_chunks_streamed_but_last(monkeypatch):
+    """ Ensure every chunk but the last is streamed, in order, and the last
+    is returned """
+    streamed_record_queue = Queue()
+    install_factory(monkeypatch, [2, 2, 1], streamed_record_queue)
+
+    created_records = pool_tasks.create_records_from_create_job(
+        get_create_job()
+    )
+
+    streamed = [streamed_record_queue.get() for _ in range(2)]
+    assert streamed_record_queue.empty()
+    assert [message['domain_object'] for message in streamed] == \
+        ['trade', 'trade']
+    assert [message['records'].get_column('id') for message in streamed] \
+        == [[0, 1], [2, 3]]
+    assert created_records.get_column('id') == [4]
+
+
+def test_chunks_collated_without_queue(monkeypatch):
+    """ Ensure chunks are collated into the returned batch where there is no
+    streamed record queue """
+    install_factory(monkeypatch, [2, 2, 1])
+
+    created_records = pool_tasks.create_records_from_create_job(
+        get_create_job()
+    )
+
+    assert created_records.get_column('id') == list(range(5))
+
+
+def test_fused_files_written_as_chunks_fill_them(monkeypatch):
+    """ Ensure files are written whole as chunks fill them, from the job's
+    file number, with the remainder written last """
+    install_factory(monkeypatch, [3, 3, 3])
+    file_builder = StubFileBuilder()
+
+    job_measurement = pool_tasks.create_and_write_records_from_create_job(
+        get_create_job(file_number=5), file_builder
+    )
+
+    assert file_builder.built == [(5, [0, 1, 2, 3]),
+                                  (6, [4, 5, 6, 7]),
+                                  (7, [8])]
+    assert job_measurement['payload_size'] == 0
+
+
+class StubAsyncResult:
+    """ Result of a job, which either returns its measurement or raises """
+
+    def __init__(self, job_measurement=None, exception=None):
+        self.job_measurement = job_measurement
+        self.exception = exception
+
+    def get(self):
+        if self.exception is not None:
+            raise self.exception
+        return self.job_measurement
+
+
+class StubJobSizeTuner:
+    """ Tuner keeping the domain object and quantity of each recorded job """
+
+    def __init__(self):
+        self.recorded = []
+
+    def record_job(self, domain_object, quantity, duration, payload_size):
+        self.recorded.append((domain_object, quantity))
+
+
+def test_failed_jobs_printed_and_raised(capsys):
+    """ Ensure the failed jobs of a batch are printed and not measured, and
+    the first of their exceptions raised once the batch has finished """
+    jobs = [dict(get_create_job(), start_id=start_id, quantity=2)
+            for start_id in [0, 2, 4]]
+    job_measurement = {
+        'resident_set_size': 10, 'duration': 1, 'payload_size': 0
+    }
+    first_exception = ValueError('first')
+    async_result_objects = [
+        StubAsyncResult(exception=first_exception),
+        StubAsyncResult(exception=ValueError('second')),
+        StubAsyncResult(job_measurement)
+    ]
+    peak_resident_set_sizes, job_size_tuner = {}, StubJobSizeTuner()
+
+    with pytest.raises(ValueError) as raised:
+        pool_tasks.wait_and_measure_jobs(
+            jobs, async_result_objects, peak_resident_set_sizes,
+            job_size_tuner
+        )
+
+    assert raised.value is first_exception
+    assert peak_resident_set_sizes == {'trade': 10}
+    assert job_size_tuner.recorded == [('trade', 2)]
+    printed = capsys.readouterr().err
+    assert "Create job of 'trade' from record 0 failed" in printed
+    assert "Create job of 'trade' from record 2 failed" in printed
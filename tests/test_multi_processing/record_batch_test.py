@@ -0,0 +1,88 @@
+import pickle
+import sys
+
+sys.path.insert(0, 'src/')
+from multi_processing.record_batch import MISSING, RecordBatch, \
+    as_record_batch
+
+RECORDS = [{'id': 0, 'direction': 'BUY'},
+           {'id': 1, 'direction': 'SELL'},
+           {'id': 2, 'direction': 'BUY'}]
+
+
+def test_records_round_trip():
+    """ Ensure records are held as a column per attribute and returned as
+    the same dictionaries, in the same order """
+    records = RecordBatch.from_records(RECORDS)
+
+    assert records.schema == ('id', 'direction')
+    assert records.get_column('direction') == ['BUY', 'SELL', 'BUY']
+    assert list(records.get_rows())[1] == (1, 'SELL')
+    assert records.to_records() == RECORDS
+    assert records[-1] == RECORDS[-1]
+    assert len(records) == 3
+
+
+def test_records_from_columns():
+    """ Ensure a batch created from columns copies them """
+    ids = range(2)
+    directions = ['BUY', 'SELL']
+    records = RecordBatch({'id': ids, 'direction': directions})
+    directions.append('BUY')
+
+    assert records.to_records() == RECORDS[:2]
+
+
+def test_missing_attributes_left_out():
+    """ Ensure records with differing attributes take every attribute into
+    the schema, leaving those a record does not have out of its
+    dictionary """
+    records = RecordBatch.from_records([{'id': 0}, {'id': 1, 'extra': 'x'}])
+
+    assert records.has_missing_values
+    assert records.schema == ('id', 'extra')
+    assert records.get_column('extra') == [MISSING, 'x']
+    assert records.to_records() == [{'id': 0}, {'id': 1, 'extra': 'x'}]
+
+
+def test_slice_and_pop_front():
+    """ Ensure slicing returns a batch of those records, and popping the
+    front removes them from the batch """
+    records = RecordBatch.from_records(RECORDS)
+
+    assert records[1:].to_records() == RECORDS[1:]
+    assert records.pop_front(2).to_records() == RECORDS[:2]
+    assert records.to_records() == RECORDS[2:]
+
+
+def test_extend():
+    """ Ensure an empty batch takes the schema of the batch extending it,
+    and batches of other schemas are merged """
+    records = RecordBatch()
+    records.extend(RecordBatch.from_records(RECORDS[:1]))
+    records.extend(RecordBatch.from_records(RECORDS[1:]))
+    assert records.to_records() == RECORDS
+
+    records.extend(RecordBatch.from_records([{'id': 3}]))
+    assert records.to_records() == RECORDS + [{'id': 3}]
+
+
+def test_pickled_missing_values():
+    """ Ensure MISSING is still recognised once a batch has been pickled to
+    another process """
+    records = pickle.loads(pickle.dumps(
+        RecordBatch.from_records([{'id': 0}, {'extra': 'x'}])
+    ))
+
+    assert records.get_column('extra')[0] is MISSING
+    assert records.to_records() == [{'id': 0}, {'extra': 'x'}]
+
+
+def test_as_record_batch():
+    """ Ensure lists of records are gathered into a batch, and batches are
+    returned as they are """
+    records = RecordBatch.from_records(RECORDS)
+
+    assert as_record_batch(records) is records
+    assert as_record_batch(iter(RECORDS)).to_records() == RECORDS
+    assert len(as_record_batch([])) == 0
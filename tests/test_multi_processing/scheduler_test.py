@@ -0,0 +1,73 @@
+import sys
+
+sys.path.insert(0, 'src/')
+from multi_processing.scheduler import DependencyScheduler
+
+
+def test_independent_domain_objects_ready_together():
+    """ Ensure domain objects only depending on instruments and accounts are
+    all ready once both of those are complete """
+    scheduler = DependencyScheduler(
+        ['instrument', 'account', 'price', 'trade', 'cash_balance']
+    )
+
+    assert scheduler.get_ready_domain_objects() == ['instrument', 'account']
+
+    scheduler.mark_complete('instrument')
+    assert scheduler.get_ready_domain_objects() == ['price']
+
+    scheduler.mark_complete('account')
+    assert scheduler.get_ready_domain_objects() == ['trade', 'cash_balance']
+
+
+def test_chained_domain_objects_ready_in_turn():
+    """ Ensure each swap domain object waits for the one before it """
+    scheduler = DependencyScheduler(
+        ['instrument', 'counterparty', 'swap_contract', 'swap_position',
+         'cashflow']
+    )
+
+    assert scheduler.get_ready_domain_objects() == \
+        ['instrument', 'counterparty']
+
+    scheduler.mark_complete('counterparty')
+    assert scheduler.get_ready_domain_objects() == ['swap_contract']
+
+    scheduler.mark_complete('swap_contract')
+    assert scheduler.get_ready_domain_objects() == []
+
+    scheduler.mark_complete('instrument')
+    assert scheduler.get_ready_domain_objects() == ['swap_position']
+
+    scheduler.mark_complete('swap_position')
+    assert scheduler.get_ready_domain_objects() == ['cashflow']
+
+
+def test_missing_dependencies_ignored():
+    """ Ensure dependencies on domain objects outside the run are ignored """
+    scheduler = DependencyScheduler(['trade'])
+
+    assert scheduler.get_ready_domain_objects() == ['trade']
+
+
+def test_unknown_domain_object_waits_for_earlier_ones():
+    """ Ensure a domain object without known dependencies waits for every
+    domain object listed before it """
+    scheduler = DependencyScheduler(['account', 'new_object', 'cash_balance'])
+
+    assert scheduler.get_ready_domain_objects() == ['account']
+
+    scheduler.mark_complete('account')
+    assert scheduler.get_ready_domain_objects() == \
+        ['new_object', 'cash_balance']
+
+
+def test_is_complete():
+    """ Ensure the run is complete only once every domain object is """
+    scheduler = DependencyScheduler(['instrument', 'price'])
+
+    scheduler.mark_complete('instrument')
+    assert scheduler.is_complete() is False
+
+    scheduler.mark_complete('price')
+    assert scheduler.is_complete() is True
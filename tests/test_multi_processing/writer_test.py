@@ -0,0 +1,139 @@
+import sys
+import threading
+from queue import Queue
+
+sys.path.insert(0, 'src/')
+from multi_processing.writer import Writer
+from multi_processing.in_flight_limit import InFlightRecordLimit
+from multi_processing.record_batch import RecordBatch
+
+
+class StubFileBuilder:
+    """ File builder writing three records per file, which never writes """
+
+    def get_max_objects_per_file(self):
+        return 3
+
+
+class StubPool:
+    """ Pool holding submitted jobs until the test finishes them """
+
+    def __init__(self):
+        self.submitted = []
+
+    def apply_async(self, func, args, callback, error_callback):
+        self.submitted.append((args[0], callback, error_callback))
+
+    def finish_next_job(self):
+        _, callback, _ = self.submitted.pop(0)
+        callback({'resident_set_size': 0})
+
+    def fail_next_job(self):
+        _, _, error_callback = self.submitted.pop(0)
+        error_callback(ValueError())
+
+
+def get_writer(window_size):
+    """ Returns a writer with a window of the given size, as set up by its
+    parent process """
+    writer = Writer(Queue(), Queue(), InFlightRecordLimit())
+    writer.write_window = threading.BoundedSemaphore(window_size)
+    writer.write_job_lock = threading.Lock()
+    return writer
+
+
+def get_records(number_of_records):
+    """ Returns a batch of records, as put on the created record queue """
+    return RecordBatch({'id': range(number_of_records)})
+
+
+def test_write_jobs_submitted_per_whole_file():
+    """ Ensure a write job is submitted for each whole file of records,
+    holding back the remaining records """
+    writer, pool = get_writer(4), StubPool()
+    writer.handle_dequeued_item(
+        {'domain_object': 'trade', 'file_builder': StubFileBuilder()}, pool
+    )
+    writer.handle_dequeued_item(
+        {'domain_object': 'trade', 'records': get_records(7)}, pool
+    )
+
+    assert [job['file_number'] for job, _, _ in pool.submitted] == [0, 1]
+    assert [job['records'].get_column('id')
+            for job, _, _ in pool.submitted] == [[0, 1, 2], [3, 4, 5]]
+    assert writer.dequeued_created_records_not_yet_written_to_file[
+        'trade'
+    ].to_records() == [{'id': 6}]
+
+
+def test_completion_reported_after_last_write_job():
+    """ Ensure a domain object is only reported complete once all of its
+    write jobs, including the residual one, have finished """
+    writer, pool = get_writer(4), StubPool()
+    writer.handle_dequeued_item(
+        {'domain_object': 'trade', 'file_builder': StubFileBuilder()}, pool
+    )
+    writer.handle_dequeued_item(
+        {'domain_object': 'trade', 'records': get_records(4)}, pool
+    )
+    writer.handle_dequeued_item(
+        {'end_of_domain_object': 'trade', 'peak_resident_set_size': 10}, pool
+    )
+
+    assert len(pool.submitted) == 2
+    pool.finish_next_job()
+    assert writer.completed_object_queue.empty()
+
+    pool.fail_next_job()
+    completed_object = writer.completed_object_queue.get_nowait()
+    assert completed_object['domain_object'] == 'trade'
+    assert completed_object['peak_resident_set_size'] >= 10
+
+
+def test_failed_write_jobs_reported(capsys):
+    """ Ensure a failed write job is printed with its exception, and counted
+    in the completion of its domain object """
+    writer, pool = get_writer(4), StubPool()
+    writer.handle_dequeued_item(
+        {'domain_object': 'trade', 'file_builder': StubFileBuilder()}, pool
+    )
+    writer.handle_dequeued_item(
+        {'domain_object': 'trade', 'records': get_records(6)}, pool
+    )
+    writer.handle_dequeued_item(
+        {'end_of_domain_object': 'trade', 'peak_resident_set_size': 0}, pool
+    )
+
+    pool.finish_next_job()
+    pool.fail_next_job()
+
+    completed_object = writer.completed_object_queue.get_nowait()
+    assert completed_object['failed_write_jobs'] == 1
+    assert "Write job of file 1 of 'trade' failed" in capsys.readouterr().err
+    assert writer.failed_write_jobs == {}
+
+
+def test_finished_write_jobs_free_window():
+    """ Ensure a job is not submitted while the window is full, and is once
+    an earlier job finishes """
+    writer, pool = get_writer(1), StubPool()
+    writer.handle_dequeued_item(
+        {'domain_object': 'trade', 'file_builder': StubFileBuilder()}, pool
+    )
+    writer.handle_dequeued_item(
+        {'domain_object': 'trade', 'records': get_records(3)}, pool
+    )
+
+    dequeue = threading.Thread(
+        target=writer.handle_dequeued_item,
+        args=({'domain_object': 'trade', 'records': get_records(3)}, pool)
+    )
+    dequeue.start()
+    dequeue.join(timeout=0.1)
+    assert dequeue.is_alive()
+    assert len(pool.submitted) == 1
+
+    pool.finish_next_job()
+    dequeue.join(timeout=5)
+    assert not dequeue.is_alive()
+    assert [job['file_number'] for job, _, _ in pool.submitted] == [1]
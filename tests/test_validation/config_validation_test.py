@@ -232,3 +232,191 @@ def test_google_drive_flag_failure():
 
     success = validator.validate(configurations).check_success()
     assert success is False
+
+
+def get_success_for_changed_shared_args(**shared_args):
+    """ helper method that returns the validation result for the default
+    config with the given shared args values changed """
+    configurations = configuration.Configuration(
+        {
+            "factory_definitions": default_factory_definitions,
+            "shared_args": {**default_shared_args, **shared_args},
+            "dev_file_builder_args": default_dev_file_builder_args,
+            "dev_factory_args": default_dev_factory_args
+        }
+    )
+
+    return validator.validate(configurations).check_success()
+
+
+def test_queue_transport_success():
+    """ Ensure each supported queue transport succeeds """
+    assert get_success_for_changed_shared_args(queue_transport='queue') is True
+    assert get_success_for_changed_shared_args(
+        queue_transport='manager'
+    ) is True
+
+
+def test_queue_transport_failure():
+    """ Ensure an unsupported queue transport fails """
+    assert get_success_for_changed_shared_args(
+        queue_transport='socket'
+    ) is False
+
+
+def test_execution_mode_success():
+    """ Ensure each supported execution mode succeeds """
+    assert get_success_for_changed_shared_args(
+        execution_mode='pipelined'
+    ) is True
+    assert get_success_for_changed_shared_args(execution_mode='fused') is True
+
+
+def test_execution_mode_failure():
+    """ Ensure an unsupported execution mode fails """
+    assert get_success_for_changed_shared_args(execution_mode='eager') is False
+
+
+def test_fused_unsized_domain_object_failure():
+    """ Ensure domain objects whose factories do not create exactly their
+    record count fail in fused mode, and succeed in pipelined mode """
+    factory_definitions = copy.deepcopy(default_factory_definitions)
+    factory_definitions.append(
+        {'swap_position': copy.deepcopy(
+            default_factory_definitions[0]['instrument']
+        )}
+    )
+
+    for execution_mode, success in [('fused', False), ('pipelined', True)]:
+        shared_args = copy.deepcopy(default_shared_args)
+        shared_args['execution_mode'] = execution_mode
+        configurations = configuration.Configuration(
+            {
+                "factory_definitions": factory_definitions,
+                "shared_args": shared_args,
+                "dev_file_builder_args": default_dev_file_builder_args,
+                "dev_factory_args": default_dev_factory_args
+            }
+        )
+        assert validator.validate(configurations).check_success() is success
+
+
+def test_max_records_in_flight_success():
+    """ Ensure a positive cap on records in flight succeeds """
+    assert get_success_for_changed_shared_args(
+        max_records_in_flight=1000
+    ) is True
+
+
+def test_max_records_in_flight_failure():
+    """ Ensure a cap on records in flight of zero or below fails """
+    assert get_success_for_changed_shared_args(
+        max_records_in_flight=0
+    ) is False
+    assert get_success_for_changed_shared_args(
+        max_records_in_flight=-5
+    ) is False
+
+
+def test_job_sizing_success():
+    """ Ensure each supported job sizing mode succeeds, and that adaptive
+    job sizes may exceed the maximum number of records per file """
+    assert get_success_for_changed_shared_args(job_sizing='fixed') is True
+    assert get_success_for_changed_shared_args(
+        job_sizing='adaptive', target_job_duration=0.25
+    ) is True
+    assert get_success_for_changed_shared_args(
+        job_sizing='adaptive', target_job_duration=1,
+        number_of_records_per_job=5000
+    ) is True
+
+
+def test_job_sizing_failure():
+    """ Ensure unsupported job sizing modes and target job durations fail,
+    and that fixed job sizes may not exceed the maximum records per file """
+    assert get_success_for_changed_shared_args(job_sizing='guessed') is False
+    assert get_success_for_changed_shared_args(
+        job_sizing='adaptive', target_job_duration=0
+    ) is False
+    assert get_success_for_changed_shared_args(
+        job_sizing='fixed', number_of_records_per_job=5000
+    ) is False
+
+
+def test_dependency_database_mode_success():
+    """ Ensure each supported dependency database mode succeeds """
+    assert get_success_for_changed_shared_args(
+        dependency_database_mode='safe'
+    ) is True
+    assert get_success_for_changed_shared_args(
+        dependency_database_mode='fast'
+    ) is True
+
+
+def test_dependency_database_mode_failure():
+    """ Ensure an unsupported dependency database mode fails """
+    assert get_success_for_changed_shared_args(
+        dependency_database_mode='reckless'
+    ) is False
+
+
+def test_dependency_store_success():
+    """ Ensure each supported dependency store succeeds """
+    assert get_success_for_changed_shared_args(
+        dependency_store='sqlite'
+    ) is True
+    assert get_success_for_changed_shared_args(
+        dependency_store='shared_memory'
+    ) is True
+
+
+def test_dependency_store_failure():
+    """ Ensure an unsupported dependency store fails """
+    assert get_success_for_changed_shared_args(
+        dependency_store='postgres'
+    ) is False
+
+
+def test_shared_memory_dependency_store_unavailable(monkeypatch):
+    """ Ensure the shared memory dependency store fails where the
+    multiprocessing.shared_memory module is unavailable, as before Python
+    3.8, and the sqlite store still succeeds """
+    monkeypatch.setattr(validator, 'is_shared_memory_available',
+                        lambda: False)
+    assert get_success_for_changed_shared_args(
+        dependency_store='shared_memory'
+    ) is False
+    assert get_success_for_changed_shared_args(
+        dependency_store='sqlite'
+    ) is True
+
+
+def test_timestamps_success():
+    """ Ensure each supported timestamp mode succeeds """
+    assert get_success_for_changed_shared_args(timestamps='per_job') is True
+    assert get_success_for_changed_shared_args(timestamps='monotonic') is True
+
+
+def test_timestamps_failure():
+    """ Ensure an unsupported timestamp mode fails """
+    assert get_success_for_changed_shared_args(
+        timestamps='per_record'
+    ) is False
+
+
+def test_max_records_per_chunk_success():
+    """ Ensure a positive maximum number of records per chunk succeeds """
+    assert get_success_for_changed_shared_args(
+        max_records_per_chunk=5000
+    ) is True
+
+
+def test_max_records_per_chunk_failure():
+    """ Ensure a maximum number of records per chunk of zero or below, or
+    which is not a whole number, fails """
+    assert get_success_for_changed_shared_args(
+        max_records_per_chunk=0
+    ) is False
+    assert get_success_for_changed_shared_args(
+        max_records_per_chunk=2.5
+    ) is False
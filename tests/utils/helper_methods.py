@@ -1,3 +1,4 @@
+import gc
 import os
 import sys
 from multiprocessing import Lock
@@ -20,6 +21,17 @@ def delete_local_database():
         os.remove('dependencies.db')
 
 
+def delete_local_database_files():
+    """ Delete the database along with its journal and write-ahead log.
+    Connections left open by earlier tests are only closed once garbage
+    collected, so they are collected first, rolling back anything they
+    have not committed and releasing their locks """
+    gc.collect()
+    for suffix in ['', '-journal', '-wal', '-shm']:
+        if os.path.exists('dependencies.db' + suffix):
+            os.remove('dependencies.db' + suffix)
+
+
 def create_db():
     return Sqlite_Database()
 
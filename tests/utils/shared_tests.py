@@ -4,7 +4,7 @@ import re
 
 sys.path.insert(0, 'src/')
 from utils import helper_methods as helper
-from domainobjectfactories import instrument_factory
+from domainobjectfactories import identifiers, instrument_factory
 
 # Shared Tests
 # domain_obj gives access to defined constant lists in the parent class
@@ -52,9 +52,10 @@ def cusip_exists(record):
 
 
 def cusip_valid(record):
-    """ CUSIPs must both: be integers, and of length 9 """
+    """ CUSIPs must be 9 digits, the last their check digit """
     cusip = record['cusip']
-    assert is_int(cusip) and is_length(9, cusip)
+    assert re.match('^[0-9]{9}$', cusip)
+    assert cusip[8] == identifiers.get_cusip_check_digits([cusip[:8]])[0]
 
 
 def isin_exists(record):
@@ -63,11 +64,13 @@ def isin_exists(record):
 
 
 def isin_valid(record):
-    """ Valid ISIN is in format '"country_of_issuance""CUSIP""4"' """
+    """ Valid ISIN is in format
+    '"country_of_issuance""CUSIP""check digit"' """
     country_of_issuance = record['country_of_issuance']
     cusip = str(record['cusip'])
-    expected_isin = country_of_issuance + cusip + '4'
-    assert record['isin'] == expected_isin
+    check_digit = \
+        identifiers.get_isin_check_digits([country_of_issuance + cusip])[0]
+    assert record['isin'] == country_of_issuance + cusip + check_digit
 
 
 def ric_exists(record):